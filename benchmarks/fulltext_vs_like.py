@@ -0,0 +1,158 @@
+"""
+GET /catalogs text search: LIKE scan vs. FULLTEXT (q=...) on a synthetic catalog.
+
+Builds a scratch copy of the catalog table (catalog_bench_fts, same schema),
+fills it with synthetic rows, adds the same FULLTEXT index as
+migrations/0002_catalog_fulltext.sql and times the first-page SQL that
+plan_list_query produces for `poi=<term>` (LIKE) and `q=<term>`
+(MATCH ... AGAINST), both with limit=100.
+
+    python -m benchmarks.fulltext_vs_like --rows 1000000 --queries 50
+
+Needs a MySQL server reachable with services.db_config.DB_CONFIG
+(CATALOG_DB_* env vars). The scratch table is dropped afterwards unless --keep.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from services.catalog_sql import FULLTEXT_COLUMNS, INSERT_COLUMNS, plan_list_query
+
+BENCH_TABLE = "catalog_bench_fts"
+
+CITIES = ["new york city", "paris", "rome", "tokyo", "lisbon", "cairo", "lima", "oslo", "seoul", "austin"]
+WORDS = (
+    "park museum harbor market temple castle garden river beach tower bridge gallery plaza "
+    "canyon lake forest island cathedral palace zoo aquarium lighthouse vineyard trail summit "
+    "historic scenic quiet lively hidden ancient modern famous local family romantic"
+).split()
+CREATED_AT = datetime(2025, 1, 1)
+ACTIVITIES = ["hiking", "boating", "photography", "shopping", "jogging", "kayaking", "cycling", "tasting", "diving"]
+
+
+def synthetic_row(i: int, rnd: random.Random) -> tuple:
+    words = rnd.sample(WORDS, 2)
+    row = {
+        "poi": f"{words[0]} {words[1]} {i}",
+        "city": rnd.choice(CITIES),
+        "country": "bench",
+        "currency": "usd",
+        "latitude": rnd.uniform(-60, 60),
+        "longitude": rnd.uniform(-180, 180),
+        "rating": round(rnd.uniform(1, 5), 1),
+        "description": " ".join(rnd.choices(WORDS, k=12)),
+        "spending": rnd.choice(["low", "medium", "high"]),
+        "budget": rnd.randint(10, 500),
+        "vibes": "nature,relaxing",
+        "activities": ",".join(rnd.sample(ACTIVITIES, 3)),
+        "food": "street food",
+        "best_season": rnd.choice(["spring", "summer", "fall", "winter"]),
+        "trip_days": rnd.randint(1, 7),
+        "nearest_airport": "xxx",
+        "transport": rnd.choice(["walkable", "public_transit", "rideshare", "car_rental"]),
+        "accessibility": "ok",
+        "direction": "https://maps.example.com",
+        "created_at": CREATED_AT,
+        "updated_at": CREATED_AT,
+    }
+    return tuple(row[c] for c in INSERT_COLUMNS)
+
+
+def populate(cnx, rows: int, batch: int, seed: int) -> None:
+    cursor = cnx.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+    cursor.execute(f"CREATE TABLE {BENCH_TABLE} LIKE catalog")
+    # CREATE ... LIKE copies catalog's FULLTEXT index if it has one; drop it so
+    # the bulk load isn't paying for it, and build it once at the end.
+    cursor.execute(f"SHOW INDEX FROM {BENCH_TABLE} WHERE Index_type = 'FULLTEXT'")
+    for name in {r[2] for r in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE {BENCH_TABLE} DROP INDEX {name}")
+
+    sql = (
+        f"INSERT INTO {BENCH_TABLE} ({', '.join(INSERT_COLUMNS)}) "
+        f"VALUES ({', '.join(['%s'] * len(INSERT_COLUMNS))})"
+    )
+    rnd = random.Random(seed)
+    started = time.monotonic()
+    for start in range(0, rows, batch):
+        cursor.executemany(sql, [synthetic_row(i, rnd) for i in range(start, min(rows, start + batch))])
+        cnx.commit()
+    print(f"loaded {rows} rows in {time.monotonic() - started:.1f}s")
+
+    started = time.monotonic()
+    cursor.execute(f"ALTER TABLE {BENCH_TABLE} ADD FULLTEXT INDEX ft_bench ({', '.join(FULLTEXT_COLUMNS)})")
+    print(f"built FULLTEXT index in {time.monotonic() - started:.1f}s")
+    cursor.close()
+
+
+def bench_query(cnx, build: Callable[[str], Tuple[str, Dict]], terms: List[str]) -> Dict[str, float]:
+    """Run build(term) for every term against BENCH_TABLE; latency includes fetching the page."""
+    cursor = cnx.cursor()
+    timings, hits = [], 0
+    for term in terms:
+        query, params = build(term)
+        query = query.replace("FROM catalog ", f"FROM {BENCH_TABLE} ")
+        started = time.perf_counter()
+        cursor.execute(query, params)
+        hits += len(cursor.fetchall())
+        timings.append((time.perf_counter() - started) * 1000)
+    cursor.close()
+    timings.sort()
+    return {
+        "p50_ms": statistics.median(timings),
+        "p95_ms": timings[max(0, int(len(timings) * 0.95) - 1)],
+        "mean_ms": statistics.fmean(timings),
+        "rows_per_query": hits / len(terms),
+    }
+
+
+def first_page(**filters) -> Tuple[str, Dict]:
+    plan = plan_list_query(filters, limit=100)
+    return plan.query, plan.params
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--reuse", action="store_true", help=f"skip loading; {BENCH_TABLE} already exists")
+    parser.add_argument("--keep", action="store_true", help=f"keep {BENCH_TABLE} afterwards")
+    args = parser.parse_args()
+
+    import mysql.connector
+
+    from services.db_config import DB_CONFIG
+
+    cnx = mysql.connector.connect(**{**DB_CONFIG, "autocommit": False})
+    try:
+        if not args.reuse:
+            populate(cnx, args.rows, args.batch, args.seed)
+
+        rnd = random.Random(args.seed + 1)
+        terms = [rnd.choice(WORDS) for _ in range(args.queries)]
+        results = {
+            "LIKE (poi=)": bench_query(cnx, lambda t: first_page(poi=t), terms),
+            "FULLTEXT (q=)": bench_query(cnx, lambda t: first_page(q=t), terms),
+        }
+
+        print(f"\n{args.queries} queries, first page of 100, table {BENCH_TABLE}")
+        print(f"{'path':<16}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'rows/q':>10}")
+        for name, r in results.items():
+            print(f"{name:<16}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['mean_ms']:>10.2f}{r['rows_per_query']:>10.1f}")
+    finally:
+        if not args.keep:
+            cursor = cnx.cursor()
+            cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+            cursor.close()
+        cnx.close()
+
+
+if __name__ == "__main__":
+    main()
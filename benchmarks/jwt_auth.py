@@ -0,0 +1,57 @@
+"""
+Per-request JWT auth overhead: plain jwt.decode vs. CachedJWTVerifier.
+
+Simulates clients that reuse their bearer token: --tokens distinct tokens
+are presented round-robin for --requests calls. Reports the mean cost per
+call of verifying from scratch every time (the old get_current_user /
+verify_jwt_or_401 path) and through the verified-token cache.
+
+    python -m benchmarks.jwt_auth --requests 200000 --tokens 100
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import jwt
+
+from services.auth_cache import CachedJWTVerifier
+from services.cache import TTLCache
+
+SECRET = "benchmark-only-hs256-secret-0123456789"
+
+
+def make_tokens(n: int) -> list:
+    exp = int(time.time()) + 3600
+    return [jwt.encode({"sub": f"user-{i}", "email": f"user{i}@example.com", "exp": exp}, SECRET, algorithm="HS256") for i in range(n)]
+
+
+def run(label: str, verify, tokens: list, requests: int) -> float:
+    started = time.perf_counter()
+    for i in range(requests):
+        verify(tokens[i % len(tokens)])
+    per_call_us = (time.perf_counter() - started) / requests * 1e6
+    print(f"{label:<28}{per_call_us:>10.2f} us/request")
+    return per_call_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--tokens", type=int, default=100)
+    args = parser.parse_args()
+
+    tokens = make_tokens(args.tokens)
+    verifier = CachedJWTVerifier(SECRET, TTLCache(max_entries=10000, ttl=300))
+
+    print(f"{args.requests} requests over {args.tokens} tokens")
+    before = run("jwt.decode every request", lambda t: jwt.decode(t, SECRET, algorithms=["HS256"]), tokens, args.requests)
+    after = run("CachedJWTVerifier", verifier.verify, tokens, args.requests)
+    print(f"{'speedup':<28}{before / after:>10.1f}x")
+
+    stats = verifier.stats()
+    print(f"full verifications: {stats['verifications']}, cache hit ratio: {stats['hit_ratio']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+GET /catalogs response encoding: validated models vs. trusted-row JSON.
+
+Encodes the same synthetic page of normalized catalog rows three ways and
+reports rows/second at each size:
+
+  validated     what list_catalogs did before: a CatalogRead per row, then
+                FastAPI's serialize_response against List[CatalogRead] and
+                JSONResponse rendering (the real FastAPI code path)
+  fast/stdlib   services.fast_json trusted rows, stdlib json encoder
+  fast/orjson   services.fast_json trusted rows, orjson (if installed)
+
+    python -m benchmarks.list_serialization --sizes 1000,10000,100000
+
+Every fast encoding is checked to decode to the same documents as the
+validated one before it is timed. No database is needed. --decimal hands
+latitude/longitude/rating over as Decimal, the way mysql.connector returns
+DECIMAL columns.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from benchmarks.fulltext_vs_like import synthetic_row
+from models.catalog import CatalogRead
+from services.catalog_sql import catalog_row_from_values, normalize_catalog_row
+from services.fast_json import dumps_stdlib, orjson, rows_json, trusted_documents
+
+RESPONSE_FIELD = create_model_field("Response_list_catalogs", List[CatalogRead], mode="serialization")
+
+
+def make_rows(n: int, seed: int, decimal: bool) -> List[Dict[str, Any]]:
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        row = normalize_catalog_row(catalog_row_from_values(synthetic_row(i, rnd)))
+        if decimal:
+            for column in ("latitude", "longitude", "rating"):
+                row[column] = Decimal(str(round(row[column], 6)))
+        rows.append(row)
+    return rows
+
+
+def encode_validated(rows: List[Dict[str, Any]]) -> bytes:
+    models = [CatalogRead(**row) for row in rows]
+    content = asyncio.run(serialize_response(field=RESPONSE_FIELD, response_content=models, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def encode_fast_stdlib(rows: List[Dict[str, Any]]) -> bytes:
+    return dumps_stdlib(trusted_documents(rows))
+
+
+def encode_fast_orjson(rows: List[Dict[str, Any]]) -> bytes:
+    return rows_json(rows)
+
+
+def best_time(encode: Callable[[List[Dict[str, Any]]], bytes], rows: List[Dict[str, Any]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode(rows)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated page sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="best of N runs per size (N=2 above 50k rows)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--decimal", action="store_true", help="DECIMAL columns as Decimal, as mysql.connector returns them")
+    args = parser.parse_args()
+
+    paths = [("validated", encode_validated), ("fast/stdlib", encode_fast_stdlib)]
+    if orjson is not None:
+        paths.append(("fast/orjson", encode_fast_orjson))
+    else:
+        print("orjson is not installed; skipping fast/orjson")
+
+    print(f"{'rows':>8}  " + "  ".join(f"{name:>16}" for name, _ in paths) + f"  {'speedup':>8}")
+    for n in (int(size) for size in args.sizes.split(",")):
+        rows = make_rows(n, args.seed, args.decimal)
+        expected = json.loads(encode_validated(rows[:1000]))
+        for name, encode in paths[1:]:
+            if json.loads(encode(rows[:1000])) != expected:
+                raise SystemExit(f"{name} output differs from the validated encoding")
+
+        repeat = args.repeat if n <= 50_000 else min(args.repeat, 2)
+        rates = [n / best_time(encode, rows, repeat) for _, encode in paths]
+        print(
+            f"{n:>8}  "
+            + "  ".join(f"{rate:>11,.0f} r/s" for rate in rates)
+            + f"  {rates[-1] / rates[0]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
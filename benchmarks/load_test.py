@@ -0,0 +1,463 @@
+"""
+Load test for the Catalog API: p50/p95/p99 latency and throughput per endpoint.
+
+Starts main3 or main4 under uvicorn in a child process, against SQLite
+(benchmarks/sqlite_shim.py, default) or the MySQL in CATALOG_DB_*, seeded
+with --rows synthetic catalogs. --concurrency client threads then send a
+weighted mix of requests (keep-alive connections) for --duration seconds.
+Requests sent during the first --warmup seconds are not counted.
+
+    python -m benchmarks.load_test --app main3 --rows 10000 --duration 30 --output before.json
+    python -m benchmarks.load_test --app main3 --rows 10000 --duration 30 --baseline before.json --output after.json
+    python -m benchmarks.load_test --app main4 --mix get=60,list=20,auth_list=10,create=5,patch=4,delete=1
+    python -m benchmarks.load_test --url http://10.0.0.5:8000 --duration 60   # already running server
+
+Operations:
+  get        GET /catalogs/{poi}
+  list       GET /catalogs?city=...&limit=20
+  auth_list  GET /catalogs?limit=20 with a bearer token (verified by main4)
+  create     POST /catalogs
+  patch      PATCH /catalogs/{poi}
+  delete     DELETE /catalogs/{poi} of a catalog this run created
+
+Seeded and created pois start with "loadtest "; with --backend mysql they
+are deleted again afterwards unless --keep. The JSON written to --output
+records the commit, settings and per-endpoint numbers, and --baseline
+prints the change against an earlier run.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlparse
+
+import jwt
+
+from benchmarks.fulltext_vs_like import CITIES, synthetic_row
+from services.catalog_sql import INSERT_CATALOG_SQL, INSERT_COLUMNS
+
+OPS = ("get", "list", "auth_list", "create", "patch", "delete")
+DEFAULT_MIX = "get=50,list=20,auth_list=10,create=8,patch=8,delete=4"
+EXPECTED_STATUS = {"get": 200, "list": 200, "auth_list": 200, "create": 201, "patch": 200, "delete": 204}
+
+SEED_PREFIX = "loadtest "
+JWT_SECRET = "load-test-only-hs256-secret-0123456789"
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# -----------------------------------------------------------------------------
+# Data
+# -----------------------------------------------------------------------------
+def seed_row(i: int, rnd: random.Random, poi: Optional[str] = None) -> tuple:
+    values = synthetic_row(i, rnd)
+    return (poi or f"{SEED_PREFIX}{i}",) + values[1:]
+
+
+def create_body(poi: str, rnd: random.Random) -> Dict[str, Any]:
+    row = dict(zip(INSERT_COLUMNS, seed_row(0, rnd, poi)))
+    row.pop("created_at")
+    row.pop("updated_at")
+    return row
+
+
+def seed(cnx: Any, rows: int, seed_value: int, batch: int = 1000) -> None:
+    rnd = random.Random(seed_value)
+    cursor = cnx.cursor()
+    try:
+        cursor.execute("DELETE FROM catalog WHERE poi LIKE %s", (f"{SEED_PREFIX}%",))
+        for start in range(0, rows, batch):
+            cnx.start_transaction()
+            cursor.executemany(INSERT_CATALOG_SQL, [seed_row(i, rnd) for i in range(start, min(rows, start + batch))])
+            cnx.commit()
+    finally:
+        cursor.close()
+
+    from services.catalog_tags import TAG_INDEX_ENABLED, backfill_tags
+
+    if TAG_INDEX_ENABLED:
+        backfill_tags(cnx)
+
+
+def cleanup(cnx: Any) -> None:
+    from services.catalog_tags import TAG_INDEX_ENABLED
+
+    cursor = cnx.cursor()
+    try:
+        if TAG_INDEX_ENABLED:
+            cursor.execute("DELETE FROM catalog_tag WHERE poi LIKE %s", (f"{SEED_PREFIX}%",))
+        cursor.execute("DELETE FROM catalog WHERE poi LIKE %s", (f"{SEED_PREFIX}%",))
+        cnx.commit()
+    finally:
+        cursor.close()
+
+
+# -----------------------------------------------------------------------------
+# Server (child process)
+# -----------------------------------------------------------------------------
+def serve(app_name: str, sqlite_path: Optional[str], port: int) -> None:
+    import importlib
+
+    import uvicorn
+
+    module = importlib.import_module(app_name)
+    if sqlite_path:
+        from benchmarks.sqlite_shim import SQLiteConnection
+
+        module.catalog.db_pool.factory = lambda: SQLiteConnection(sqlite_path)
+    uvicorn.run(module.app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app_name: str, sqlite_path: Optional[str], timeout: float = 60.0) -> Tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = dict(os.environ)
+    env.setdefault("AUTH_JWT_SECRET", JWT_SECRET)
+    env.setdefault("CATALOG_EVENTS_PUBLISHER", "none")
+    if sqlite_path:
+        env["CATALOG_DB_MODE"] = "sync"
+    cmd = [sys.executable, "-m", "benchmarks.load_test", "--serve", "--app", app_name, "--port", str(port)]
+    if sqlite_path:
+        cmd += ["--sqlite", sqlite_path]
+    proc = subprocess.Popen(cmd, cwd=REPO_ROOT, env=env)
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{app_name} exited with status {proc.returncode} during startup")
+        try:
+            with urllib.request.urlopen(f"{base_url}/health", timeout=1) as resp:
+                if resp.status == 200:
+                    return proc, base_url
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"{app_name} did not answer /health within {timeout:.0f}s")
+
+
+# -----------------------------------------------------------------------------
+# Client
+# -----------------------------------------------------------------------------
+class Client:
+    """One keep-alive HTTP connection; reconnects after a transport error."""
+
+    def __init__(self, base_url: str):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> int:
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        try:
+            self._conn.request(method, path, body=payload, headers=headers)
+            resp = self._conn.getresponse()
+            resp.read()
+            return resp.status
+        except (OSError, http.client.HTTPException):
+            self._conn.close()
+            self._conn = None
+            return 0
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPS:
+            raise ValueError(f"Unknown operation {name!r} in --mix (expected one of {', '.join(OPS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def discover_pois(base_url: str, headers: Dict[str, str], limit: int = 1000) -> List[str]:
+    req = urllib.request.Request(f"{base_url}/catalogs?{urlencode({'fields': 'poi', 'limit': limit})}", headers=headers)
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return [row["poi"] for row in json.load(resp)]
+
+
+def run_worker(
+    worker: int,
+    base_url: str,
+    mix: Dict[str, float],
+    pois: List[str],
+    auth_headers: Dict[str, str],
+    auth_everywhere: bool,
+    measure_from: float,
+    deadline: float,
+    seed_value: int,
+    out: Dict[str, List[Tuple[float, int]]],
+) -> None:
+    rnd = random.Random(seed_value + worker)
+    client = Client(base_url)
+    ops, weights = list(mix), list(mix.values())
+    created: List[str] = []
+    counter = 0
+    default_headers = auth_headers if auth_everywhere else {}
+
+    while True:
+        started = time.monotonic()
+        if started >= deadline:
+            break
+        op = rnd.choices(ops, weights)[0]
+        if op == "delete" and not created:
+            op = "create"
+
+        if op == "get":
+            status = client.request("GET", f"/catalogs/{quote(rnd.choice(pois))}", headers=default_headers)
+        elif op == "list":
+            query = urlencode({"city": rnd.choice(CITIES), "limit": 20})
+            status = client.request("GET", f"/catalogs?{query}", headers=default_headers)
+        elif op == "auth_list":
+            status = client.request("GET", "/catalogs?limit=20", headers=auth_headers)
+        elif op == "create":
+            counter += 1
+            poi = f"{SEED_PREFIX}new {seed_value}-{worker}-{counter}"
+            status = client.request("POST", "/catalogs", body=create_body(poi, rnd), headers=default_headers)
+            if status == 201:
+                created.append(poi)
+        elif op == "patch":
+            body = {"rating": round(rnd.uniform(1, 5), 1)}
+            status = client.request("PATCH", f"/catalogs/{quote(rnd.choice(pois))}", body=body, headers=default_headers)
+        else:
+            status = client.request("DELETE", f"/catalogs/{quote(created.pop())}", headers=default_headers)
+
+        finished = time.monotonic()
+        if started >= measure_from:
+            out.setdefault(op, []).append(((finished - started) * 1000, status))
+
+
+# -----------------------------------------------------------------------------
+# Report
+# -----------------------------------------------------------------------------
+def percentile(sorted_ms: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_ms:
+        return 0.0
+    rank = max(1, int(-(-p * len(sorted_ms) // 100)))
+    return sorted_ms[min(rank, len(sorted_ms)) - 1]
+
+
+def summarize(samples: Dict[str, List[Tuple[float, int]]], seconds: float) -> Dict[str, Any]:
+    endpoints: Dict[str, Any] = {}
+    total = errors = 0
+    for op in OPS:
+        if op not in samples:
+            continue
+        latencies = sorted(ms for ms, _ in samples[op])
+        failed = sum(1 for _, status in samples[op] if status != EXPECTED_STATUS[op])
+        endpoints[op] = {
+            "requests": len(latencies),
+            "errors": failed,
+            "throughput_rps": round(len(latencies) / seconds, 1),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "mean_ms": round(sum(latencies) / len(latencies), 3),
+            "max_ms": round(latencies[-1], 3),
+        }
+        total += len(latencies)
+        errors += failed
+    return {
+        "totals": {"requests": total, "errors": errors, "throughput_rps": round(total / seconds, 1)},
+        "endpoints": endpoints,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"\n{'endpoint':<11}{'reqs':>9}{'errors':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for op, r in report["endpoints"].items():
+        print(
+            f"{op:<11}{r['requests']:>9}{r['errors']:>8}{r['throughput_rps']:>9.1f}"
+            f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['max_ms']:>9.2f}"
+        )
+    t = report["totals"]
+    print(f"{'total':<11}{t['requests']:>9}{t['errors']:>8}{t['throughput_rps']:>9.1f}")
+
+    if baseline is None:
+        return
+    print(f"\nchange vs baseline {baseline['meta'].get('commit')} (negative latency / positive rps is better)")
+    print(f"{'endpoint':<11}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for op, r in report["endpoints"].items():
+        before = baseline["endpoints"].get(op)
+        if not before:
+            continue
+        cells = [_change(before[k], r[k]) for k in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")]
+        print(f"{op:<11}" + "".join(f"{c:>9}" for c in cells))
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+# -----------------------------------------------------------------------------
+# Main
+# -----------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="main3", choices=["main3", "main4"])
+    parser.add_argument("--backend", default="sqlite", choices=["sqlite", "mysql"])
+    parser.add_argument("--url", help="benchmark an already running server instead of starting one")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--keep", action="store_true", help="keep seeded rows (mysql) / the SQLite file")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--sqlite", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.app, args.sqlite, args.port)
+        return
+
+    mix = parse_mix(args.mix)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+
+    token = jwt.encode(
+        {"sub": "load-test", "exp": int(time.time()) + 24 * 3600},
+        os.environ.get("AUTH_JWT_SECRET", JWT_SECRET),
+        algorithm="HS256",
+    )
+    auth_headers = {"Authorization": f"Bearer {token}"}
+
+    proc = None
+    sqlite_path = None
+    mysql_cnx = None
+    try:
+        if args.url:
+            base_url = args.url.rstrip("/")
+        else:
+            if args.backend == "sqlite":
+                from benchmarks.sqlite_shim import SQLiteConnection, create_schema
+
+                sqlite_path = os.path.join(tempfile.mkdtemp(prefix="catalog-load-"), "catalog.db")
+                create_schema(sqlite_path)
+                cnx = SQLiteConnection(sqlite_path)
+                seed(cnx, args.rows, args.seed)
+                cnx.close()
+            else:
+                import mysql.connector
+
+                from services.db_config import DB_CONFIG
+
+                mysql_cnx = mysql.connector.connect(**DB_CONFIG)
+                seed(mysql_cnx, args.rows, args.seed)
+            print(f"seeded {args.rows} catalogs ({args.backend})")
+            proc, base_url = start_server(args.app, sqlite_path)
+
+        pois = discover_pois(base_url, auth_headers)
+        if not pois:
+            raise SystemExit("No catalogs to read; seed some or point --url at a populated server")
+
+        samples: List[Dict[str, List[Tuple[float, int]]]] = [{} for _ in range(args.concurrency)]
+        now = time.monotonic()
+        measure_from = now + args.warmup
+        deadline = measure_from + args.duration
+        threads = [
+            threading.Thread(
+                target=run_worker,
+                args=(i, base_url, mix, pois, auth_headers, args.app == "main4", measure_from, deadline, args.seed, samples[i]),
+                daemon=True,
+            )
+            for i in range(args.concurrency)
+        ]
+        print(f"{args.concurrency} clients, {args.warmup:.0f}s warm-up + {args.duration:.0f}s against {base_url}")
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        merged: Dict[str, List[Tuple[float, int]]] = {}
+        for worker_samples in samples:
+            for op, values in worker_samples.items():
+                merged.setdefault(op, []).extend(values)
+
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "app": args.app,
+                "backend": "external" if args.url else args.backend,
+                "rows": None if args.url else args.rows,
+                "duration_s": args.duration,
+                "warmup_s": args.warmup,
+                "concurrency": args.concurrency,
+                "mix": mix,
+                "seed": args.seed,
+                "python": platform.python_version(),
+                "env": {
+                    k: v
+                    for k, v in os.environ.items()
+                    if k.startswith(("CATALOG_", "AUTH_TOKEN_CACHE_")) and not k.startswith("CATALOG_DB_PASS")
+                },
+            },
+            **summarize(merged, args.duration),
+        }
+        print_report(report, baseline)
+        if args.output:
+            with open(args.output, "w") as fh:
+                json.dump(report, fh, indent=2)
+            print(f"\nwrote {args.output}")
+
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(10)
+        if mysql_cnx is not None:
+            if not args.keep:
+                cleanup(mysql_cnx)
+            mysql_cnx.close()
+        if sqlite_path and not args.keep:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(sqlite_path + suffix):
+                    os.remove(sqlite_path + suffix)
+            os.rmdir(os.path.dirname(sqlite_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+SQLite stand-in for mysql.connector, for running the API without a MySQL server.
+
+Only as much as the sync handlers need: %s / %(name)s parameters,
+ON DUPLICATE KEY UPDATE (as ON CONFLICT), FOR UPDATE (dropped),
+GET_LOCK / RELEASE_LOCK (always granted), CONCAT, "; "-separated
+multi-statement execute() with nextset(), dictionary cursors and
+mysql.connector-style errors. FULLTEXT search (q=) and CATALOG_DB_MODE=async
+are not supported. Numbers measured here are for comparing commits on one
+machine, not for sizing MySQL.
+"""
+from __future__ import annotations
+
+import re
+import sqlite3
+from typing import Any, Optional, Sequence
+
+import mysql.connector
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS catalog (
+        poi TEXT PRIMARY KEY, city TEXT, country TEXT, currency TEXT, latitude REAL, longitude REAL,
+        rating REAL, description TEXT, spending TEXT, budget INTEGER, vibes TEXT, activities TEXT,
+        food TEXT, best_season TEXT, trip_days INTEGER, nearest_airport TEXT, transport TEXT,
+        accessibility TEXT, direction TEXT, created_at TIMESTAMP, updated_at TIMESTAMP
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_catalog_city ON catalog (city)",
+    "CREATE INDEX IF NOT EXISTS idx_catalog_rating_poi ON catalog (rating DESC, poi)",
+    """CREATE TABLE IF NOT EXISTS catalog_tag (
+        poi TEXT NOT NULL, kind TEXT NOT NULL, tag TEXT NOT NULL, PRIMARY KEY (kind, tag, poi)
+    )""",
+    """CREATE TABLE IF NOT EXISTS catalog_outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, event_id TEXT UNIQUE, poi TEXT, event_type TEXT,
+        payload TEXT, created_at TIMESTAMP, published_at TIMESTAMP, attempts INTEGER DEFAULT 0,
+        last_error TEXT
+    )""",
+)
+
+_NAMED_PARAM = re.compile(r"%\((\w+)\)s")
+_ON_DUPLICATE = re.compile(r"ON DUPLICATE KEY UPDATE (.*)$", re.S)
+_VALUES_FN = re.compile(r"VALUES\((\w+)\)")
+_DELETE_LIMIT = re.compile(r"^(\s*DELETE\b.*?)\s+LIMIT %s\s*$", re.S)
+
+
+def translate(sql: str, params: Any) -> tuple:
+    """MySQL-flavoured SQL + params -> SQLite SQL + params."""
+    sql = sql.replace(" FOR UPDATE", "")
+    sql = _ON_DUPLICATE.sub(lambda m: "ON CONFLICT(poi) DO UPDATE SET " + _VALUES_FN.sub(r"excluded.\1", m.group(1)), sql)
+    if _DELETE_LIMIT.match(sql):
+        sql = _DELETE_LIMIT.sub(r"\1", sql)
+        params = list(params)[:-1]
+    if isinstance(params, dict):
+        return _NAMED_PARAM.sub(lambda m: f":p_{m.group(1)}", sql), {f"p_{k}": v for k, v in params.items()}
+    return sql.replace("%s", "?"), tuple(params or ())
+
+
+class SQLiteCursor:
+    def __init__(self, raw: sqlite3.Connection, dictionary: bool):
+        self._cursor = raw.cursor()
+        self._dictionary = dictionary
+        self._pending: list = []
+        self.rowcount = -1
+
+    def execute(self, sql: str, params: Any = None) -> None:
+        query, args = translate(sql, params)
+        self._pending = []
+        if "; " in query:
+            # Multi-statement: run the first now, the rest on nextset().
+            first, *rest = query.split("; ")
+            if not isinstance(args, dict):
+                split, args = [], list(args)
+                for statement in [first, *rest]:
+                    n = statement.count("?")
+                    split.append(tuple(args[:n]))
+                    args = args[n:]
+                self._pending = list(zip(rest, split[1:]))
+                args = split[0]
+            else:
+                self._pending = [(statement, args) for statement in rest]
+            query = first
+        self._run(query, args)
+
+    def nextset(self) -> Optional[bool]:
+        if not self._pending:
+            return None
+        self._run(*self._pending.pop(0))
+        return True
+
+    def _run(self, query: str, args: Any) -> None:
+        try:
+            self._cursor.execute(query, args)
+        except sqlite3.IntegrityError as err:
+            raise mysql.connector.IntegrityError(msg=str(err), errno=1062)
+        except sqlite3.Error as err:
+            raise mysql.connector.DatabaseError(msg=str(err))
+        self.rowcount = self._cursor.rowcount
+
+    def executemany(self, sql: str, seq: Sequence[Any]) -> None:
+        for params in seq:
+            self.execute(sql, params)
+
+    def _row(self, row: Optional[tuple]) -> Any:
+        if row is None or not self._dictionary:
+            return row
+        return {d[0]: v for d, v in zip(self._cursor.description, row)}
+
+    def fetchone(self) -> Any:
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self) -> list:
+        return [self._row(r) for r in self._cursor.fetchall()]
+
+    def fetchmany(self, size: int = 1) -> list:
+        return [self._row(r) for r in self._cursor.fetchmany(size)]
+
+    def close(self) -> None:
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    def __init__(self, path: str):
+        self._raw = sqlite3.connect(
+            path,
+            timeout=30,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None,
+        )
+        self._raw.execute("PRAGMA journal_mode=WAL")
+        self._raw.execute("PRAGMA synchronous=NORMAL")
+        self._raw.create_function("GET_LOCK", 2, lambda name, timeout: 1)
+        self._raw.create_function("RELEASE_LOCK", 1, lambda name: 1)
+        self._raw.create_function("CONCAT", -1, lambda *parts: None if None in parts else "".join(map(str, parts)))
+
+    def cursor(self, dictionary: bool = False, buffered: Optional[bool] = None) -> SQLiteCursor:
+        return SQLiteCursor(self._raw, dictionary)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._raw.in_transaction
+
+    def start_transaction(self, **kwargs: Any) -> None:
+        self._raw.execute("BEGIN")
+
+    def commit(self) -> None:
+        if self._raw.in_transaction:
+            self._raw.execute("COMMIT")
+
+    def rollback(self) -> None:
+        if self._raw.in_transaction:
+            self._raw.execute("ROLLBACK")
+
+    def is_connected(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self._raw.close()
+
+
+def create_schema(path: str) -> None:
+    cnx = SQLiteConnection(path)
+    try:
+        for ddl in SCHEMA:
+            cnx._raw.execute(ddl)
+    finally:
+        cnx.close()
@@ -0,0 +1,125 @@
+"""
+Cold-start cost of the catalog apps: import, lifespan startup, first request.
+
+Each run is a fresh interpreter that imports the app module, enters the
+lifespan through TestClient (startup hooks: pool warm-up, dispatcher
+threads, ...) and serves one GET /health. Reports the median of --runs
+per target; "cold" is import + startup + first request, i.e. how long a
+new worker takes before it can answer. No database is needed: the pool
+warm-up is skipped (CATALOG_DB_POOL_MIN_SIZE=0 unless already set).
+
+    python -m benchmarks.startup main3 main4 --runs 10 --budget-ms 1500
+    python -m benchmarks.startup main3 --importtime 15
+
+--budget-ms exits 1 when any target's median cold start is over budget, so
+the check can gate CI. --importtime N prints the N slowest imports (cumulative,
+from python -X importtime) for each target.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+module = __import__(sys.argv[1])
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(module.app)
+ready = time.perf_counter()
+client.__enter__()
+started_up = time.perf_counter()
+status = client.get("/health").status_code
+served = time.perf_counter()
+client.__exit__(None, None, None)
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (started_up - ready) * 1000,
+    "first_request_ms": (served - started_up) * 1000,
+    "status": status,
+}))
+"""
+
+COLUMNS = ("import_ms", "startup_ms", "first_request_ms", "cold_ms", "process_ms")
+
+
+def child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("CATALOG_DB_POOL_MIN_SIZE", "0")
+    return env
+
+
+def run_once(target: str) -> Dict[str, float]:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD, target],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True,
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise SystemExit(f"{target}: child exited {proc.returncode}\n{proc.stderr.strip()}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    if result["status"] != 200:
+        raise SystemExit(f"{target}: GET /health returned {result['status']}")
+    result["cold_ms"] = result["import_ms"] + result["startup_ms"] + result["first_request_ms"]
+    result["process_ms"] = process_ms
+    return result
+
+
+def slowest_imports(target: str, top: int) -> List[Tuple[int, str]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="*", default=["main3", "main4"], help="app modules exposing `app`")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per target (median reported)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail when a median cold start exceeds this")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="also print the N slowest imports")
+    args = parser.parse_args()
+
+    run_once(args.targets[0])  # warm the bytecode and OS file caches
+
+    print(f"{'target':<10}" + "".join(f"{c:>18}" for c in COLUMNS))
+    over_budget = []
+    for target in args.targets:
+        runs = [run_once(target) for _ in range(args.runs)]
+        medians = {c: statistics.median(r[c] for r in runs) for c in COLUMNS}
+        print(f"{target:<10}" + "".join(f"{medians[c]:>18.1f}" for c in COLUMNS))
+        if args.budget_ms is not None and medians["cold_ms"] > args.budget_ms:
+            over_budget.append((target, medians["cold_ms"]))
+
+    for target in args.targets if args.importtime else ():
+        print(f"\nslowest imports for {target} (cumulative ms)")
+        for micros, name in slowest_imports(target, args.importtime):
+            print(f"{micros / 1000:>10.1f}  {name}")
+
+    if args.budget_ms is not None:
+        for target, cold in over_budget:
+            print(f"{target}: cold start {cold:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+        if over_budget:
+            sys.exit(1)
+        print(f"all targets within the {args.budget_ms:.0f} ms cold-start budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+from catalog_app.context import CatalogContext
+from catalog_app.factory import create_app
+from catalog_app.settings import FEATURES, AppSettings, settings_from_env
+
+__all__ = ["FEATURES", "AppSettings", "CatalogContext", "create_app", "settings_from_env"]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from catalog_app.settings import AppSettings
+from services.cache import TTLCache
+from services.db_config import DB_CONFIG
+from services.db_pool import ConnectionPool, pool_settings_from_env
+from services.events import EventEmitter, catalog_event_emitter
+from services.facets import FacetIndex
+from services.geo import GeoIndex
+from services.invalidation import CatalogListener, CatalogListeners
+
+
+def connect_mysql() -> Any:
+    """mysql.connector is imported on the first connection, not when the app is built."""
+    import mysql.connector
+
+    return mysql.connector.connect(**DB_CONFIG)
+
+
+def auth_not_configured() -> Dict[str, Any]:
+    """require_user until the auth feature installs a real check: protected routes stay closed."""
+    raise HTTPException(status_code=403, detail="Not authenticated")
+
+
+# -----------------------------------------------------------------------------
+# Per-app state shared by the feature modules
+#
+# Building a CatalogContext opens no connection and creates no client: the
+# pools connect on first borrow (or the startup warm-up), the facet / geo
+# indexes load on the first search, and the event publisher is created by
+# the dispatcher thread on its first publish. Features fill in the optional
+# parts (real caches, auth, events, the slow-query log) as they install.
+# -----------------------------------------------------------------------------
+class CatalogContext:
+    def __init__(self, settings: AppSettings):
+        self.settings = settings
+
+        self.db_pool = ConnectionPool(connect_mysql, **pool_settings_from_env())
+        self.async_db_pool: Optional[Any] = None
+        if settings.db_mode == "async":
+            from services.async_db import AsyncConnectionPool
+
+            self.async_db_pool = AsyncConnectionPool(DB_CONFIG, **pool_settings_from_env())
+
+        # Called after every committed write to this catalog (services/invalidation.py).
+        self.change_listeners = CatalogListeners()
+
+        # ttl=0 stores nothing; the caches feature swaps in real ones.
+        self.catalog_cache = TTLCache(ttl=0)
+        self.list_cache = TTLCache(ttl=0)
+
+        # Bitmap facet index behind GET /catalogs/search; loaded on first use.
+        self.facet_index = FacetIndex()
+        self.on_catalog_change(self.facet_index.invalidate)
+
+        # Lat/lon grid behind GET /catalogs/nearby; loaded on first use.
+        self.geo_index = GeoIndex()
+        self.on_catalog_change(self.geo_index.invalidate)
+
+        self.require_user: Callable[..., Dict[str, Any]] = auth_not_configured
+        self.jwt_verifier: Optional[Any] = None
+        self.invalidation_bus: Optional[Any] = None
+        self.event_dispatcher: Optional[Any] = None
+        # Change events from the write handlers; the events feature swaps in one with a dispatcher.
+        self.emit_catalog_event: EventEmitter = catalog_event_emitter(None)
+        self.outbox_relay: Optional[Any] = None
+        self.slow_query_log: Optional[Any] = None
+        self.readiness: Optional[Any] = None
+
+    def on_catalog_change(self, listener: CatalogListener) -> CatalogListener:
+        """Register a listener for this app's catalog changes (usable as a decorator)."""
+        return self.change_listeners.add(listener)
+
+    @property
+    def async_mode(self) -> bool:
+        return self.settings.db_mode == "async"
+
+    def get_connection(self) -> Any:
+        """Borrow a pooled connection; cnx.close() hands it back to the pool."""
+        return self.db_pool.acquire()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        if self.async_mode:
+            return self.async_db_pool.stats()
+        return self.db_pool.stats()
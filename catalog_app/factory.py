@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import importlib
+from typing import Optional
+
+from fastapi import FastAPI
+
+from catalog_app.context import CatalogContext
+from catalog_app.settings import FEATURES, AppSettings, settings_from_env
+
+
+def create_app(settings: Optional[AppSettings] = None) -> FastAPI:
+    """
+    Build the Catalog API: a FastAPI app whose CatalogContext is
+    app.state.catalog, with each enabled feature module from
+    catalog_app/features installed in FEATURES order. A disabled feature's
+    module is never imported.
+
+    Each app has its own pools, caches, change listeners and event
+    dispatcher, so several can share a process (tests do). The metrics
+    registry and statement observers in services/metrics.py stay
+    process-wide.
+    """
+    settings = settings or settings_from_env()
+    app = FastAPI(title=settings.title, description=settings.description, version="0.1.0")
+    ctx = CatalogContext(settings)
+    app.state.catalog = ctx
+
+    for name in FEATURES:
+        if settings.enabled(name):
+            importlib.import_module(f"catalog_app.features.{name}").install(app, ctx)
+
+    @app.get("/")
+    def root():
+        return {"message": settings.welcome}
+
+    return app
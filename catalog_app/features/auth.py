@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Depends, FastAPI, Header, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from catalog_app.context import CatalogContext
+from services.auth_cache import CachedJWTVerifier, InvalidToken, TokenExpired
+from services.cache import TTLCache, cache_settings_from_env
+from services.metrics import REGISTRY
+
+# -----------------------------------------------------------------------------
+# JWT + Security (Req 3)
+#
+# Tokens are issued by tripspark-auth with the same AUTH_JWT_SECRET. PyJWT
+# (and the crypto backend it pulls in) is imported on the first token that
+# misses the verified-token cache, not at boot.
+# -----------------------------------------------------------------------------
+AUTH_JWT_SECRET = os.environ.get("AUTH_JWT_SECRET", "dev-secret-change-me")
+
+UserDependency = Callable[..., Dict[str, Any]]
+
+
+def bearer_user_dependency(verifier: CachedJWTVerifier) -> UserDependency:
+    """HTTPBearer scheme (shows up in /docs); a missing or bad token is a 403."""
+    security = HTTPBearer(auto_error=False)
+
+    def get_current_user(
+        credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    ):
+        """
+        Extract and verify a TripSpark JWT from the Authorization: Bearer <token> header.
+        This expects tokens issued by tripspark-auth using the same AUTH_JWT_SECRET.
+        """
+        if credentials is None:
+            # No Authorization header / not Bearer
+            raise HTTPException(status_code=403, detail="Not authenticated")
+
+        token = credentials.credentials  # just the token, no "Bearer " text
+        try:
+            return verifier.verify(token)
+        except Exception:
+            raise HTTPException(status_code=403, detail="Not authenticated")
+
+    return get_current_user
+
+
+def header_user_dependency(verifier: CachedJWTVerifier) -> UserDependency:
+    """Raw Authorization header; 403 without a bearer token, 401 for an expired or invalid one."""
+
+    def verify_jwt_or_401(authorization: str = Header(None)) -> Dict[str, Any]:
+        """
+        Dependency to validate our TripSpark JWT from tripspark-auth.
+
+        Expects:  Authorization: Bearer <token>
+        """
+        if not authorization or not authorization.startswith("Bearer "):
+            raise HTTPException(status_code=403, detail="Not authenticated")
+
+        token = authorization.split(" ", 1)[1].strip()
+
+        try:
+            return verifier.verify(token)
+        except TokenExpired:
+            raise HTTPException(status_code=401, detail="Token expired")
+        except InvalidToken:
+            raise HTTPException(status_code=401, detail="Invalid token")
+
+    return verify_jwt_or_401
+
+
+def install(app: FastAPI, ctx: CatalogContext) -> None:
+    # Tokens already verified are served from memory until their exp.
+    ctx.jwt_verifier = CachedJWTVerifier(
+        AUTH_JWT_SECRET,
+        TTLCache(**cache_settings_from_env("AUTH_TOKEN_CACHE_", max_entries=10000, ttl=300, max_bytes=4 * 1024 * 1024)),
+    )
+    if ctx.settings.auth_style == "header":
+        ctx.require_user = header_user_dependency(ctx.jwt_verifier)
+    else:
+        ctx.require_user = bearer_user_dependency(ctx.jwt_verifier)
+
+    @app.get("/secure-catalog-ping")
+    def secure_catalog_ping(user: Dict[str, Any] = Depends(ctx.require_user)):
+        """
+        Simple secured endpoint to demonstrate:
+        - Microservice receives JWT from tripspark-auth
+        - Validates using AUTH_JWT_SECRET
+        - Returns decoded user info
+        """
+        return {
+            "message": "Secure Catalog endpoint OK",
+            "user": user,
+        }
+
+    REGISTRY.register_stats("cache", ctx.jwt_verifier.stats, {"cache": "auth"})
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from fastapi import Depends, FastAPI
+
+from catalog_app.context import CatalogContext
+from services.cache import TTLCache, cache_settings_from_env
+from services.metrics import REGISTRY
+
+
+# -----------------------------------------------------------------------------
+# Catalog read caches (services/cache.py)
+#
+# Without this feature the handlers run uncached against the DB.
+# -----------------------------------------------------------------------------
+def install(app: FastAPI, ctx: CatalogContext) -> None:
+    # Read-through cache for GET /catalogs/{poi}, keyed on the normalized poi.
+    ctx.catalog_cache = TTLCache(**cache_settings_from_env("CATALOG_CACHE_"))
+    ctx.on_catalog_change(ctx.catalog_cache.invalidate)
+
+    # Result cache for filtered GET /catalogs searches; any catalog write flushes it.
+    list_cache = ctx.list_cache = TTLCache(**cache_settings_from_env("CATALOG_LIST_CACHE_", max_entries=1000, ttl=60))
+    ctx.on_catalog_change(lambda poi: list_cache.clear())
+
+    @app.get("/cache/stats")
+    def get_cache_stats(user: Dict[str, Any] = Depends(ctx.require_user)):
+        """Hit / miss / eviction counters for the in-process caches and indexes."""
+        stats = {
+            "catalog": ctx.catalog_cache.stats(),
+            "list": ctx.list_cache.stats(),
+            "facets": ctx.facet_index.stats(),
+            "geo": ctx.geo_index.stats(),
+        }
+        if ctx.jwt_verifier is not None:
+            stats["auth"] = ctx.jwt_verifier.stats()
+        if ctx.invalidation_bus is not None:
+            stats["invalidation_bus"] = ctx.invalidation_bus.stats()
+        return stats
+
+    REGISTRY.register_stats("cache", ctx.catalog_cache.stats, {"cache": "catalog"})
+    REGISTRY.register_stats("cache", ctx.list_cache.stats, {"cache": "list"})
+    REGISTRY.register_stats("index", ctx.facet_index.stats, {"index": "facets"})
+    REGISTRY.register_stats("index", ctx.geo_index.stats, {"index": "geo"})
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from fastapi import Depends, FastAPI
+
+from catalog_app.context import CatalogContext
+
+
+# -----------------------------------------------------------------------------
+# Catalog routes: services/catalog_sync.py or services/catalog_async.py by
+# CATALOG_DB_MODE. Only the chosen module (and its DB driver) is imported.
+# Installed after events, so ctx.emit_catalog_event is final here.
+# -----------------------------------------------------------------------------
+def install(app: FastAPI, ctx: CatalogContext) -> None:
+    list_dependencies = [Depends(ctx.require_user)] if ctx.settings.protect_reads else []
+    if ctx.async_mode:
+        from services.catalog_async import build_async_catalog_router
+
+        router = build_async_catalog_router(
+            ctx.async_db_pool, ctx.catalog_cache, ctx.list_cache, ctx.facet_index, ctx.geo_index,
+            ctx.change_listeners.notify, ctx.emit_catalog_event,
+            list_dependencies=list_dependencies,
+        )
+    else:
+        from services.catalog_sync import build_sync_catalog_router
+
+        router = build_sync_catalog_router(
+            ctx.get_connection, ctx.catalog_cache, ctx.list_cache, ctx.facet_index, ctx.geo_index,
+            ctx.change_listeners.notify, ctx.emit_catalog_event,
+            list_dependencies=list_dependencies,
+        )
+    app.include_router(router)
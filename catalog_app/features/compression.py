@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+
+from catalog_app.context import CatalogContext
+from services.compression import COMPRESSION_ENABLED, CompressionMiddleware, compression_settings_from_env
+
+
+# -----------------------------------------------------------------------------
+# Response compression (gzip / brotli by Accept-Encoding; services/compression.py)
+# -----------------------------------------------------------------------------
+def install(app: FastAPI, ctx: CatalogContext) -> None:
+    if COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware, **compression_settings_from_env())
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+
+from catalog_app.context import CatalogContext
+from services.db_pool import ConnectionPool, PoolTimeout
+from services.metrics import REGISTRY
+
+
+def warm_pool(pool: ConnectionPool) -> None:
+    try:
+        pool.warm()
+    except Exception as err:
+        # Don't fail boot on the DB; the pool opens connections on demand.
+        print(f"[CATALOG DB-POOL] Warm-up failed: {err}")
+
+
+# -----------------------------------------------------------------------------
+# DB Connection Pool lifecycle + stats
+#
+# The sync pool warms up in a worker thread so the server starts accepting
+# requests without waiting for MySQL; until it answers, GET /ready reports
+# the db check as failing.
+# -----------------------------------------------------------------------------
+def install(app: FastAPI, ctx: CatalogContext) -> None:
+    @app.on_event("startup")
+    async def open_db_pool():
+        if ctx.async_mode:
+            await ctx.async_db_pool.open()
+            return
+        asyncio.get_running_loop().run_in_executor(None, warm_pool, ctx.db_pool)
+
+    @app.on_event("shutdown")
+    async def close_db_pool():
+        if ctx.async_mode:
+            await ctx.async_db_pool.close()
+        else:
+            ctx.db_pool.close_all()
+
+    @app.exception_handler(PoolTimeout)
+    def pool_timeout_handler(request, exc: PoolTimeout):
+        return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+    @app.get("/db/pool-stats")
+    def get_pool_stats(user: Dict[str, Any] = Depends(ctx.require_user)):
+        """In-use / idle connections and borrow wait times, for sizing the pool."""
+        return ctx.pool_stats()
+
+    REGISTRY.register_stats("db_pool", ctx.pool_stats)
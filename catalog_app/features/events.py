@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from fastapi import Depends, FastAPI, HTTPException, Query
+
+from catalog_app.context import CatalogContext
+from services.events import catalog_event_emitter, event_dispatcher_from_env
+from services.metrics import REGISTRY
+from services.outbox import OUTBOX_ENABLED, outbox_relay_from_env
+
+
+# -----------------------------------------------------------------------------
+# Catalog change events (batched, retried in the background; services/events.py)
+#
+# The Pub/Sub client is not created here: services.events hands the
+# dispatcher a publisher that imports google-cloud-pubsub and builds the
+# client on its first publish, on the dispatcher thread.
+# -----------------------------------------------------------------------------
+def install(app: FastAPI, ctx: CatalogContext) -> None:
+    default_publisher = ctx.settings.default_publisher
+    event_dispatcher = ctx.event_dispatcher = event_dispatcher_from_env(default_publisher)
+
+    # CATALOG_OUTBOX=1: writes record their event in catalog_outbox in the same
+    # transaction and the relay publishes it (services/outbox.py).
+    outbox_relay = ctx.outbox_relay = outbox_relay_from_env(ctx.get_connection, default_publisher)
+    ctx.emit_catalog_event = catalog_event_emitter(None if OUTBOX_ENABLED else event_dispatcher)
+    if outbox_relay is not None:
+        ctx.on_catalog_change(outbox_relay.wake)
+
+    @app.on_event("startup")
+    def start_event_dispatcher():
+        if event_dispatcher is not None:
+            event_dispatcher.start()
+        if outbox_relay is not None:
+            outbox_relay.start()
+
+    @app.on_event("shutdown")
+    def stop_event_dispatcher():
+        if outbox_relay is not None:
+            outbox_relay.stop()
+        if event_dispatcher is not None:
+            event_dispatcher.stop()
+
+    @app.get("/events/stats")
+    def get_event_stats(user: Dict[str, Any] = Depends(ctx.require_user)):
+        """Queue depth and delivery counters for the change-event dispatcher and outbox relay."""
+        stats: Dict[str, Any] = {"enabled": False}
+        if event_dispatcher is not None:
+            stats = {"enabled": True, **event_dispatcher.stats()}
+        stats["outbox"] = {"enabled": OUTBOX_ENABLED, **(outbox_relay.stats() if outbox_relay is not None else {})}
+        return stats
+
+    @app.get("/events/{event_id}")
+    def get_event_status(event_id: str, user: Dict[str, Any] = Depends(ctx.require_user)):
+        """Delivery status of a recently queued event (queued / retrying / published / failed)."""
+        status = event_dispatcher.status(event_id) if event_dispatcher is not None else None
+        if status is None:
+            raise HTTPException(status_code=404, detail=f"Event {event_id} not found")
+        return status
+
+    if ctx.settings.event_test:
+        @app.post("/event-test", status_code=202)
+        def event_test(message: str = Query("Hello from Catalog VM!")):
+            """
+            Simple endpoint to demonstrate:
+            - Catalog microservice publishes an event to Pub/Sub topic `tripspark-events`
+            - tripspark-event-handler Cloud Run is triggered by that topic.
+
+            The event is queued and published in the background; follow it with
+            GET /events/{event_id}.
+            """
+            if event_dispatcher is None:
+                raise HTTPException(status_code=503, detail="Event publishing is disabled (CATALOG_EVENTS_PUBLISHER=none)")
+
+            payload = {
+                "source": "catalog-microservice",
+                "event_type": "CATALOG_TEST",
+                "message": message,
+            }
+
+            event_id = event_dispatcher.enqueue(payload, event_type="CATALOG_TEST")
+            if event_id is None:
+                raise HTTPException(status_code=503, detail="Event queue is full")
+
+            print(f"[CATALOG EVENT-TEST] Queued event_id={event_id}, payload={payload}")
+
+            return {
+                "status": "event queued",
+                "topic": event_dispatcher.topic_path,
+                "event_id": event_id,
+                "payload": payload,
+            }
+
+    if event_dispatcher is not None:
+        REGISTRY.register_stats("events", event_dispatcher.stats)
+    if outbox_relay is not None:
+        REGISTRY.register_stats("outbox", outbox_relay.stats)
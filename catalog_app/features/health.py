@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import FastAPI, Path, Query
+
+from catalog_app.context import CatalogContext
+from models.health import Health
+from services.health import host_ip
+
+
+# -----------------------------------------------------------------------------
+# Health Endpoint
+# -----------------------------------------------------------------------------
+def make_health(echo: Optional[str], path_echo: Optional[str] = None) -> Health:
+    return Health(
+        status=200,
+        status_message="OK",
+        timestamp=datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z",
+        ip_address=host_ip(),
+        echo=echo,
+        path_echo=path_echo,
+    )
+
+
+def install(app: FastAPI, ctx: CatalogContext) -> None:
+    @app.get("/health", response_model=Health)
+    def get_health_no_path(echo: Optional[str] = Query(None)):
+        return make_health(echo=echo)
+
+    @app.get("/health/{path_echo}", response_model=Health)
+    def get_health_with_path(path_echo: str = Path(...), echo: Optional[str] = Query(None)):
+        return make_health(echo=echo, path_echo=path_echo)
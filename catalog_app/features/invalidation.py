@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+
+from catalog_app.context import CatalogContext
+from services.invalidation_bus import invalidation_bus_from_env
+from services.metrics import REGISTRY
+
+
+# -----------------------------------------------------------------------------
+# Cross-worker invalidation (services/invalidation_bus.py)
+#
+# Off unless CATALOG_INVALIDATION_BUS is set (gunicorn.conf.py sets it to
+# unix for more than one worker). The bus starts in each worker's startup,
+# i.e. after the fork, so every worker binds its own socket.
+# -----------------------------------------------------------------------------
+def install(app: FastAPI, ctx: CatalogContext) -> None:
+    bus = ctx.invalidation_bus = invalidation_bus_from_env()
+    if bus is None:
+        return
+
+    @app.on_event("startup")
+    def start_invalidation_bus():
+        bus.start(ctx.change_listeners.deliver)
+        ctx.change_listeners.forward = bus.publish
+        print(f"[CATALOG INVALIDATION] Listening on {bus.path}")
+
+    @app.on_event("shutdown")
+    def stop_invalidation_bus():
+        ctx.change_listeners.forward = None
+        bus.stop()
+
+    REGISTRY.register_stats("invalidation_bus", bus.stats)
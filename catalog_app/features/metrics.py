@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from catalog_app.context import CatalogContext
+from services.metrics import METRICS_ENABLED, PROMETHEUS_CONTENT_TYPE, REGISTRY, MetricsMiddleware
+
+
+# -----------------------------------------------------------------------------
+# Metrics (Prometheus text format; services/metrics.py)
+#
+# Installed last so MetricsMiddleware is the outermost middleware. The other
+# features register their own stats with REGISTRY.
+# -----------------------------------------------------------------------------
+def install(app: FastAPI, ctx: CatalogContext) -> None:
+    if METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics():
+        return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Response
+
+from catalog_app.context import CatalogContext
+from services.metrics import REGISTRY, on_statement
+from services.query_log import (
+    DB_PROFILE_ENABLED,
+    QUERY_ORDERS,
+    DBProfileMiddleware,
+    profile_statement,
+    slow_query_log_from_env,
+)
+
+
+# -----------------------------------------------------------------------------
+# Slow-query log + per-request DB profile (services/query_log.py)
+# -----------------------------------------------------------------------------
+def install(app: FastAPI, ctx: CatalogContext) -> None:
+    # EXPLAINs (CATALOG_SLOW_QUERY_EXPLAIN=1) borrow from the sync pool in both modes.
+    slow_query_log = ctx.slow_query_log = slow_query_log_from_env(ctx.get_connection)
+    if slow_query_log is not None:
+        on_statement(slow_query_log.record)
+
+    if DB_PROFILE_ENABLED:
+        on_statement(profile_statement)
+        app.add_middleware(DBProfileMiddleware)
+
+    @app.get("/db/slow-queries")
+    def get_slow_queries(
+        limit: int = Query(20, ge=1, le=500),
+        order: str = Query("total_ms", description=f"One of {', '.join(QUERY_ORDERS)}"),
+        user: Dict[str, Any] = Depends(ctx.require_user),
+    ):
+        """Heaviest statement shapes (with EXPLAIN output when captured) and the latest slow statements."""
+        if slow_query_log is None:
+            return {"enabled": False}
+        if order not in QUERY_ORDERS:
+            raise HTTPException(status_code=422, detail=f"order must be one of {', '.join(QUERY_ORDERS)}")
+        return {
+            "enabled": True,
+            **slow_query_log.stats(),
+            "top": slow_query_log.top(limit, order),
+            "recent": slow_query_log.recent(limit),
+        }
+
+    @app.delete("/db/slow-queries", status_code=204)
+    def reset_slow_queries(user: Dict[str, Any] = Depends(ctx.require_user)):
+        if slow_query_log is not None:
+            slow_query_log.reset()
+        return Response(status_code=204)
+
+    if slow_query_log is not None:
+        REGISTRY.register_stats("query_log", slow_query_log.stats)
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from fastapi import FastAPI, Response
+
+from catalog_app.context import CatalogContext
+from services.health import (
+    ReadinessProbe,
+    async_db_ping_check,
+    db_ping_check,
+    pool_check,
+    probe_settings_from_env,
+    publish_backlog_check,
+)
+from services.metrics import REGISTRY
+
+
+# -----------------------------------------------------------------------------
+# Readiness probe (pool headroom, DB round trip, publish backlog; services/health.py)
+# -----------------------------------------------------------------------------
+def install(app: FastAPI, ctx: CatalogContext) -> None:
+    readiness = ctx.readiness = ReadinessProbe(**probe_settings_from_env())
+    readiness.add_check("db_pool", pool_check(ctx.pool_stats))
+    readiness.add_check("db", async_db_ping_check(ctx.async_db_pool) if ctx.async_mode else db_ping_check(ctx.get_connection))
+    readiness.add_check("events", publish_backlog_check(ctx.event_dispatcher, ctx.outbox_relay))
+
+    @app.get("/ready")
+    async def get_readiness(response: Response):
+        """200 when this instance can serve traffic, 503 otherwise; cached for CATALOG_READY_TTL seconds."""
+        result = await readiness.run()
+        if not result["ready"]:
+            response.status_code = 503
+        return result
+
+    REGISTRY.register_stats("readiness", readiness.stats)
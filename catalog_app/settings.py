@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, replace
+from typing import Any, Tuple
+
+# -----------------------------------------------------------------------------
+# Application settings
+#
+# One AppSettings per deployed flavour: main3.py and main4.py differ only in
+# the fields below (auth style, which reads need a JWT, the default event
+# publisher, the /event-test demo and their titles).
+#
+# FEATURES lists the feature modules under catalog_app/features in install
+# order. CATALOG_FEATURES=health,caches,... picks a subset; "db" and
+# "catalogs" are always installed.
+# -----------------------------------------------------------------------------
+FEATURES: Tuple[str, ...] = (
+    "health",
+    # Before the features that mount operator routes, so ctx.require_user is real there.
+    "auth",
+    "db",
+    "caches",
+    "invalidation",
+    "events",
+    "readiness",
+    "catalogs",
+    "compression",
+    "query_log",
+    "metrics",
+)
+REQUIRED_FEATURES: Tuple[str, ...] = ("db", "catalogs")
+
+AUTH_STYLES: Tuple[str, ...] = ("bearer", "header")
+
+
+@dataclass(frozen=True)
+class AppSettings:
+    title: str = "TripSpark - Catalog API"
+    description: str = "FastAPI app using Pydantic v2 models for TripSpark - Catalog deployed in GCP VM"
+    welcome: str = "Welcome to the TripSpark - Catalog API. See /docs for OpenAPI UI."
+    # "sync" (mysql.connector + threadpool handlers) or "async" (aiomysql + async def handlers)
+    db_mode: str = "sync"
+    features: Tuple[str, ...] = FEATURES
+    # "bearer": HTTPBearer, any bad token is a 403 (main3).
+    # "header": raw Authorization header, 401 for expired / invalid tokens (main4).
+    auth_style: str = "bearer"
+    # GET /catalogs, /catalogs/export, /catalogs/search and /catalogs/nearby need a JWT.
+    protect_reads: bool = False
+    # CATALOG_EVENTS_PUBLISHER when unset: pubsub, fake or none.
+    default_publisher: str = "none"
+    # POST /event-test, the Pub/Sub demo endpoint.
+    event_test: bool = False
+
+    def __post_init__(self) -> None:
+        if self.db_mode not in ("sync", "async"):
+            raise RuntimeError(f"CATALOG_DB_MODE must be 'sync' or 'async', got {self.db_mode!r}")
+        if self.auth_style not in AUTH_STYLES:
+            raise RuntimeError(f"auth_style must be one of {', '.join(AUTH_STYLES)}, got {self.auth_style!r}")
+        unknown = [name for name in self.features if name not in FEATURES]
+        if unknown:
+            raise RuntimeError(f"Unknown features: {', '.join(unknown)} (expected some of {', '.join(FEATURES)})")
+
+    def enabled(self, feature: str) -> bool:
+        return feature in self.features or feature in REQUIRED_FEATURES
+
+
+def settings_from_env(**overrides: Any) -> AppSettings:
+    """AppSettings(**overrides) with CATALOG_DB_MODE and CATALOG_FEATURES applied."""
+    settings = AppSettings(**overrides)
+    features = os.environ.get("CATALOG_FEATURES")
+    return replace(
+        settings,
+        db_mode=os.environ.get("CATALOG_DB_MODE", settings.db_mode).lower(),
+        features=tuple(f.strip() for f in features.split(",") if f.strip()) if features else settings.features,
+    )
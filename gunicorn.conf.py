@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+
+from services.invalidation_bus import bus_settings_from_env, socket_path
+
+# -----------------------------------------------------------------------------
+# Multi-worker serving: gunicorn managing uvicorn workers
+#
+#   gunicorn main3:app          # picks up ./gunicorn.conf.py
+#
+# Each worker imports the app and runs its own startup after the fork
+# (preload_app stays off), so pools, caches and the event dispatcher are
+# per worker. With more than one worker the cross-worker invalidation bus
+# defaults to unix, so a write in one worker evicts the others' caches.
+# -----------------------------------------------------------------------------
+bind = os.environ.get("CATALOG_BIND", f"0.0.0.0:{os.environ.get('FASTAPIPORT', 8000)}")
+workers = int(os.environ.get("CATALOG_WORKERS", multiprocessing.cpu_count()))
+worker_class = os.environ.get("CATALOG_WORKER_CLASS", "uvicorn.workers.UvicornWorker")
+
+# A worker that misses heartbeats this long is restarted; shutdown gets
+# graceful_timeout seconds to finish requests and flush queued events.
+timeout = int(os.environ.get("CATALOG_WORKER_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("CATALOG_WORKER_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("CATALOG_WORKER_KEEPALIVE", 5))
+
+# Recycle workers after this many requests (0 = never), spread by the jitter.
+max_requests = int(os.environ.get("CATALOG_WORKER_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.environ.get("CATALOG_WORKER_MAX_REQUESTS_JITTER", 0))
+
+preload_app = False
+
+if workers > 1:
+    # Read by every worker's app (catalog_app/features/invalidation.py).
+    os.environ.setdefault("CATALOG_INVALIDATION_BUS", "unix")
+
+
+def child_exit(server, worker):
+    """Remove the bus socket of a worker that exited, even if it was killed."""
+    try:
+        os.unlink(socket_path(bus_settings_from_env()["directory"], worker.pid))
+    except FileNotFoundError:
+        pass
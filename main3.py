@@ -1,439 +1,27 @@
 from __future__ import annotations
 
 import os
-import socket
-from datetime import datetime
-from typing import List, Optional, Dict
 
-from fastapi import FastAPI, HTTPException, Query, Path, Depends
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-import mysql.connector
-import jwt  # PyJWT
-
-from models.catalog import CatalogCreate, CatalogRead, CatalogUpdate
-from models.health import Health
+from catalog_app import create_app, settings_from_env
 
 # -----------------------------------------------------------------------------
-# MySQL Connectivity
+# TripSpark - Catalog API, open catalog routes
+#
+# The service is built by catalog_app.create_app; this module only picks the
+# flavour: HTTPBearer auth (403 on a bad token) for the secured endpoints,
+# Pub/Sub change events by default and the POST /event-test demo.
 # -----------------------------------------------------------------------------
-DB_CONFIG = {
-    "host": "10.142.0.4",
-    "user": "felicia",
-    "password": "1234",
-    "database": "TripSparkCatalog",
-}
-
-
-def get_connection():
-    return mysql.connector.connect(**DB_CONFIG)
+app = create_app(settings_from_env(
+    auth_style="bearer",
+    default_publisher="pubsub",
+    event_test=True,
+))
 
+# Pools, caches, dispatcher etc. for scripts and benchmarks (catalog.db_pool, ...)
+catalog = app.state.catalog
 
-# -----------------------------------------------------------------------------
-# App Config
-# -----------------------------------------------------------------------------
 port = int(os.environ.get("FASTAPIPORT", 8000))
 
-app = FastAPI(
-    title="TripSpark - Catalog API",
-    description="FastAPI app using Pydantic v2 models for TripSpark - Catalog deployed in GCP VM",
-    version="0.1.0",
-)
-
-# -----------------------------------------------------------------------------
-# Health Endpoint
-# -----------------------------------------------------------------------------
-def make_health(echo: Optional[str], path_echo: Optional[str] = None) -> Health:
-    try:
-        ip_catalog = socket.gethostbyname(socket.gethostname())
-    except Exception:
-        ip_catalog = "127.0.0.1"
-
-    return Health(
-        status=200,
-        status_message="OK",
-        timestamp=datetime.utcnow().isoformat() + "Z",
-        ip_address=ip_catalog,
-        echo=echo,
-        path_echo=path_echo,
-    )
-
-
-@app.get("/health", response_model=Health)
-def get_health_no_path(echo: Optional[str] = Query(None)):
-    return make_health(echo=echo)
-
-
-@app.get("/health/{path_echo}", response_model=Health)
-def get_health_with_path(path_echo: str = Path(...), echo: Optional[str] = Query(None)):
-    return make_health(echo=echo, path_echo=path_echo)
-
-
-# -----------------------------------------------------------------------------
-# Utility: normalize DB rows for CatalogRead
-# -----------------------------------------------------------------------------
-def normalize_catalog_row(row: dict) -> dict:
-    """
-    Convert sets/lists in DB row to comma-separated strings for Pydantic.
-    Adjusts fields like 'vibes', 'activities', 'food' if they come back as list/set.
-    """
-    for field in ["vibes", "activities", "food"]:
-        if field in row and isinstance(row[field], (set, list)):
-            row[field] = ", ".join(sorted(row[field]))
-    return row
-
-
-# -----------------------------------------------------------------------------
-# JWT + Security (Req 3)
-# -----------------------------------------------------------------------------
-security = HTTPBearer(auto_error=False)
-AUTH_JWT_SECRET = os.environ.get("AUTH_JWT_SECRET", "dev-secret-change-me")
-
-
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(security),
-):
-    """
-    Extract and verify a TripSpark JWT from the Authorization: Bearer <token> header.
-    This expects tokens issued by tripspark-auth using the same AUTH_JWT_SECRET.
-    """
-    if credentials is None:
-        # No Authorization header / not Bearer
-        raise HTTPException(status_code=403, detail="Not authenticated")
-
-    token = credentials.credentials  # just the token, no "Bearer " text
-    try:
-        payload = jwt.decode(token, AUTH_JWT_SECRET, algorithms=["HS256"])
-        return payload
-    except Exception:
-        # Could log details here if you want
-        raise HTTPException(status_code=403, detail="Not authenticated")
-
-
-@app.get("/secure-catalog-ping")
-def secure_catalog_ping(user: Dict = Depends(get_current_user)):
-    """
-    Simple secured endpoint to demonstrate:
-    - Microservice receives JWT from tripspark-auth
-    - Validates using AUTH_JWT_SECRET
-    - Returns decoded user info
-    """
-    return {
-        "message": "Secure Catalog endpoint OK",
-        "user": user,
-    }
-
-
-# -----------------------------------------------------------------------------
-# Create Catalog
-# -----------------------------------------------------------------------------
-@app.post("/catalogs", response_model=CatalogRead, status_code=201)
-def create_catalog(catalog: CatalogCreate):
-    cnx = cursor = None
-    try:
-        cnx = get_connection()
-        cursor = cnx.cursor(dictionary=True)
-
-        insert_query = """
-        INSERT INTO catalog 
-        (
-            poi, city, country, currency, latitude, longitude, rating,
-            description, spending, budget, vibes, activities, food,
-            best_season, trip_days, nearest_airport, transport,
-            accessibility, direction
-        )
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        """
-
-        values = (
-            catalog.poi.lower().strip(),
-            catalog.city.lower().strip(),
-            catalog.country.lower().strip(),
-            catalog.currency.lower().strip(),
-            catalog.latitude,
-            catalog.longitude,
-            catalog.rating,
-            catalog.description.lower().strip(),
-            catalog.spending.lower().strip(),
-            catalog.budget,
-            catalog.vibes.lower().strip(),
-            catalog.activities.lower().strip(),
-            catalog.food.lower().strip(),
-            catalog.best_season.lower().strip(),
-            catalog.trip_days,
-            catalog.nearest_airport.lower().strip(),
-            catalog.transport.lower().strip(),
-            catalog.accessibility.lower().strip(),
-            catalog.direction,
-        )
-
-        cursor.execute(insert_query, values)
-        cnx.commit()
-
-        cursor.execute(
-            "SELECT * FROM catalog WHERE poi = %s",
-            (catalog.poi.lower().strip(),),
-        )
-        row = cursor.fetchone()
-        row = normalize_catalog_row(row)
-        return CatalogRead(**row)
-
-    except mysql.connector.Error as err:
-        if err.errno == 1062:
-            raise HTTPException(
-                status_code=400,
-                detail=f"The location {catalog.poi} already exists",
-            )
-        raise HTTPException(status_code=500, detail=f"MySQL error: {err}")
-
-    finally:
-        if cursor:
-            cursor.close()
-        if cnx and cnx.is_connected():
-            cnx.close()
-
-
-# -----------------------------------------------------------------------------
-# List / Filter Catalogs
-# -----------------------------------------------------------------------------
-@app.get("/catalogs", response_model=List[CatalogRead])
-def list_catalogs(
-    city: Optional[str] = Query(None),
-    country: Optional[str] = Query(None),
-    rating_avg: Optional[float] = Query(None),
-    vibes: Optional[str] = Query(None),
-    budget: Optional[float] = Query(None),
-    poi: Optional[str] = Query(None),
-    activities: Optional[str] = Query(None),
-    food: Optional[str] = Query(None),
-    best_season: Optional[str] = Query(None),
-    transport: Optional[str] = Query(None),
-    accessibility: Optional[str] = Query(None),
-):
-    cnx = cursor = None
-    try:
-        cnx = get_connection()
-        cursor = cnx.cursor(dictionary=True)
-
-        query = "SELECT * FROM catalog WHERE 1=1"
-        params: Dict[str, object] = {}
-
-        if city:
-            query += " AND city = %(city)s"
-            params["city"] = city.lower().strip()
-        if country:
-            query += " AND country = %(country)s"
-            params["country"] = country.lower().strip()
-        if best_season:
-            query += " AND best_season = %(best_season)s"
-            params["best_season"] = best_season.lower().strip()
-        if transport:
-            query += " AND transport = %(transport)s"
-            params["transport"] = transport.lower().strip()
-        if rating_avg is not None:
-            query += " AND rating >= %(rating_avg)s"
-            params["rating_avg"] = rating_avg
-        if activities:
-            query += " AND activities LIKE %(activities)s"
-            params["activities"] = f"%{activities.lower().strip()}%"
-        if accessibility:
-            query += " AND accessibility LIKE %(accessibility)s"
-            params["accessibility"] = f"%{accessibility.lower().strip()}%"
-
-        if vibes:
-            vibes_list = [v.strip().lower() for v in vibes.split(",") if v.strip()]
-            if vibes_list:
-                vibes_conditions = " OR ".join(
-                    [f"vibes LIKE %({i})s" for i in range(len(vibes_list))]
-                )
-                query += f" AND ({vibes_conditions})"
-                for i, v in enumerate(vibes_list):
-                    params[str(i)] = f"%{v}%"
-
-        if food:
-            food_list = [f.strip().lower() for f in food.split(",") if f.strip()]
-            if food_list:
-                food_conditions = " OR ".join(
-                    [f"food LIKE %({100 + i})s" for i in range(len(food_list))]
-                )
-                query += f" AND ({food_conditions})"
-                for i, f_val in enumerate(food_list):
-                    params[str(100 + i)] = f"%{f_val}%"
-
-        if budget is not None:
-            query += " AND budget <= %(budget)s"
-            params["budget"] = budget
-
-        if poi:
-            query += " AND poi LIKE %(poi)s"
-            params["poi"] = f"%{poi.lower().strip()}%"
-
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        if not rows:
-            raise HTTPException(status_code=404, detail="No matching catalogs found")
-
-        return [CatalogRead(**normalize_catalog_row(row)) for row in rows]
-
-    finally:
-        if cursor:
-            cursor.close()
-        if cnx and cnx.is_connected():
-            cnx.close()
-
-
-# -----------------------------------------------------------------------------
-# Get Single Catalog
-# -----------------------------------------------------------------------------
-@app.get("/catalogs/{poi}", response_model=CatalogRead)
-def get_catalog(poi: str):
-    cnx = cursor = None
-    try:
-        cnx = get_connection()
-        cursor = cnx.cursor(dictionary=True)
-
-        cursor.execute("SELECT * FROM catalog WHERE poi = %s", (poi.lower().strip(),))
-        row = cursor.fetchone()
-        if not row:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Catalog with location {poi} not found",
-            )
-
-        return CatalogRead(**normalize_catalog_row(row))
-
-    finally:
-        if cursor:
-            cursor.close()
-        if cnx and cnx.is_connected():
-            cnx.close()
-
-
-# -----------------------------------------------------------------------------
-# Update Catalog
-# -----------------------------------------------------------------------------
-@app.patch("/catalogs/{poi}", response_model=CatalogRead)
-def update_catalog(poi: str, update: CatalogUpdate):
-    cnx = cursor = None
-    try:
-        cnx = get_connection()
-        cursor = cnx.cursor(dictionary=True)
-
-        updates = update.model_dump(exclude_unset=True)
-        if not updates:
-            raise HTTPException(status_code=400, detail="No fields provided for update")
-
-        # normalize string values
-        for key, value in updates.items():
-            if isinstance(value, str):
-                updates[key] = value.lower().strip()
-
-        set_clause = ", ".join([f"{key} = %s" for key in updates.keys()])
-        values = list(updates.values()) + [poi.lower().strip()]
-
-        query = f"UPDATE catalog SET {set_clause} WHERE poi = %s"
-        cursor.execute(query, values)
-        cnx.commit()
-        if cursor.rowcount == 0:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Catalog with location {poi} not found",
-            )
-
-        cursor.execute("SELECT * FROM catalog WHERE poi = %s", (poi.lower().strip(),))
-        row = cursor.fetchone()
-        return CatalogRead(**normalize_catalog_row(row))
-
-    finally:
-        if cursor:
-            cursor.close()
-        if cnx and cnx.is_connected():
-            cnx.close()
-# at the top of main3.py, add these imports:
-import json
-from fastapi import FastAPI, HTTPException, Depends, Header, Query, Path  # you already import some; just ensure HTTPException, Query, Path are there
-from google.cloud import pubsub_v1
-
-# ...
-
-# -------------------------------------------------------------------------
-# Pub/Sub config (put this near DB_CONFIG or under it)
-# -------------------------------------------------------------------------
-PROJECT_ID = os.environ.get("GCP_PROJECT_ID", "long-way-475401-b6")
-TOPIC_ID = os.environ.get("TRIPSPARK_EVENTS_TOPIC", "tripspark-events")
-
-publisher = pubsub_v1.PublisherClient()
-topic_path = publisher.topic_path(PROJECT_ID, TOPIC_ID)
-
-# -------------------------------------------------------------------------
-# Event test endpoint for Req 4
-# -------------------------------------------------------------------------
-@app.post("/event-test")
-def event_test(message: str = Query("Hello from Catalog VM!")):
-    """
-    Simple endpoint to demonstrate:
-    - Catalog microservice publishes an event to Pub/Sub topic `tripspark-events`
-    - tripspark-event-handler Cloud Run is triggered by that topic.
-    """
-
-    payload = {
-        "source": "catalog-microservice",
-        "event_type": "CATALOG_TEST",
-        "message": message,
-    }
-
-    data = json.dumps(payload).encode("utf-8")
-
-    try:
-        future = publisher.publish(
-            topic_path,
-            data,
-            content_type="application/json",
-        )
-        message_id = future.result(timeout=10)
-    except Exception as e:
-        # Make failures VERY obvious
-        print(f"[CATALOG EVENT-TEST] ERROR publishing to Pub/Sub: {e}")
-        raise HTTPException(status_code=500, detail="Failed to publish event to Pub/Sub")
-
-    print(f"[CATALOG EVENT-TEST] Published message_id={message_id}, payload={payload}")
-
-    return {
-        "status": "event published",
-        "topic": topic_path,
-        "message_id": message_id,
-        "payload": payload,
-    }
-
-# -----------------------------------------------------------------------------
-# Delete Catalog
-# -----------------------------------------------------------------------------
-@app.delete("/catalogs/{poi}", status_code=204)
-def delete_catalog(poi: str):
-    cnx = cursor = None
-    try:
-        cnx = get_connection()
-        cursor = cnx.cursor()
-        cursor.execute("DELETE FROM catalog WHERE poi = %s", (poi.lower().strip(),))
-        cnx.commit()
-        if cursor.rowcount == 0:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Catalog with location {poi} not found",
-            )
-    finally:
-        if cursor:
-            cursor.close()
-        if cnx and cnx.is_connected():
-            cnx.close()
-
-
-# -----------------------------------------------------------------------------
-# Root
-# -----------------------------------------------------------------------------
-@app.get("/")
-def root():
-    return {"message": "Welcome to the TripSpark - Catalog API. See /docs for OpenAPI UI."}
-
 
 # -----------------------------------------------------------------------------
 # Run
@@ -0,0 +1,29 @@
+-- Baseline catalog table. Strings are stored lower-cased and trimmed (see
+-- catalog_insert_values in services/catalog_sql.py); poi is the natural key
+-- and the handlers map a duplicate (errno 1062) to 400.
+-- IF NOT EXISTS so databases created before the migrations directory keep
+-- their table; see README "Schema migrations" for baselining them.
+CREATE TABLE IF NOT EXISTS catalog (
+    poi             VARCHAR(255)  NOT NULL,
+    city            VARCHAR(128)  NOT NULL,
+    country         VARCHAR(128)  NOT NULL,
+    currency        VARCHAR(16)   NOT NULL,
+    latitude        DECIMAL(9, 6) NOT NULL,
+    longitude       DECIMAL(9, 6) NOT NULL,
+    rating          DECIMAL(3, 2) NOT NULL,
+    description     TEXT          NOT NULL,
+    spending        VARCHAR(16)   NOT NULL,
+    budget          INT           NOT NULL,
+    vibes           VARCHAR(512)  NOT NULL,
+    activities      VARCHAR(512)  NOT NULL,
+    food            VARCHAR(512)  NOT NULL,
+    best_season     VARCHAR(16)   NOT NULL,
+    trip_days       INT           NOT NULL,
+    nearest_airport VARCHAR(64)   NOT NULL,
+    transport       VARCHAR(32)   NOT NULL,
+    accessibility   VARCHAR(512)  NOT NULL,
+    direction       VARCHAR(1024) NOT NULL,
+    created_at      DATETIME      NOT NULL,
+    updated_at      DATETIME      NOT NULL,
+    PRIMARY KEY (poi)
+);
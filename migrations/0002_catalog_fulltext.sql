@@ -0,0 +1,3 @@
+-- Full-text index behind GET /catalogs?q=...
+-- Column list must match FULLTEXT_COLUMNS in services/catalog_sql.py.
+ALTER TABLE catalog ADD FULLTEXT INDEX ft_catalog_search (poi, city, description, activities);
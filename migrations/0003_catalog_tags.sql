@@ -0,0 +1,10 @@
+-- Normalized tag index for the comma-separated vibes / activities / food columns.
+-- The catalog columns stay the source of truth for the API; this table only
+-- backs the indexed any-of / all-of filters on GET /catalogs.
+CREATE TABLE IF NOT EXISTS catalog_tag (
+    poi  VARCHAR(255) NOT NULL,
+    kind VARCHAR(16)  NOT NULL,
+    tag  VARCHAR(128) NOT NULL,
+    PRIMARY KEY (kind, tag, poi),
+    KEY idx_catalog_tag_poi (poi, kind)
+);
@@ -0,0 +1,17 @@
+-- Transactional outbox for catalog change events. Write handlers insert the
+-- event in the same transaction as the catalog change; services/outbox.py
+-- relays unpublished rows to Pub/Sub in id order and stamps published_at.
+CREATE TABLE IF NOT EXISTS catalog_outbox (
+    id           BIGINT       NOT NULL AUTO_INCREMENT,
+    event_id     CHAR(32)     NOT NULL,
+    poi          VARCHAR(255) NOT NULL,
+    event_type   VARCHAR(32)  NOT NULL,
+    payload      MEDIUMTEXT   NOT NULL,
+    created_at   DATETIME(3)  NOT NULL,
+    published_at DATETIME(3)  NULL,
+    attempts     INT          NOT NULL DEFAULT 0,
+    last_error   VARCHAR(512) NULL,
+    PRIMARY KEY (id),
+    UNIQUE KEY uq_catalog_outbox_event (event_id),
+    KEY idx_catalog_outbox_unpublished (published_at, id)
+);
@@ -0,0 +1,22 @@
+-- Secondary indexes for the GET /catalogs filters (services/catalog_sql.py).
+--
+--   city / country equality    idx_catalog_country_city_rating, idx_catalog_city_rating
+--   best_season (+ budget <=)  idx_catalog_season_budget
+--   transport                  idx_catalog_transport_rating
+--   rating >=, and unfiltered  idx_catalog_rating
+--   pages in (rating DESC, poi ASC) keyset order
+--   budget <=                  idx_catalog_budget
+--
+-- Equality columns lead; rating DESC, poi trails wherever the filter is
+-- usually paged, so a page of 100 reads 100 index entries in order instead
+-- of sorting every match. Descending key parts need MySQL 8.0.
+-- poi LIKE '%...%' and accessibility LIKE '%...%' cannot use a B-tree index;
+-- q= uses ft_catalog_search and the tag filters use catalog_tag.
+-- `python -m services.index_check` EXPLAINs every supported combination.
+ALTER TABLE catalog
+    ADD INDEX idx_catalog_rating (rating DESC, poi),
+    ADD INDEX idx_catalog_country_city_rating (country, city, rating DESC, poi),
+    ADD INDEX idx_catalog_city_rating (city, rating DESC, poi),
+    ADD INDEX idx_catalog_season_budget (best_season, budget),
+    ADD INDEX idx_catalog_transport_rating (transport, rating DESC, poi),
+    ADD INDEX idx_catalog_budget (budget);
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Any, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+BulkStatus = Literal["created", "updated", "conflict", "invalid"]
+
+
+class BulkItemResult(BaseModel):
+    index: int = Field(description="Position of the item in the request body")
+    poi: Optional[str] = Field(default=None, description="Normalized poi, if the item had one")
+    status: BulkStatus = Field(description="Outcome for this item")
+    detail: Optional[Any] = Field(default=None, description="Validation errors or conflict reason")
+
+
+class BulkResult(BaseModel):
+    created: int = Field(0, description="Rows inserted")
+    updated: int = Field(0, description="Existing rows overwritten (mode=upsert)")
+    conflicts: int = Field(0, description="Items skipped because the poi already exists")
+    invalid: int = Field(0, description="Items that failed CatalogCreate validation")
+    items: List[BulkItemResult] = Field(default_factory=list)
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "created": 1,
+                "updated": 0,
+                "conflicts": 1,
+                "invalid": 1,
+                "items": [
+                    {"index": 0, "poi": "central park", "status": "created", "detail": None},
+                    {"index": 1, "poi": "times square", "status": "conflict", "detail": "The location times square already exists"},
+                    {"index": 2, "poi": None, "status": "invalid", "detail": [{"loc": ["rating"], "msg": "Field required"}]},
+                ],
+            }
+        }
+    }
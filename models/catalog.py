@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from typing import Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
-from typing import Literal, List
+from functools import lru_cache
+from pydantic import BaseModel, Field, create_model
+from typing import Literal, List, Tuple, Type
 
 '''class CatalogBase(BaseModel):
     id: int = Field(
@@ -716,3 +717,12 @@ class CatalogRead(CatalogBase):
             ]
         }
     }
+
+
+@lru_cache(maxsize=128)
+def catalog_projection_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """CatalogRead narrowed to the given fields (used by GET /catalogs?fields=...)."""
+    return create_model(
+        "CatalogReadProjection",
+        **{name: (CatalogRead.model_fields[name].annotation, CatalogRead.model_fields[name]) for name in fields},
+    )
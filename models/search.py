@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+from models.catalog import CatalogRead
+
+
+class CatalogSearchResult(BaseModel):
+    total: int = Field(description="Number of catalogs matching the filters")
+    items: List[CatalogRead] = Field(default_factory=list, description="Requested page, rating DESC then poi")
+    facets: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict,
+        description="Per facet field, value -> count (each field ignores its own filter)",
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "total": 1,
+                "items": [],
+                "facets": {
+                    "city": {"new york city": 1, "paris": 3},
+                    "vibes": {"nature": 1, "relaxing": 1},
+                },
+            }
+        }
+    }
+
+
+class CatalogNearby(CatalogRead):
+    distance_km: float = Field(description="Great-circle (haversine) distance from the query point")
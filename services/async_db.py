@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from services.db_pool import PoolTimeout
+from services.metrics import DB_ACQUIRE_SECONDS, METRICS_ENABLED, AsyncTimedCursor
+
+_ACQUIRE_SECONDS = DB_ACQUIRE_SECONDS.labels("async")
+
+
+# -----------------------------------------------------------------------------
+# Async MySQL pool (aiomysql)
+# -----------------------------------------------------------------------------
+class AsyncConnectionPool:
+    """
+    Async counterpart of services.db_pool.ConnectionPool, backed by aiomysql.
+
+    Takes the same DB_CONFIG dict and pool settings as the sync pool so the
+    two modes are configured identically. aiomysql is imported lazily in
+    open(), so it is only required when the service runs with
+    CATALOG_DB_MODE=async.
+    """
+
+    def __init__(
+        self,
+        db_config: Dict[str, Any],
+        min_size: int = 2,
+        max_size: int = 10,
+        max_lifetime: float = 1800.0,
+        wait_timeout: float = 5.0,
+        health_check_after: float = 30.0,
+    ):
+        self.db_config = db_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.wait_timeout = wait_timeout
+        # aiomysql already drops connections whose socket hit EOF on borrow;
+        # kept for signature parity with the sync pool.
+        self.health_check_after = health_check_after
+
+        self._pool = None
+        self._acquires = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def open(self) -> None:
+        import aiomysql
+        from pymysql.constants import CLIENT
+
+        cfg = dict(self.db_config)
+        if "database" in cfg:
+            cfg["db"] = cfg.pop("database")
+        cfg.setdefault("autocommit", False)
+        # mysql.connector options PyMySQL spells differently.
+        if "time_zone" in cfg:
+            cfg.setdefault("init_command", f"SET time_zone = '{cfg.pop('time_zone')}'")
+        # PATCH sends UPDATE + SELECT in one round trip (catalog_sql.with_read_back).
+        cfg["client_flag"] = cfg.get("client_flag", 0) | CLIENT.MULTI_STATEMENTS
+
+        self._pool = await aiomysql.create_pool(
+            minsize=self.min_size,
+            maxsize=self.max_size,
+            pool_recycle=int(self.max_lifetime) if self.max_lifetime > 0 else -1,
+            cursorclass=aiomysql.DictCursor,
+            **cfg,
+        )
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        if self._pool is None:
+            raise RuntimeError("AsyncConnectionPool.open() has not been awaited")
+
+        started = time.monotonic()
+        try:
+            cnx = await asyncio.wait_for(self._pool.acquire(), self.wait_timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise PoolTimeout(
+                f"No DB connection available after {self.wait_timeout:.1f}s "
+                f"(max_size={self.max_size})"
+            )
+
+        waited = time.monotonic() - started
+        self._acquires += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        _ACQUIRE_SECONDS.observe(waited)
+
+        try:
+            yield _TimedConnection(cnx) if METRICS_ENABLED else cnx
+        finally:
+            if not cnx.closed and cnx.get_transaction_status():
+                await cnx.rollback()
+            self._pool.release(cnx)
+
+    def stats(self) -> Dict[str, Any]:
+        size = self._pool.size if self._pool is not None else 0
+        idle = self._pool.freesize if self._pool is not None else 0
+        return {
+            "mode": "async",
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "acquires": self._acquires,
+            "timeouts": self._timeouts,
+            "wait_time_total_ms": round(self._wait_total * 1000, 3),
+            "wait_time_avg_ms": round(self._wait_total * 1000 / self._acquires, 3)
+            if self._acquires
+            else 0.0,
+            "wait_time_max_ms": round(self._wait_max * 1000, 3),
+        }
+
+
+class _TimedConnection:
+    """aiomysql connection whose cursors time their statements for /metrics."""
+
+    def __init__(self, raw: Any):
+        self._raw = raw
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+    def cursor(self, *args: Any) -> "_TimedCursorContext":
+        return _TimedCursorContext(self._raw.cursor(*args))
+
+
+class _TimedCursorContext:
+    """Like aiomysql's cursor() result: usable with await or async with."""
+
+    def __init__(self, inner: Any):
+        self._inner = inner
+        self._cursor: Optional[AsyncTimedCursor] = None
+
+    def __await__(self):
+        return self._open().__await__()
+
+    async def _open(self) -> AsyncTimedCursor:
+        return AsyncTimedCursor(await self._inner)
+
+    async def __aenter__(self) -> AsyncTimedCursor:
+        self._cursor = AsyncTimedCursor(await self._inner.__aenter__())
+        return self._cursor
+
+    async def __aexit__(self, *exc: Any) -> Any:
+        self._cursor._timer.finish()
+        return await self._inner.__aexit__(*exc)
+
+
+def is_duplicate_key(err: Exception) -> bool:
+    """True for MySQL errno 1062 raised through aiomysql/PyMySQL."""
+    args: Optional[tuple] = getattr(err, "args", None)
+    return bool(args) and args[0] == 1062
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from services.cache import TTLCache
+
+# -----------------------------------------------------------------------------
+# Verified-JWT cache
+#
+# Clients reuse one bearer token for many requests, so each token only needs
+# its HS256 signature checked once. Entries are keyed on the token's SHA-256
+# (the raw token is never kept in memory as a key) and expire at the token's
+# exp claim, or sooner at the cache TTL. Failed verifications are not cached.
+# PyJWT is imported once, on the first cache miss, which keeps it (and its
+# crypto backend) out of app startup; its errors are re-raised as
+# TokenExpired / InvalidToken so callers never need to import jwt.
+# -----------------------------------------------------------------------------
+class InvalidToken(Exception):
+    """Bad signature, malformed token or failed claim check."""
+
+
+class TokenExpired(InvalidToken):
+    """The token's exp claim is in the past."""
+
+
+_jwt: Optional[Any] = None
+
+
+def _jwt_module() -> Any:
+    global _jwt
+    if _jwt is None:
+        import jwt
+
+        _jwt = jwt
+    return _jwt
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class CachedJWTVerifier:
+    """jwt.decode() with a bounded cache of already-verified tokens."""
+
+    def __init__(self, secret: str, cache: TTLCache, algorithms: Sequence[str] = ("HS256",)):
+        self.secret = secret
+        self.cache = cache
+        self.algorithms = list(algorithms)
+        self.verifications = 0
+        self.failures = 0
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Return the token's claims. Raises TokenExpired for an expired token
+        and InvalidToken for any other verification failure.
+        """
+        key = token_digest(token)
+        payload = self.cache.get(key)
+        if payload is not None:
+            exp = payload.get("exp")
+            if exp is None or exp > time.time():
+                return dict(payload)
+            self.cache.invalidate(key)  # expired between TTL granularity and now
+
+        jwt = _jwt_module()
+        self.verifications += 1
+        try:
+            payload = jwt.decode(token, self.secret, algorithms=self.algorithms)
+        except jwt.ExpiredSignatureError as err:
+            self.failures += 1
+            raise TokenExpired(str(err)) from err
+        except jwt.PyJWTError as err:
+            self.failures += 1
+            raise InvalidToken(str(err)) from err
+
+        exp = payload.get("exp")
+        ttl = None if exp is None else float(exp) - time.time()
+        self.cache.set(key, payload, ttl=ttl)
+        return dict(payload)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.cache.stats(),
+            "verifications": self.verifications,
+            "failures": self.failures,
+        }
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Iterator, List, Sequence, Set, Tuple
+
+from pydantic import ValidationError
+
+from models.bulk import BulkItemResult, BulkResult
+from models.catalog import CatalogCreate
+from services.catalog_sql import INSERT_COLUMNS, catalog_insert_values, catalog_row_from_values
+from services.events import CATALOG_CREATED, CATALOG_UPDATED, catalog_event
+
+# -----------------------------------------------------------------------------
+# POST /catalogs/bulk helpers (shared by the sync and async handlers)
+# -----------------------------------------------------------------------------
+BULK_CHUNK_SIZE = int(os.environ.get("CATALOG_BULK_CHUNK_SIZE", 500))
+BULK_MAX_CHUNK_SIZE = 5000
+BULK_MAX_ITEMS = int(os.environ.get("CATALOG_BULK_MAX_ITEMS", 10000))
+
+# (index in request, normalized poi, INSERT values)
+BulkRow = Tuple[int, str, tuple]
+
+
+def parse_bulk_body(body: bytes, content_type: str) -> List[Any]:
+    """Accept a JSON array, or NDJSON (one object per line) for x-ndjson bodies."""
+    try:
+        text = body.decode("utf-8")
+        if "ndjson" in content_type or "jsonl" in content_type:
+            return [json.loads(line) for line in text.splitlines() if line.strip()]
+        items = json.loads(text)
+    except (UnicodeDecodeError, ValueError) as err:
+        raise ValueError(f"Malformed request body: {err}")
+
+    if not isinstance(items, list):
+        raise ValueError("Request body must be a JSON array of catalogs")
+    return items
+
+
+def validate_bulk_items(items: Sequence[Any]) -> Tuple[List[BulkRow], Dict[int, BulkItemResult]]:
+    """
+    Validate every item against CatalogCreate up front. Invalid items and
+    repeated pois within the same request get their result immediately; the
+    rest are returned as rows ready for the multi-row INSERT.
+    """
+    rows: List[BulkRow] = []
+    results: Dict[int, BulkItemResult] = {}
+    seen: Set[str] = set()
+
+    for index, item in enumerate(items):
+        try:
+            catalog = CatalogCreate.model_validate(item)
+        except ValidationError as err:
+            results[index] = BulkItemResult(
+                index=index,
+                status="invalid",
+                detail=err.errors(include_url=False, include_context=False),
+            )
+            continue
+
+        values = catalog_insert_values(catalog, None)
+        poi = values[0]
+        if poi in seen:
+            results[index] = BulkItemResult(
+                index=index, poi=poi, status="conflict", detail="Duplicate poi within this request"
+            )
+            continue
+        seen.add(poi)
+        rows.append((index, poi, values))
+
+    return rows, results
+
+
+def chunked(rows: List[BulkRow], size: int) -> Iterator[List[BulkRow]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def select_existing_sql(n: int) -> str:
+    """Lock the chunk's keys (gap locks included) so the statuses we report hold at commit."""
+    return f"SELECT poi FROM catalog WHERE poi IN ({','.join(['%s'] * n)}) FOR UPDATE"
+
+
+def bulk_insert_sql(n: int, upsert: bool) -> str:
+    placeholders = "(" + ",".join(["%s"] * len(INSERT_COLUMNS)) + ")"
+    query = (
+        f"INSERT INTO catalog ({', '.join(INSERT_COLUMNS)}) "
+        f"VALUES {','.join([placeholders] * n)}"
+    )
+    if upsert:
+        updates = ", ".join(
+            f"{col} = VALUES({col})" for col in INSERT_COLUMNS if col not in ("poi", "created_at")
+        )
+        query += f" ON DUPLICATE KEY UPDATE {updates}"
+    return query
+
+
+def resolve_chunk(
+    chunk: List[BulkRow],
+    existing: Set[str],
+    upsert: bool,
+    results: Dict[int, BulkItemResult],
+) -> List[BulkRow]:
+    """Record created/updated/conflict for a chunk and return the rows to write."""
+    to_write: List[BulkRow] = []
+    for index, poi, values in chunk:
+        if poi in existing and not upsert:
+            results[index] = BulkItemResult(
+                index=index, poi=poi, status="conflict", detail=f"The location {poi} already exists"
+            )
+            continue
+        status = "updated" if poi in existing else "created"
+        results[index] = BulkItemResult(index=index, poi=poi, status=status)
+        to_write.append((index, poi, values))
+    return to_write
+
+
+BULK_EVENT_TYPES = {"created": CATALOG_CREATED, "updated": CATALOG_UPDATED}
+
+
+def bulk_change_events(rows: List[BulkRow], results: Dict[int, BulkItemResult]) -> List[Dict[str, Any]]:
+    """catalog_event() payloads for the rows that were written (created or updated)."""
+    return [
+        catalog_event(BULK_EVENT_TYPES[results[index].status], poi, catalog_row_from_values(values))
+        for index, poi, values in rows
+        if results[index].status in BULK_EVENT_TYPES
+    ]
+
+
+def flatten_values(rows: List[BulkRow]) -> List[Any]:
+    return [v for _, _, values in rows for v in values]
+
+
+def summarize(results: Dict[int, BulkItemResult]) -> BulkResult:
+    items = [results[i] for i in sorted(results)]
+    counts = {"created": 0, "updated": 0, "conflict": 0, "invalid": 0}
+    for item in items:
+        counts[item.status] += 1
+    return BulkResult(
+        created=counts["created"],
+        updated=counts["updated"],
+        conflicts=counts["conflict"],
+        invalid=counts["invalid"],
+        items=items,
+    )
+
+
+# The handlers read the raw body (JSON array or NDJSON), so describe it for /docs by hand.
+BULK_OPENAPI_EXTRA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "array", "items": {"$ref": "#/components/schemas/CatalogCreate"}}
+            },
+            "application/x-ndjson": {
+                "schema": {"type": "string", "description": "One CatalogCreate JSON object per line"}
+            },
+        },
+    }
+}
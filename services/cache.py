@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def approx_size(value: Any) -> int:
+    """Rough in-memory footprint of a cached value (dict rows, lists of rows, scalars)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += sys.getsizeof(k) + approx_size(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            size += approx_size(v)
+    return size
+
+
+# -----------------------------------------------------------------------------
+# Bounded LRU + TTL cache
+# -----------------------------------------------------------------------------
+class TTLCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL and both an entry-count and an
+    approximate memory bound.
+
+    Read-through callers should grab epoch() before going to the DB and pass it
+    to set(): if a write invalidated anything in between, the (possibly stale)
+    value is dropped instead of being cached.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300.0, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        # key -> (value, expires_at, size)
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._epoch = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def epoch(self) -> int:
+        return self._epoch
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, size = entry
+            if expires_at <= time.monotonic():
+                self._remove(key, size)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, epoch: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        """ttl shortens this entry's lifetime below the cache-wide TTL (never extends it)."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        size = approx_size(value)
+        if size > self.max_bytes or ttl <= 0:
+            return
+        with self._lock:
+            if epoch is not None and epoch != self._epoch:
+                return
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._data[key] = (value, time.monotonic() + ttl, size)
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._epoch += 1
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._data)
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: Hashable, size: int) -> None:
+        del self._data[key]
+        self._bytes -= size
+
+
+def cache_settings_from_env(prefix: str, max_entries: int = 10000, ttl: float = 300.0, max_bytes: int = 16 * 1024 * 1024) -> Dict[str, Any]:
+    """Read cache bounds from the environment, e.g. CATALOG_CACHE_TTL=60."""
+    return {
+        "max_entries": int(os.environ.get(f"{prefix}MAX_ENTRIES", max_entries)),
+        "ttl": float(os.environ.get(f"{prefix}TTL", ttl)),
+        "max_bytes": int(os.environ.get(f"{prefix}MAX_BYTES", max_bytes)),
+    }
@@ -0,0 +1,475 @@
+from __future__ import annotations
+
+from typing import Any, Callable, List, Optional, Sequence
+from urllib.parse import quote
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from models.bulk import BulkResult
+from models.catalog import CatalogCreate, CatalogRead, CatalogUpdate, catalog_projection_model
+from models.search import CatalogNearby, CatalogSearchResult
+from services.async_db import AsyncConnectionPool, is_duplicate_key
+from services.bulk import (
+    BULK_CHUNK_SIZE,
+    BULK_MAX_CHUNK_SIZE,
+    BULK_MAX_ITEMS,
+    BULK_EVENT_TYPES,
+    BULK_OPENAPI_EXTRA,
+    bulk_change_events,
+    bulk_insert_sql,
+    chunked,
+    flatten_values,
+    parse_bulk_body,
+    resolve_chunk,
+    select_existing_sql,
+    summarize,
+    validate_bulk_items,
+)
+from services.cache import TTLCache
+from services.catalog_sql import (
+    DEFAULT_PAGE_SIZE,
+    DELETE_BY_POI_SQL,
+    INSERT_CATALOG_SQL,
+    MAX_PAGE_SIZE,
+    SELECT_BY_POI_FOR_UPDATE_SQL,
+    SELECT_BY_POI_SQL,
+    build_update_query,
+    catalog_insert_values,
+    catalog_row_from_values,
+    finish_page,
+    normalize_catalog_row,
+    normalize_poi,
+    plan_list_query,
+    prefers_minimal,
+    with_read_back,
+    with_timestamps,
+    write_timestamp,
+)
+from services.catalog_tags import TAG_INDEX_ENABLED, apply_statements_async, delete_tags_statement, tag_statements
+from services.export import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_FORMATS,
+    EXPORT_SQL,
+    export_format,
+    encode_batch,
+    export_filename,
+    export_preamble,
+)
+from services.events import CATALOG_CREATED, CATALOG_DELETED, CATALOG_UPDATED, EventEmitter, catalog_event
+from services.etags import catalog_etag, conditional_catalog, if_match_passes, none_match, not_modified, page_etag
+from services.facets import FacetIndex
+from services.fast_json import FAST_JSON_ENABLED, JSON_MEDIA_TYPE, rows_response
+from services.formats import LIST_MEDIA_TYPES, encoded_rows_response, negotiate, representation_etag
+from services.geo import GEO_MAX_RADIUS_KM, GeoIndex
+from services.outbox import OUTBOX_ENABLED, outbox_statement
+from services.row_index import LOAD_ALL_SQL, RowIndex, select_rows_sql
+
+
+# -----------------------------------------------------------------------------
+# Async /catalogs routes (CATALOG_DB_MODE=async)
+# -----------------------------------------------------------------------------
+def build_async_catalog_router(
+    pool: AsyncConnectionPool,
+    catalog_cache: TTLCache,
+    list_cache: TTLCache,
+    facet_index: FacetIndex,
+    geo_index: GeoIndex,
+    notify_catalog_change: Callable[[str], None],
+    emit_catalog_event: EventEmitter,
+    list_dependencies: Sequence[Any] = (),
+) -> APIRouter:
+    """
+    Same paths, response models and status codes as the sync handlers in
+    services/catalog_sync.py, but running on the event loop with aiomysql
+    instead of blocking a threadpool worker per request.
+
+    catalog_cache / list_cache / facet_index / geo_index are the same
+    objects the sync handlers use.
+    notify_catalog_change(poi) and emit_catalog_event(...) run after each
+    committed write: the app's change listeners and its event emitter.
+    list_dependencies guards the read-many routes (list, export, search,
+    nearby), e.g. with a JWT check.
+    """
+    router = APIRouter()
+
+    @router.post("/catalogs", response_model=CatalogRead, status_code=201)
+    async def create_catalog(catalog: CatalogCreate, prefer: Optional[str] = Header(None)):
+        values = catalog_insert_values(catalog, write_timestamp())
+        row = catalog_row_from_values(values)
+        side_sql = tag_statements(values[0], row) if TAG_INDEX_ENABLED else []
+        if OUTBOX_ENABLED:
+            side_sql.append(outbox_statement(catalog_event(CATALOG_CREATED, values[0], row)))
+
+        async with pool.connection() as cnx:
+            async with cnx.cursor() as cursor:
+                try:
+                    if side_sql:
+                        await cnx.begin()
+                    await cursor.execute(INSERT_CATALOG_SQL, values)
+                    if side_sql:
+                        await apply_statements_async(cursor, side_sql)
+                        await cnx.commit()
+                except Exception as err:
+                    if is_duplicate_key(err):
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"The location {catalog.poi} already exists",
+                        )
+                    raise HTTPException(status_code=500, detail=f"MySQL error: {err}")
+        notify_catalog_change(values[0])
+        emit_catalog_event(CATALOG_CREATED, values[0], row)
+
+        if prefers_minimal(prefer):
+            return Response(
+                status_code=201,
+                headers={"Location": f"/catalogs/{quote(values[0])}", "Preference-Applied": "return=minimal"},
+            )
+        return CatalogRead(**row)
+
+    @router.post("/catalogs/bulk", response_model=BulkResult, openapi_extra=BULK_OPENAPI_EXTRA)
+    async def bulk_create_catalogs(
+        request: Request,
+        mode: str = Query("upsert", pattern="^(insert|upsert)$"),
+        chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=BULK_MAX_CHUNK_SIZE),
+    ):
+        try:
+            items = parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+        except ValueError as err:
+            raise HTTPException(status_code=400, detail=str(err))
+        if len(items) > BULK_MAX_ITEMS:
+            raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ITEMS} items per request")
+
+        rows, results = validate_bulk_items(items)
+        if not rows:
+            return summarize(results)
+
+        now = write_timestamp()
+        rows = [(index, poi, with_timestamps(values, now)) for index, poi, values in rows]
+
+        upsert = mode == "upsert"
+        written: List[str] = []
+        async with pool.connection() as cnx:
+            async with cnx.cursor() as cursor:
+                await cnx.begin()
+                try:
+                    for chunk in chunked(rows, chunk_size):
+                        await cursor.execute(select_existing_sql(len(chunk)), [poi for _, poi, _ in chunk])
+                        existing = {row["poi"] for row in await cursor.fetchall()}
+                        to_write = resolve_chunk(chunk, existing, upsert, results)
+                        if to_write:
+                            await cursor.execute(bulk_insert_sql(len(to_write), upsert), flatten_values(to_write))
+                            written.extend(poi for _, poi, _ in to_write)
+                            if TAG_INDEX_ENABLED:
+                                for _, poi, row_values in to_write:
+                                    await apply_statements_async(
+                                        cursor, tag_statements(poi, catalog_row_from_values(row_values))
+                                    )
+                            if OUTBOX_ENABLED:
+                                await apply_statements_async(
+                                    cursor, [outbox_statement(*bulk_change_events(to_write, results))]
+                                )
+                    await cnx.commit()
+                except Exception as err:
+                    await cnx.rollback()
+                    raise HTTPException(status_code=500, detail=f"MySQL error: {err}")
+
+        for poi in written:
+            notify_catalog_change(poi)
+        for index, poi, values in rows:
+            if results[index].status in ("created", "updated"):
+                emit_catalog_event(BULK_EVENT_TYPES[results[index].status], poi, catalog_row_from_values(values))
+        return summarize(results)
+
+    @router.get(
+        "/catalogs",
+        response_model=List[CatalogRead],
+        dependencies=list(list_dependencies),
+    )
+    async def list_catalogs(
+        response: Response,
+        city: Optional[str] = Query(None),
+        country: Optional[str] = Query(None),
+        rating_avg: Optional[float] = Query(None),
+        vibes: Optional[str] = Query(None),
+        budget: Optional[float] = Query(None),
+        poi: Optional[str] = Query(None),
+        activities: Optional[str] = Query(None),
+        food: Optional[str] = Query(None),
+        best_season: Optional[str] = Query(None),
+        transport: Optional[str] = Query(None),
+        accessibility: Optional[str] = Query(None),
+        tags_match: str = Query("any", pattern="^(any|all)$", description="Match any or all listed vibes/activities/food tags"),
+        q: Optional[str] = Query(None, description="Full-text search over poi, city, description, activities; ranked by relevance"),
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables keyset paging"),
+        page_cursor: Optional[str] = Query(None, alias="cursor", description="X-Next-Cursor from the previous page"),
+        fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. poi,city,rating"),
+        if_none_match: Optional[str] = Header(None),
+        accept: Optional[str] = Header(None),
+    ):
+        filters = dict(
+            city=city,
+            country=country,
+            rating_avg=rating_avg,
+            vibes=vibes,
+            budget=budget,
+            poi=poi,
+            activities=activities,
+            food=food,
+            best_season=best_season,
+            transport=transport,
+            accessibility=accessibility,
+            tags_match=tags_match,
+            q=q,
+        )
+        try:
+            plan = plan_list_query(filters, limit=limit, cursor=page_cursor, fields=fields)
+        except ValueError as err:
+            raise HTTPException(status_code=400, detail=str(err))
+
+        page = list_cache.get(plan.cache_key)
+
+        if page is None:
+            epoch = list_cache.epoch()
+            async with pool.connection() as cnx:
+                async with cnx.cursor() as cursor:
+                    await cursor.execute(plan.query, plan.params)
+                    rows = [normalize_catalog_row(row) for row in await cursor.fetchall()]
+            rows, next_cursor = finish_page(rows, plan)
+            page = (rows, next_cursor, page_etag(rows, next_cursor, plan.fields))
+            list_cache.set(plan.cache_key, page, epoch=epoch)
+
+        rows, next_cursor, etag = page
+        if not rows:
+            raise HTTPException(status_code=404, detail="No matching catalogs found")
+
+        media_type = negotiate(accept, LIST_MEDIA_TYPES)
+        etag = representation_etag(etag, media_type)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        headers.update({"ETag": etag, "Vary": "Accept"})
+        if none_match(if_none_match, etag):
+            return not_modified(etag, headers)
+        if media_type != JSON_MEDIA_TYPE:
+            return encoded_rows_response(rows, plan.fields, media_type, headers)
+        if FAST_JSON_ENABLED:
+            return rows_response(rows, plan.fields, headers)
+        if plan.fields:
+            projection = catalog_projection_model(plan.fields)
+            return JSONResponse(
+                content=[projection(**row).model_dump(mode="json") for row in rows],
+                headers=headers,
+            )
+
+        response.headers.update(headers)
+        return [CatalogRead(**row) for row in rows]
+
+    async def iter_catalog_export(fmt: str):
+        import aiomysql
+
+        async with pool.connection() as cnx:
+            cursor = await cnx.cursor(aiomysql.SSDictCursor)
+            finished = False
+            try:
+                await cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+                await cursor.execute(EXPORT_SQL)
+
+                yield export_preamble(fmt)
+                while True:
+                    rows = await cursor.fetchmany(EXPORT_BATCH_SIZE)
+                    if not rows:
+                        break
+                    yield encode_batch(fmt, [normalize_catalog_row(row) for row in rows])
+                finished = True
+
+            finally:
+                if finished:
+                    await cursor.close()
+                    await cnx.rollback()
+                else:
+                    # Client went away mid-stream: drop the connection rather than drain it.
+                    cnx.close()
+
+    @router.get("/catalogs/export", dependencies=list(list_dependencies))
+    async def export_catalogs(
+        fmt: Optional[str] = Query(None, alias="format", pattern="^(ndjson|csv|columnar|msgpack)$", description="Defaults to what Accept asks for, else ndjson"),
+        accept: Optional[str] = Header(None),
+    ):
+        fmt = export_format(fmt, accept)
+        if fmt not in EXPORT_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Export format {fmt!r} is not available on this server")
+        return StreamingResponse(
+            iter_catalog_export(fmt),
+            media_type=EXPORT_FORMATS[fmt],
+            headers={"Content-Disposition": f'attachment; filename="{export_filename(fmt)}"'},
+        )
+
+    async def sync_index(index: RowIndex) -> None:
+        full, pois = index.take_pending()
+        if not full and not pois:
+            return
+        async with pool.connection() as cnx:
+            async with cnx.cursor() as cursor:
+                if full:
+                    await cursor.execute(LOAD_ALL_SQL)
+                    index.load(await cursor.fetchall())
+                else:
+                    await cursor.execute(select_rows_sql(len(pois)), pois)
+                    index.apply(pois, await cursor.fetchall())
+
+    @router.get(
+        "/catalogs/search",
+        response_model=CatalogSearchResult,
+        dependencies=list(list_dependencies),
+    )
+    async def search_catalogs(
+        city: Optional[str] = Query(None, description="Comma-separated; matches any"),
+        country: Optional[str] = Query(None, description="Comma-separated; matches any"),
+        spending: Optional[str] = Query(None, description="Comma-separated; matches any"),
+        best_season: Optional[str] = Query(None, description="Comma-separated; matches any"),
+        transport: Optional[str] = Query(None, description="Comma-separated; matches any"),
+        vibes: Optional[str] = Query(None),
+        activities: Optional[str] = Query(None),
+        food: Optional[str] = Query(None),
+        tags_match: str = Query("any", pattern="^(any|all)$", description="Match any or all listed vibes/activities/food tags"),
+        rating_avg: Optional[float] = Query(None),
+        budget: Optional[float] = Query(None),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=0, le=MAX_PAGE_SIZE),
+        offset: int = Query(0, ge=0),
+        facet_limit: int = Query(20, ge=1, le=500, description="Max values returned per facet"),
+    ):
+        await sync_index(facet_index)
+        return facet_index.search(
+            dict(
+                city=city,
+                country=country,
+                spending=spending,
+                best_season=best_season,
+                transport=transport,
+                vibes=vibes,
+                activities=activities,
+                food=food,
+            ),
+            tags_match=tags_match,
+            rating_min=rating_avg,
+            budget_max=budget,
+            limit=limit,
+            offset=offset,
+            facet_limit=facet_limit,
+        )
+
+    @router.get(
+        "/catalogs/nearby",
+        response_model=List[CatalogNearby],
+        dependencies=list(list_dependencies),
+    )
+    async def nearby_catalogs(
+        lat: float = Query(..., ge=-90, le=90),
+        lon: float = Query(..., ge=-180, le=180),
+        radius_km: float = Query(10.0, gt=0, le=GEO_MAX_RADIUS_KM),
+        limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        await sync_index(geo_index)
+        return geo_index.nearby(lat, lon, radius_km, limit=limit)
+
+    @router.get("/catalogs/{poi}", response_model=CatalogRead)
+    async def get_catalog(poi: str, response: Response, if_none_match: Optional[str] = Header(None)):
+        key = normalize_poi(poi)
+        row = catalog_cache.get(key)
+        if row is not None:
+            return conditional_catalog(row, response, if_none_match)
+
+        epoch = catalog_cache.epoch()
+        async with pool.connection() as cnx:
+            async with cnx.cursor() as cursor:
+                await cursor.execute(SELECT_BY_POI_SQL, (key,))
+                row = await cursor.fetchone()
+
+        if not row:
+            raise HTTPException(status_code=404, detail=f"Catalog with location {poi} not found")
+        row = normalize_catalog_row(row)
+        catalog_cache.set(key, row, epoch=epoch)
+        return conditional_catalog(row, response, if_none_match)
+
+    @router.patch("/catalogs/{poi}", response_model=CatalogRead)
+    async def update_catalog(
+        poi: str,
+        update: CatalogUpdate,
+        response: Response,
+        prefer: Optional[str] = Header(None),
+        if_match: Optional[str] = Header(None),
+    ):
+        updates = update.model_dump(exclude_unset=True)
+        if not updates:
+            raise HTTPException(status_code=400, detail="No fields provided for update")
+
+        key = normalize_poi(poi)
+        now = write_timestamp()
+        query, values, written = build_update_query(poi, updates, now)
+        changes = {column: written[column] for column in updates}
+        side_sql = tag_statements(key, changes) if TAG_INDEX_ENABLED else []
+        if OUTBOX_ENABLED:
+            side_sql.append(outbox_statement(catalog_event(CATALOG_UPDATED, key, {"changes": changes, "updated_at": now})))
+        transactional = bool(side_sql) or if_match is not None
+
+        async with pool.connection() as cnx:
+            async with cnx.cursor() as cursor:
+                if transactional:
+                    await cnx.begin()
+                if if_match is not None:
+                    await cursor.execute(SELECT_BY_POI_FOR_UPDATE_SQL, (key,))
+                    current = await cursor.fetchone()
+                    if not current:
+                        raise HTTPException(status_code=404, detail=f"Catalog with location {poi} not found")
+                    current = normalize_catalog_row(current)
+                    if not if_match_passes(if_match, catalog_etag(current)):
+                        raise HTTPException(status_code=412, detail=f"Catalog {poi} has changed since it was read")
+                    await cursor.execute(query, values)
+                    row = {**current, **written}
+                else:
+                    # UPDATE + SELECT in one round trip; see build_sync_catalog_router.
+                    await cursor.execute(*with_read_back(query, values, key))
+                    await cursor.nextset()
+                    found = await cursor.fetchall()
+                    if not found:
+                        raise HTTPException(
+                            status_code=404,
+                            detail=f"Catalog with location {poi} not found",
+                        )
+                    row = normalize_catalog_row(found[0])
+                if side_sql:
+                    await apply_statements_async(cursor, side_sql)
+                if transactional:
+                    await cnx.commit()
+        notify_catalog_change(key)
+        emit_catalog_event(CATALOG_UPDATED, key, {"changes": changes, "updated_at": now})
+
+        etag = catalog_etag(row)
+        if prefers_minimal(prefer):
+            return Response(status_code=204, headers={"ETag": etag, "Preference-Applied": "return=minimal"})
+        response.headers["ETag"] = etag
+        return CatalogRead(**row)
+
+    @router.delete("/catalogs/{poi}", status_code=204)
+    async def delete_catalog(poi: str):
+        key = normalize_poi(poi)
+        side_sql = [delete_tags_statement(key)] if TAG_INDEX_ENABLED else []
+        if OUTBOX_ENABLED:
+            side_sql.append(outbox_statement(catalog_event(CATALOG_DELETED, key)))
+
+        async with pool.connection() as cnx:
+            async with cnx.cursor() as cursor:
+                if side_sql:
+                    await cnx.begin()
+                await cursor.execute(DELETE_BY_POI_SQL, (key,))
+                if cursor.rowcount == 0:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"Catalog with location {poi} not found",
+                    )
+                if side_sql:
+                    await apply_statements_async(cursor, side_sql)
+                    await cnx.commit()
+                notify_catalog_change(key)
+                emit_catalog_event(CATALOG_DELETED, key)
+
+    return router
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from models.catalog import CatalogCreate, CatalogRead
+from services.catalog_tags import TAG_INDEX_ENABLED, split_tags, tag_filter_clause, tag_like_clause
+
+# -----------------------------------------------------------------------------
+# SQL shared by the sync (mysql.connector) and async (aiomysql) handlers.
+# Both drivers use the same %s / %(name)s paramstyle.
+# -----------------------------------------------------------------------------
+SELECT_BY_POI_SQL = "SELECT * FROM catalog WHERE poi = %s"
+SELECT_BY_POI_FOR_UPDATE_SQL = "SELECT * FROM catalog WHERE poi = %s FOR UPDATE"
+DELETE_BY_POI_SQL = "DELETE FROM catalog WHERE poi = %s"
+
+# Column order of INSERT_CATALOG_SQL / catalog_insert_values()
+INSERT_COLUMNS: Tuple[str, ...] = (
+    "poi", "city", "country", "currency", "latitude", "longitude", "rating",
+    "description", "spending", "budget", "vibes", "activities", "food",
+    "best_season", "trip_days", "nearest_airport", "transport",
+    "accessibility", "direction", "created_at", "updated_at",
+)
+
+INSERT_CATALOG_SQL = f"""
+INSERT INTO catalog ({", ".join(INSERT_COLUMNS)})
+VALUES ({",".join(["%s"] * len(INSERT_COLUMNS))})
+"""
+
+# Columns a client may ask for with GET /catalogs?fields=...
+CATALOG_COLUMNS: Tuple[str, ...] = tuple(CatalogRead.model_fields)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# GET /catalogs?q=... ranks with the FULLTEXT index from
+# migrations/0002_catalog_fulltext.sql; MATCH() must list exactly its columns.
+FULLTEXT_COLUMNS: Tuple[str, ...] = ("poi", "city", "description", "activities")
+FULLTEXT_MATCH = f"MATCH({', '.join(FULLTEXT_COLUMNS)}) AGAINST (%(q)s IN NATURAL LANGUAGE MODE)"
+
+
+def normalize_poi(poi: str) -> str:
+    return poi.lower().strip()
+
+
+def normalize_catalog_row(row: dict) -> dict:
+    """
+    Convert sets/lists in DB row to comma-separated strings for Pydantic.
+    Adjusts fields like 'vibes', 'activities', 'food' if they come back as list/set.
+    """
+    for field in ["vibes", "activities", "food"]:
+        if field in row and isinstance(row[field], (set, list)):
+            row[field] = ", ".join(sorted(row[field]))
+    return row
+
+
+def write_timestamp() -> datetime:
+    """
+    created_at/updated_at for a write: the current UTC time, naive and in
+    whole seconds, i.e. exactly what a DATETIME column stores. Connections
+    run with time_zone '+00:00' (services/db_config.py), so it agrees with
+    CURRENT_TIMESTAMP on the server without asking it.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def catalog_insert_values(catalog: CatalogCreate, now: Optional[datetime]) -> tuple:
+    """
+    Positional values for INSERT_CATALOG_SQL (strings lower-cased and trimmed).
+    created_at/updated_at are `now` (write_timestamp()), so the response can
+    be built without reading the row back. Bulk validation passes None; the
+    writer fills them in with with_timestamps().
+    """
+    return (
+        catalog.poi.lower().strip(),
+        catalog.city.lower().strip(),
+        catalog.country.lower().strip(),
+        catalog.currency.lower().strip(),
+        catalog.latitude,
+        catalog.longitude,
+        catalog.rating,
+        catalog.description.lower().strip(),
+        catalog.spending.lower().strip(),
+        catalog.budget,
+        catalog.vibes.lower().strip(),
+        catalog.activities.lower().strip(),
+        catalog.food.lower().strip(),
+        catalog.best_season.lower().strip(),
+        catalog.trip_days,
+        catalog.nearest_airport.lower().strip(),
+        catalog.transport.lower().strip(),
+        catalog.accessibility.lower().strip(),
+        catalog.direction,
+        now,
+        now,
+    )
+
+
+def with_timestamps(values: Sequence[Any], now: datetime) -> tuple:
+    """catalog_insert_values() output with created_at/updated_at replaced by `now`."""
+    return tuple(values[:-2]) + (now, now)
+
+
+def catalog_row_from_values(values: Sequence[Any]) -> Dict[str, Any]:
+    """The row INSERT_CATALOG_SQL just wrote, as SELECT * would return it."""
+    return dict(zip(INSERT_COLUMNS, values))
+
+
+def prefers_minimal(prefer: Optional[str]) -> bool:
+    """True when the client sent Prefer: return=minimal (RFC 7240)."""
+    if not prefer:
+        return False
+    return any(p.split(";")[0].strip().lower() == "return=minimal" for p in prefer.split(","))
+
+
+def build_list_query(
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    rating_avg: Optional[float] = None,
+    vibes: Optional[str] = None,
+    budget: Optional[float] = None,
+    poi: Optional[str] = None,
+    activities: Optional[str] = None,
+    food: Optional[str] = None,
+    best_season: Optional[str] = None,
+    transport: Optional[str] = None,
+    accessibility: Optional[str] = None,
+    tags_match: Optional[str] = None,
+    q: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    use_tag_index: Optional[bool] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the filtered SELECT used by GET /catalogs (all columns unless given).
+
+    vibes/activities/food are comma-separated tag lists matched as whole
+    tags, any-of by default or all-of with tags_match="all": against
+    catalog_tag with the tag index enabled (CATALOG_TAG_INDEX=1), otherwise
+    with a scan over the string columns (catalog_tags.tag_like_clause).
+    accessibility is free text ("Wheelchair friendly paths available"), not
+    a tag list, so it stays a substring match.
+
+    q is a full-text search over FULLTEXT_COLUMNS; the score is selected as
+    `relevance` so callers can rank by it.
+    """
+    select_list = ", ".join(columns) if columns else "*"
+    params: Dict[str, Any] = {}
+    if q and q.strip():
+        params["q"] = q.strip()
+        query = f"SELECT {select_list}, {FULLTEXT_MATCH} AS relevance FROM catalog WHERE {FULLTEXT_MATCH}"
+    else:
+        query = f"SELECT {select_list} FROM catalog WHERE 1=1"
+
+    if use_tag_index is None:
+        use_tag_index = TAG_INDEX_ENABLED
+    match = (tags_match or "any").lower().strip()
+    if match not in ("any", "all"):
+        raise ValueError("tags_match must be 'any' or 'all'")
+    clause = tag_filter_clause if use_tag_index else tag_like_clause
+    for kind, value in (("vibes", vibes), ("activities", activities), ("food", food)):
+        tags = split_tags(value)
+        if tags:
+            query += clause(kind, tags, match, params)
+
+    if city:
+        query += " AND city = %(city)s"
+        params["city"] = city.lower().strip()
+    if country:
+        query += " AND country = %(country)s"
+        params["country"] = country.lower().strip()
+    if best_season:
+        query += " AND best_season = %(best_season)s"
+        params["best_season"] = best_season.lower().strip()
+    if transport:
+        query += " AND transport = %(transport)s"
+        params["transport"] = transport.lower().strip()
+    if rating_avg is not None:
+        query += " AND rating >= %(rating_avg)s"
+        params["rating_avg"] = rating_avg
+    if accessibility:
+        query += " AND accessibility LIKE %(accessibility)s"
+        params["accessibility"] = f"%{accessibility.lower().strip()}%"
+
+    if budget is not None:
+        query += " AND budget <= %(budget)s"
+        params["budget"] = budget
+
+    if poi:
+        query += " AND poi LIKE %(poi)s"
+        params["poi"] = f"%{poi.lower().strip()}%"
+
+    return query, params
+
+
+def build_update_query(poi: str, updates: Dict[str, Any], now: datetime) -> Tuple[str, List[Any], Dict[str, Any]]:
+    """
+    UPDATE for a PATCH body. Returns (sql, params, written): `written` is the
+    column values as stored, strings lower-cased and trimmed, plus
+    updated_at = `now`.
+    """
+    written = {key: value.lower().strip() if isinstance(value, str) else value for key, value in updates.items()}
+    written["updated_at"] = now
+
+    set_clause = ", ".join(f"{key} = %s" for key in written)
+    values = list(written.values()) + [normalize_poi(poi)]
+    return f"UPDATE catalog SET {set_clause} WHERE poi = %s", values, written
+
+
+def with_read_back(query: str, values: List[Any], poi: str) -> Tuple[str, List[Any]]:
+    """
+    `query` followed by SELECT_BY_POI_SQL for `poi` in one multi-statement
+    round trip; fetch the row after cursor.nextset(). The row is then what
+    this write left, even when another worker wrote it just before.
+    """
+    return f"{query}; {SELECT_BY_POI_SQL}", [*values, poi]
+
+
+def list_cache_key(filters: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Canonical, hashable form of a GET /catalogs filter set: unset filters are
+    dropped, strings are lower-cased/trimmed and the comma-separated
+    vibes/activities/food lists are de-duplicated and sorted, so equivalent searches share one entry.
+    """
+    items = []
+    for name, value in filters.items():
+        if value is None or value == "":
+            continue
+        if name in ("vibes", "food", "activities"):
+            parts = sorted(set(split_tags(value)))
+            if not parts:
+                continue
+            value = tuple(parts)
+        elif isinstance(value, str):
+            value = value.lower().strip()
+        items.append((name, value))
+    return tuple(sorted(items))
+
+
+# -----------------------------------------------------------------------------
+# Pagination (keyset on rating DESC, poi ASC) + field projection
+# -----------------------------------------------------------------------------
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past `row` in (rating DESC, poi ASC) order."""
+    raw = json.dumps([str(row["rating"]), row["poi"]], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        rating, poi = json.loads(raw)
+        float(rating)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return rating, poi
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Cursor for relevance-ranked (q=...) pages, where scores make poor keyset keys."""
+    raw = json.dumps({"offset": offset}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        offset = int(json.loads(raw)["offset"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Validate a fields= projection against CatalogRead; None means all columns."""
+    if not fields:
+        return None
+    names = tuple(dict.fromkeys(f.strip().lower() for f in fields.split(",") if f.strip()))
+    unknown = [n for n in names if n not in CATALOG_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return names or None
+
+
+class ListPlan(NamedTuple):
+    cache_key: tuple
+    query: str
+    params: Dict[str, Any]
+    page_size: Optional[int]
+    fields: Optional[Tuple[str, ...]]
+    offset: Optional[int] = None  # set for relevance-ranked (q=...) pages
+
+
+def plan_list_query(
+    filters: Dict[str, Any],
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> ListPlan:
+    """
+    Turn GET /catalogs filters + paging/projection params into SQL.
+
+    Without limit/cursor the result is the full, unordered match set (the
+    original behaviour). With either, rows come back in (rating DESC, poi ASC)
+    order, one extra row is fetched to tell whether a next page exists, and
+    the cursor is applied as a keyset predicate instead of an OFFSET.
+    With q, rows are ranked by full-text relevance (then poi) and pages use
+    an offset cursor.
+    Raises ValueError for a malformed cursor or unknown field names.
+    """
+    projection = parse_fields(fields)
+    paged = limit is not None or cursor is not None
+    page_size = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE) if paged else None
+
+    columns = projection
+    if projection and paged:
+        # rating/poi are needed to build the next cursor even if not returned
+        columns = tuple(dict.fromkeys(projection + ("rating", "poi")))
+
+    query, params = build_list_query(**filters, columns=columns)
+
+    if "q" in params:
+        offset = None
+        query += " ORDER BY relevance DESC, poi ASC"
+        if paged:
+            offset = decode_offset_cursor(cursor) if cursor is not None else 0
+            query += " LIMIT %(page_limit)s OFFSET %(page_offset)s"
+            params["page_limit"] = page_size + 1
+            params["page_offset"] = offset
+        cache_key = (list_cache_key(filters), page_size, cursor, projection)
+        return ListPlan(cache_key, query, params, page_size, projection, offset)
+
+    if paged:
+        if cursor is not None:
+            after_rating, after_poi = decode_cursor(cursor)
+            query += (
+                " AND (rating < %(after_rating)s"
+                " OR (rating = %(after_rating)s AND poi > %(after_poi)s))"
+            )
+            params["after_rating"] = after_rating
+            params["after_poi"] = after_poi
+        query += " ORDER BY rating DESC, poi ASC LIMIT %(page_limit)s"
+        params["page_limit"] = page_size + 1
+
+    cache_key = (list_cache_key(filters), page_size, cursor, projection)
+    return ListPlan(cache_key, query, params, page_size, projection)
+
+
+def finish_page(rows: List[Dict[str, Any]], plan: ListPlan) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Trim the look-ahead row and compute the next cursor (None on the last page)."""
+    if plan.page_size is None or len(rows) <= plan.page_size:
+        return rows, None
+    rows = rows[: plan.page_size]
+    if plan.offset is not None:
+        return rows, encode_offset_cursor(plan.offset + plan.page_size)
+    return rows, encode_cursor(rows[-1])
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# -----------------------------------------------------------------------------
+# Normalized tag index (catalog_tag) for vibes / activities / food
+#
+# The catalog table keeps its comma-separated strings (that is what the API
+# returns); catalog_tag holds one row per (kind, tag, poi) so multi-value
+# filters become an indexed semi-join instead of LIKE '%value%' scans.
+# -----------------------------------------------------------------------------
+TAG_KINDS: Tuple[str, ...] = ("vibes", "activities", "food")
+
+# Filters use catalog_tag only once it has been created and backfilled:
+#   python -m services.catalog_tags --backfill
+TAG_INDEX_ENABLED = os.environ.get("CATALOG_TAG_INDEX", "0") == "1"
+
+TAGS_DDL_PATH = Path(__file__).resolve().parent.parent / "migrations" / "0003_catalog_tags.sql"
+
+Statement = Tuple[str, List[Any]]
+
+
+def normalize_tag(tag: str) -> str:
+    """' Martial  Arts ' -> 'martial arts': the one spelling catalog_tag stores and both filters look up."""
+    return " ".join(tag.lower().split())
+
+
+def split_tags(value: Optional[str]) -> List[str]:
+    """'Nature, Relaxing,nature' -> ['nature', 'relaxing'] (order kept, duplicates dropped)."""
+    if not value:
+        return []
+    return list(dict.fromkeys(tag for tag in map(normalize_tag, value.split(",")) if tag))
+
+
+def normalized_tags_sql(kind: str) -> str:
+    """
+    SQL for ',' + the column's tags + ',' spelled the way normalize_tag()
+    spells them: lower-cased, space runs folded and no spaces around commas,
+    so ' Nature ,  Martial Arts' reads ',nature,martial arts,' (runs of
+    more than four spaces are not folded).
+    """
+    folded = f"REPLACE(REPLACE(LOWER({kind}), '  ', ' '), '  ', ' ')"
+    return f"CONCAT(',', REPLACE(REPLACE({folded}, ', ', ','), ' ,', ','), ',')"
+
+
+def tag_filter_clause(kind: str, tags: Sequence[str], match: str, params: Dict[str, Any]) -> str:
+    """
+    SQL predicate matching catalogs tagged with any (or all) of `tags`.
+    Served from the (kind, tag, poi) primary key.
+    """
+    names = []
+    for i, tag in enumerate(tags):
+        name = f"{kind}_tag_{i}"
+        params[name] = normalize_tag(tag)
+        names.append(f"%({name})s")
+
+    subquery = f"SELECT poi FROM catalog_tag WHERE kind = '{kind}' AND tag IN ({', '.join(names)})"
+    if match == "all" and len(tags) > 1:
+        subquery += f" GROUP BY poi HAVING COUNT(DISTINCT tag) = {len(tags)}"
+    return f" AND poi IN ({subquery})"
+
+
+def tag_like_clause(kind: str, tags: Sequence[str], match: str, params: Dict[str, Any]) -> str:
+    """
+    Fallback for tag_filter_clause while catalog_tag is off: the same any-of /
+    all-of match over the comma-separated column itself. Whole tags only
+    ("art" does not match "martial arts"), compared after normalize_tag() on
+    both sides, so it agrees with what the index holds. Scans the table.
+    """
+    column = normalized_tags_sql(kind)
+    conditions = []
+    for i, tag in enumerate(tags):
+        name = f"{kind}_like_{i}"
+        escaped = normalize_tag(tag).replace("!", "!!").replace("%", "!%").replace("_", "!_")
+        params[name] = f"%,{escaped},%"
+        conditions.append(f"{column} LIKE %({name})s ESCAPE '!'")
+    joiner = " AND " if match == "all" else " OR "
+    return f" AND ({joiner.join(conditions)})"
+
+
+def tag_statements(poi: str, source: Dict[str, Any]) -> List[Statement]:
+    """
+    Statements that bring catalog_tag in line with `source` for the tag
+    columns it contains (a full row on create, only the patched columns on update).
+    """
+    kinds = [k for k in TAG_KINDS if k in source]
+    if not kinds:
+        return []
+
+    statements: List[Statement] = [(
+        f"DELETE FROM catalog_tag WHERE poi = %s AND kind IN ({', '.join(['%s'] * len(kinds))})",
+        [poi, *kinds],
+    )]
+    rows = [(poi, kind, tag) for kind in kinds for tag in split_tags(source[kind])]
+    if rows:
+        statements.append((
+            f"INSERT INTO catalog_tag (poi, kind, tag) VALUES {', '.join(['(%s, %s, %s)'] * len(rows))}",
+            [v for row in rows for v in row],
+        ))
+    return statements
+
+
+def delete_tags_statement(poi: str) -> Statement:
+    return "DELETE FROM catalog_tag WHERE poi = %s", [poi]
+
+
+def apply_statements(cursor: Any, statements: Iterable[Statement]) -> None:
+    for query, params in statements:
+        cursor.execute(query, params)
+
+
+async def apply_statements_async(cursor: Any, statements: Iterable[Statement]) -> None:
+    for query, params in statements:
+        await cursor.execute(query, params)
+
+
+# -----------------------------------------------------------------------------
+# Migration: create catalog_tag and backfill it from the string columns
+# -----------------------------------------------------------------------------
+def create_tag_table(cnx: Any) -> None:
+    cursor = cnx.cursor()
+    try:
+        cursor.execute(TAGS_DDL_PATH.read_text())
+    finally:
+        cursor.close()
+
+
+def backfill_tags(cnx: Any, batch_size: int = 1000) -> int:
+    """Rebuild catalog_tag from catalog; safe to re-run. Returns catalogs processed."""
+    read = cnx.cursor(dictionary=True)
+    write = cnx.cursor()
+    done = 0
+    try:
+        read.execute("SELECT poi, vibes, activities, food FROM catalog ORDER BY poi")
+        rows = read.fetchall()
+        for start in range(0, len(rows), batch_size):
+            cnx.start_transaction()
+            for row in rows[start:start + batch_size]:
+                apply_statements(write, tag_statements(row["poi"], row))
+            cnx.commit()
+            done += len(rows[start:start + batch_size])
+    finally:
+        read.close()
+        write.close()
+    return done
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Create and backfill the catalog_tag index table.")
+    parser.add_argument("--backfill", action="store_true", help="also rebuild tags from catalog rows")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    import mysql.connector
+
+    from services.db_config import DB_CONFIG
+
+    cnx = mysql.connector.connect(**DB_CONFIG)
+    try:
+        create_tag_table(cnx)
+        print("[CATALOG TAGS] catalog_tag table ready")
+        if args.backfill:
+            count = backfill_tags(cnx, batch_size=args.batch_size)
+            print(f"[CATALOG TAGS] backfilled tags for {count} catalogs")
+    finally:
+        cnx.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import os
+import zlib
+from typing import Any, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# -----------------------------------------------------------------------------
+# Response compression (gzip / brotli), negotiated from Accept-Encoding
+#
+# Only compressible media types (JSON, NDJSON, MessagePack, CSV, text) are
+# compressed, and a complete response body smaller than minimum_size is sent
+# as is. Streamed responses (exports) are compressed chunk by chunk with a
+# sync flush after each, so the client still receives rows as they are read.
+#
+# A compressed response's ETag gets a -gzip / -br suffix inside the quotes
+# (different bytes need a different strong validator); services.etags strips
+# it again when comparing If-None-Match / If-Match.
+#
+# CATALOG_COMPRESSION=0 turns the middleware off.
+# -----------------------------------------------------------------------------
+COMPRESSION_ENABLED = os.environ.get("CATALOG_COMPRESSION", "1") == "1"
+
+_COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/msgpack",
+    "application/x-msgpack",
+    "application/javascript",
+    "application/xml",
+}
+_COMPRESSIBLE_SUFFIXES = ("+json", "+msgpack", "+x-ndjson", "+xml")
+
+
+def compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in _COMPRESSIBLE_TYPES
+        or media_type.endswith(_COMPRESSIBLE_SUFFIXES)
+    )
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """"br" or "gzip" by the client's q-values (br wins ties), None if neither is acceptable."""
+    if not accept_encoding:
+        return None
+    q: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        weight = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    weight = float(param[2:])
+                except ValueError:
+                    weight = 0.0
+        q[coding.lower()] = weight
+    wildcard = q.get("*", 0.0)
+    candidates = [("br", q.get("br", wildcard))] if brotli is not None else []
+    candidates.append(("gzip", q.get("gzip", q.get("x-gzip", wildcard))))
+    coding, weight = max(candidates, key=lambda c: c[1])
+    return coding if weight > 0 else None
+
+
+class _Compressor:
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int):
+        self.coding = coding
+        if coding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.coding == "br":
+            return self._br.process(data) + self._br.flush()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.coding == "br":
+            return self._br.process(data) + self._br.finish()
+        return self._gz.compress(data) + self._gz.flush()
+
+
+def _coded_etag(etag: str, coding: str) -> str:
+    return f'{etag[:-1]}-{coding}"' if etag.endswith('"') else etag
+
+
+class CompressionMiddleware:
+    def __init__(self, app: Any, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self, coding, send))
+
+
+class _CompressingSend:
+    """Holds back http.response.start until the first body chunk shows whether to compress."""
+
+    def __init__(self, middleware: CompressionMiddleware, coding: str, send: Any):
+        self.middleware = middleware
+        self.coding = coding
+        self.send = send
+        self.start: Optional[Dict[str, Any]] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not self._should_compress(body, more_body):
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.compressor = _Compressor(self.coding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            body = self.compressor.chunk(body) if more_body else self.compressor.finish(body)
+            await self.send(self._compressed_start(None if more_body else len(body)))
+        else:
+            body = self.compressor.chunk(body) if more_body else self.compressor.finish(body)
+
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    def _should_compress(self, body: bytes, more_body: bool) -> bool:
+        status = self.start["status"]
+        if status < 200 or status in (204, 304):
+            return False
+        headers = Headers(raw=self.start["headers"])
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        if not compressible(headers.get("content-type")):
+            return False
+        return more_body or len(body) >= self.middleware.minimum_size
+
+    def _compressed_start(self, content_length: Optional[int]) -> Dict[str, Any]:
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        headers["Content-Encoding"] = self.coding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        etag = headers.get("etag")
+        if etag:
+            headers["ETag"] = _coded_etag(etag, self.coding)
+        return {**self.start, "headers": headers.raw}
+
+
+def compression_settings_from_env(prefix: str = "CATALOG_COMPRESSION_") -> Dict[str, Any]:
+    """Read middleware settings, e.g. CATALOG_COMPRESSION_MIN_SIZE=2048."""
+    return {
+        "minimum_size": int(os.environ.get(f"{prefix}MIN_SIZE", 1024)),
+        "gzip_level": int(os.environ.get(f"{prefix}GZIP_LEVEL", 6)),
+        "brotli_quality": int(os.environ.get(f"{prefix}BROTLI_QUALITY", 4)),
+    }
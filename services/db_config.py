@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import os
+
+# -----------------------------------------------------------------------------
+# MySQL Connectivity (shared by the apps and the schema tooling)
+# -----------------------------------------------------------------------------
+DB_CONFIG = {
+    "host": os.environ.get("CATALOG_DB_HOST", "10.142.0.4"),
+    "user": os.environ.get("CATALOG_DB_USER", "felicia"),
+    "password": os.environ.get("CATALOG_DB_PASSWORD", "1234"),
+    "database": os.environ.get("CATALOG_DB_NAME", "TripSparkCatalog"),
+    # Single-statement writes commit in the same round trip; multi-statement
+    # paths (bulk, export) open an explicit transaction.
+    "autocommit": True,
+    # Sessions run in UTC, so CURRENT_TIMESTAMP / NOW() agree with the naive
+    # UTC timestamps the service writes (catalog_sql.write_timestamp).
+    "time_zone": "+00:00",
+}
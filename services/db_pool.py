@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+from services.metrics import DB_ACQUIRE_SECONDS, METRICS_ENABLED, TimedCursor
+
+_ACQUIRE_SECONDS = DB_ACQUIRE_SECONDS.labels("sync")
+
+# -----------------------------------------------------------------------------
+# Errors
+# -----------------------------------------------------------------------------
+class PoolTimeout(Exception):
+    """Raised when no connection could be borrowed within the wait timeout."""
+
+
+# -----------------------------------------------------------------------------
+# Pooled connection proxy
+# -----------------------------------------------------------------------------
+class PooledConnection:
+    """
+    Proxy handed out by ConnectionPool.acquire().
+
+    Everything is delegated to the underlying mysql.connector connection,
+    except close(), which hands the connection back to the pool instead of
+    tearing down the socket, and cursor(), which times statements for
+    /metrics unless CATALOG_METRICS=0.
+    """
+
+    def __init__(self, pool: "ConnectionPool", raw: Any, created_at: float):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._returned = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+    def cursor(self, *args: Any, **kwargs: Any) -> Any:
+        cursor = self._raw.cursor(*args, **kwargs)
+        return TimedCursor(cursor) if METRICS_ENABLED else cursor
+
+    def close(self) -> None:
+        if not self._returned:
+            self._returned = True
+            self._pool._release(self._raw, self._created_at)
+
+    def discard(self) -> None:
+        """Drop the connection instead of pooling it (e.g. unread rows left on the wire)."""
+        if not self._returned:
+            self._returned = True
+            with self._pool._cond:
+                self._pool._in_use -= 1
+            self._pool._discard(self._raw)
+
+
+# -----------------------------------------------------------------------------
+# Connection pool
+# -----------------------------------------------------------------------------
+class ConnectionPool:
+    """
+    Thread-safe pool of DB connections shared by all CRUD handlers.
+
+    - min_size:            connections opened eagerly by warm()
+    - max_size:            hard cap on open connections (in use + idle)
+    - max_lifetime:        seconds before a connection is retired and reopened
+    - wait_timeout:        seconds a borrower waits when the pool is exhausted
+    - health_check_after:  ping connections idle for longer than this on borrow
+                           (0 = ping on every borrow)
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        min_size: int = 2,
+        max_size: int = 10,
+        max_lifetime: float = 1800.0,
+        wait_timeout: float = 5.0,
+        health_check_after: float = 30.0,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.wait_timeout = wait_timeout
+        self.health_check_after = health_check_after
+
+        self._cond = threading.Condition()
+        # (raw connection, created_at, last_used) -- newest on the right
+        self._idle: Deque[Tuple[Any, float, float]] = deque()
+        self._size = 0
+        self._in_use = 0
+
+        self._acquires = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def acquire(self) -> PooledConnection:
+        started = time.monotonic()
+        deadline = started + self.wait_timeout
+
+        while True:
+            entry = None
+            with self._cond:
+                while True:
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"No DB connection available after {self.wait_timeout:.1f}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+
+            if entry is None:
+                raw, created_at = self._open()
+            else:
+                raw, created_at, last_used = entry
+                if not self._usable(raw, created_at, last_used):
+                    self._discard(raw)
+                    continue
+
+            with self._cond:
+                self._in_use += 1
+                self._acquires += 1
+                waited = time.monotonic() - started
+                if waited > 0.001:
+                    self._waits += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            _ACQUIRE_SECONDS.observe(waited)
+
+            return PooledConnection(self, raw, created_at)
+
+    def warm(self) -> None:
+        """Open connections until min_size are idle (or the pool is full)."""
+        while True:
+            with self._cond:
+                if len(self._idle) >= self.min_size or self._size >= self.max_size:
+                    return
+                self._size += 1
+            raw, created_at = self._open()
+            with self._cond:
+                self._idle.appendleft((raw, created_at, time.monotonic()))
+                self._cond.notify()
+
+    def close_all(self) -> None:
+        """Close every idle connection (used on shutdown)."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+        for raw, _, _ in idle:
+            self._discard(raw)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "acquires": self._acquires,
+                "timeouts": self._timeouts,
+                "connections_created": self._created,
+                "connections_discarded": self._discarded,
+                "waits": self._waits,
+                "wait_time_total_ms": round(self._wait_total * 1000, 3),
+                "wait_time_avg_ms": round(self._wait_total * 1000 / self._acquires, 3)
+                if self._acquires
+                else 0.0,
+                "wait_time_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _open(self) -> Tuple[Any, float]:
+        try:
+            raw = self.factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created += 1
+        return raw, time.monotonic()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.max_lifetime > 0 and time.monotonic() - created_at >= self.max_lifetime
+
+    def _usable(self, raw: Any, created_at: float, last_used: float) -> bool:
+        if self._expired(created_at):
+            return False
+        if time.monotonic() - last_used < self.health_check_after:
+            return True
+        try:
+            return bool(raw.is_connected())
+        except Exception:
+            return False
+
+    def _discard(self, raw: Any) -> None:
+        try:
+            raw.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._discarded += 1
+            self._cond.notify()
+
+    def _release(self, raw: Any, created_at: float) -> None:
+        with self._cond:
+            self._in_use -= 1
+
+        healthy = not self._expired(created_at)
+        if healthy and getattr(raw, "in_transaction", False):
+            # Handler bailed out mid-transaction: never leak it to the next borrower.
+            try:
+                raw.rollback()
+            except Exception:
+                healthy = False
+
+        if not healthy:
+            self._discard(raw)
+            return
+
+        with self._cond:
+            self._idle.append((raw, created_at, time.monotonic()))
+            self._cond.notify()
+
+
+def pool_settings_from_env(prefix: str = "CATALOG_DB_POOL_") -> Dict[str, Any]:
+    """Read pool sizing from the environment, e.g. CATALOG_DB_POOL_MAX_SIZE=20."""
+    return {
+        "min_size": int(os.environ.get(f"{prefix}MIN_SIZE", 2)),
+        "max_size": int(os.environ.get(f"{prefix}MAX_SIZE", 10)),
+        "max_lifetime": float(os.environ.get(f"{prefix}MAX_LIFETIME", 1800)),
+        "wait_timeout": float(os.environ.get(f"{prefix}WAIT_TIMEOUT", 5)),
+        "health_check_after": float(os.environ.get(f"{prefix}HEALTH_CHECK_AFTER", 30)),
+    }
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import Response
+
+from models.catalog import CatalogRead
+from services.catalog_sql import CATALOG_COLUMNS
+
+# -----------------------------------------------------------------------------
+# ETags and conditional requests (RFC 9110 section 13)
+#
+# A catalog's ETag is a digest of its column values, not of the response
+# body: values are canonicalized so a row read from MySQL, from the read
+# cache, or merged from a PATCH gives the same tag for the same content,
+# and nothing is serialized just to compute a validator. updated_at alone
+# is not enough: it has whole-second resolution, so two PATCHes in the
+# same second would share a tag.
+#
+# Canonical forms (exact, so any stored change changes the tag):
+#   latitude, longitude   DECIMAL(9,6)  -> fixed-point text, 6 decimals
+#   rating                DECIMAL(3,2)  -> fixed-point text, 2 decimals
+#   budget, trip_days     INT           -> the integer as-is
+#   created_at, ...       DATETIME      -> ISO text
+# The DECIMAL columns are quantized to their column scale, which is exact
+# for Decimal values and maps the Python float a PATCH merged (40.712776) or
+# a legacy FLOAT column's widened value (4.800000190734863) onto what the
+# column stores. Any other float is kept at full precision.
+#
+# A GET /catalogs page's tag is a digest of its rows' digests plus the next
+# cursor and the projection; it is computed when the page is cached.
+# -----------------------------------------------------------------------------
+_DIGEST_SIZE = 16
+
+
+# Column -> decimal places of its DECIMAL type (migrations/0001_catalog.sql).
+DECIMAL_SCALES: Dict[str, int] = {"latitude": 6, "longitude": 6, "rating": 2}
+
+
+def _canonical(column: str, value: Any) -> Any:
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    scale = DECIMAL_SCALES.get(column)
+    if scale is not None and isinstance(value, (int, float, Decimal)):
+        # str(float) is the shortest repr, i.e. the literal the client sent.
+        exact = value if isinstance(value, Decimal) else Decimal(str(value))
+        return format(exact.quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP), "f")
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, Decimal):
+        return format(value.normalize(), "f")
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None).isoformat()
+    return str(value)
+
+
+def _row_digest(row: Dict[str, Any]) -> bytes:
+    values = tuple(_canonical(column, row.get(column)) for column in CATALOG_COLUMNS)
+    return hashlib.blake2b(repr(values).encode("utf-8"), digest_size=_DIGEST_SIZE).digest()
+
+
+def catalog_etag(row: Dict[str, Any]) -> str:
+    """Strong ETag for one catalog row (as SELECT * / the read cache holds it)."""
+    return f'"{_row_digest(row).hex()}"'
+
+
+def page_etag(rows: Sequence[Dict[str, Any]], next_cursor: Optional[str], fields: Optional[Tuple[str, ...]]) -> str:
+    """Strong ETag for one GET /catalogs page in a given projection."""
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    for row in rows:
+        digest.update(_row_digest(row))
+    digest.update(f"|{next_cursor or ''}|{','.join(fields or ())}".encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+# services.compression appends the content coding to the tags of compressed
+# responses ("abc-gzip"); the underlying representation is the same.
+_CODING_SUFFIXES = ('-gzip"', '-br"')
+
+
+def _entity_tags(header: str) -> List[str]:
+    return [_strip_coding(tag.strip()) for tag in header.split(",") if tag.strip()]
+
+
+def _strip_coding(tag: str) -> str:
+    for suffix in _CODING_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)] + '"'
+    return tag
+
+
+def none_match(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    True when If-None-Match matches etag, i.e. the client's copy is current
+    and a GET should answer 304. Uses weak comparison, as the RFC requires.
+    """
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for tag in _entity_tags(if_none_match):
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def if_match_passes(if_match: Optional[str], etag: str) -> bool:
+    """
+    True when the If-Match precondition holds for the current representation
+    (absent header, "*", or a strong match); False means 412.
+    """
+    if if_match is None:
+        return True
+    for tag in _entity_tags(if_match):
+        if tag == "*" or (not tag.startswith("W/") and tag == etag):
+            return True
+    return False
+
+
+def conditional_catalog(row: Dict[str, Any], response: Response, if_none_match: Optional[str]) -> Any:
+    """CatalogRead for row with its ETag set on response, or a 304 when the client's copy is current."""
+    etag = catalog_etag(row)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return CatalogRead(**row)
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """The 304 response: no body, but the validator and any other headers a 200 would carry."""
+    return Response(status_code=304, headers={**(headers or {}), "ETag": etag})
@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from services.metrics import EVENT_PUBLISH_SECONDS
+
+EVENT_SOURCE = "catalog-microservice"
+
+CATALOG_CREATED = "CATALOG_CREATED"
+CATALOG_UPDATED = "CATALOG_UPDATED"
+CATALOG_DELETED = "CATALOG_DELETED"
+
+_PUBLISH_SECONDS = EVENT_PUBLISH_SECONDS.labels("dispatcher")
+
+
+# -----------------------------------------------------------------------------
+# Publishers
+# -----------------------------------------------------------------------------
+class FakePublisher:
+    """
+    In-memory stand-in for pubsub_v1.PublisherClient (same topic_path /
+    publish signatures) for running and testing offline.
+
+    fail_next makes the next N publish() calls fail, to exercise retries.
+    """
+
+    def __init__(self, fail_next: int = 0, latency: float = 0.0):
+        self.fail_next = fail_next
+        self.latency = latency
+        self.messages: List[Dict[str, Any]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def topic_path(project: str, topic: str) -> str:
+        return f"projects/{project}/topics/{topic}"
+
+    def publish(self, topic: str, data: bytes, ordering_key: str = "", **attributes: str) -> Future:
+        future: Future = Future()
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                future.set_exception(RuntimeError("fake publish failure"))
+                return future
+            message_id = str(next(self._ids))
+            self.messages.append({
+                "topic": topic,
+                "data": data,
+                "attributes": attributes,
+                "ordering_key": ordering_key,
+                "message_id": message_id,
+            })
+        future.set_result(message_id)
+        return future
+
+
+class LazyPublisher:
+    """
+    Creates the real publisher on the first publish() (or other client
+    attribute) instead of at construction, so building an app neither
+    imports google-cloud-pubsub nor looks up GCP credentials. topic_path
+    is answered without the client. A factory that raises is retried on
+    the next use.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._client: Optional[Any] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def topic_path(project: str, topic: str) -> str:
+        return f"projects/{project}/topics/{topic}"
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    def publish(self, topic: str, data: bytes, **kwargs: Any) -> Future:
+        return self.client.publish(topic, data, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not defined above (e.g. resume_publish).
+        return getattr(self.client, name)
+
+
+def pubsub_publisher(ordering: bool = False) -> Any:
+    from google.cloud import pubsub_v1
+
+    if ordering:
+        return pubsub_v1.PublisherClient(
+            publisher_options=pubsub_v1.types.PublisherOptions(enable_message_ordering=True),
+        )
+    return pubsub_v1.PublisherClient()
+
+
+def create_publisher(kind: str, ordering: bool = False) -> Optional[Any]:
+    """
+    'pubsub' -> google-cloud-pubsub client (created lazily, see LazyPublisher),
+    'fake' -> FakePublisher, 'none' -> None.
+    ordering enables Pub/Sub ordering keys (used by the outbox relay, keyed on poi).
+    """
+    if kind == "pubsub":
+        return LazyPublisher(lambda: pubsub_publisher(ordering))
+    if kind == "fake":
+        return FakePublisher()
+    if kind == "none":
+        return None
+    raise ValueError(f"Unknown event publisher {kind!r} (expected pubsub, fake or none)")
+
+
+def utc_now() -> datetime:
+    """The current UTC time, naive, as stored in DATETIME columns (sessions run with time_zone '+00:00')."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def event_timestamp(value: datetime) -> str:
+    """
+    ISO-8601 in UTC with milliseconds, e.g. 2026-10-17T14:59:03.120Z. Naive
+    values are taken as UTC: utc_now() and DB DATETIMEs read on a session
+    pinned to '+00:00' (services/db_config.py) both are.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="milliseconds") + "Z"
+
+
+def _encode_value(value: Any) -> Any:
+    # Row values: DB timestamps in the same format as occurred_at, DECIMAL as its string.
+    if isinstance(value, datetime):
+        return event_timestamp(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_event(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, default=_encode_value, separators=(",", ":")).encode("utf-8")
+
+
+# -----------------------------------------------------------------------------
+# Background dispatcher
+# -----------------------------------------------------------------------------
+@dataclass(order=True)
+class _Pending:
+    not_before: float
+    seq: int
+    event_id: str = field(compare=False)
+    data: bytes = field(compare=False)
+    attributes: Dict[str, str] = field(compare=False)
+    attempts: int = field(default=0, compare=False)
+
+
+class EventDispatcher:
+    """
+    Handlers enqueue() and return immediately; one worker thread drains the
+    queue in batches of up to max_batch events, waiting at most max_latency
+    seconds after the first event of a batch for more to arrive. A batch is
+    published together and its futures awaited once, so a slow broker
+    costs one round trip per batch and never blocks a request.
+
+    Failed events are retried with exponential backoff (backoff_base *
+    2**attempt, capped at backoff_max) up to max_attempts, then marked
+    failed. When the queue is full, enqueue() drops the event and counts
+    it rather than blocking the caller.
+    """
+
+    def __init__(
+        self,
+        publisher: Any,
+        topic_path: str,
+        max_batch: int = 100,
+        max_latency: float = 0.05,
+        max_attempts: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_queue: int = 10000,
+        publish_timeout: float = 30.0,
+        track_recent: int = 10000,
+    ):
+        self.publisher = publisher
+        self.topic_path = topic_path
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.publish_timeout = publish_timeout
+        self.track_recent = track_recent
+
+        self._queue: "queue.Queue[_Pending]" = queue.Queue(maxsize=max_queue)
+        self._retries: List[_Pending] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._status: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+        self.enqueued = 0
+        self.published = 0
+        self.retried = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="catalog-event-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush what is queued (retries included) for up to `timeout` seconds, then stop."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def enqueue(self, payload: Dict[str, Any], event_id: Optional[str] = None, **attributes: str) -> Optional[str]:
+        """Queue a JSON payload for publishing; returns its event id, or None if dropped."""
+        event_id = event_id or payload.get("event_id") or uuid.uuid4().hex
+        pending = _Pending(0.0, next(self._seq), event_id, encode_event(payload), {"content_type": "application/json", **attributes})
+        with self._lock:
+            # Tracked before the put so the worker's "published" can't be overwritten.
+            self._track(event_id, status="queued", attempts=0)
+        try:
+            self._queue.put_nowait(pending)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._track(event_id, status="dropped", attempts=0)
+            print(f"[CATALOG EVENTS] queue full, dropped event {event_id}")
+            return None
+        with self._lock:
+            self.enqueued += 1
+        return event_id
+
+    def status(self, event_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._status.get(event_id)
+            return dict(entry, event_id=event_id) if entry is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "topic": self.topic_path,
+                "running": self._thread is not None and self._thread.is_alive(),
+                "queued": self._queue.qsize(),
+                "awaiting_retry": len(self._retries),
+                "enqueued": self.enqueued,
+                "published": self.published,
+                "retried": self.retried,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "batches": self.batches,
+            }
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            if batch:
+                self._publish_batch(batch)
+            elif self._stopping.is_set() and self._queue.empty():
+                with self._lock:
+                    if not self._retries:
+                        return
+                    # Shutting down: don't sit out the remaining backoff.
+                    for pending in self._retries:
+                        pending.not_before = 0.0
+
+    def _collect(self) -> List[_Pending]:
+        batch = self._due_retries()
+        if not batch:
+            try:
+                batch.append(self._queue.get(timeout=self._idle_wait()))
+            except queue.Empty:
+                return batch
+
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _due_retries(self) -> List[_Pending]:
+        now = time.monotonic()
+        due: List[_Pending] = []
+        with self._lock:
+            while self._retries and self._retries[0].not_before <= now and len(due) < self.max_batch:
+                due.append(heapq.heappop(self._retries))
+        return due
+
+    def _idle_wait(self) -> float:
+        with self._lock:
+            if self._retries:
+                return max(0.001, min(0.5, self._retries[0].not_before - time.monotonic()))
+        return 0.5
+
+    def _publish_batch(self, batch: List[_Pending]) -> None:
+        in_flight = []
+        sent_at = time.perf_counter()
+        for pending in batch:
+            pending.attempts += 1
+            try:
+                in_flight.append((pending, self.publisher.publish(self.topic_path, pending.data, **pending.attributes)))
+            except Exception as err:
+                self._failed_attempt(pending, err)
+
+        for pending, future in in_flight:
+            try:
+                message_id = future.result(timeout=self.publish_timeout)
+            except Exception as err:
+                self._failed_attempt(pending, err)
+                continue
+            _PUBLISH_SECONDS.observe(time.perf_counter() - sent_at)
+            with self._lock:
+                self.published += 1
+                self._track(pending.event_id, status="published", attempts=pending.attempts, message_id=message_id)
+
+        with self._lock:
+            self.batches += 1
+
+    def _failed_attempt(self, pending: _Pending, err: Exception) -> None:
+        with self._lock:
+            if pending.attempts >= self.max_attempts:
+                self.failed += 1
+                self._track(pending.event_id, status="failed", attempts=pending.attempts, error=str(err))
+                print(f"[CATALOG EVENTS] giving up on {pending.event_id} after {pending.attempts} attempts: {err}")
+                return
+            self.retried += 1
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (pending.attempts - 1))
+            pending.not_before = time.monotonic() + delay
+            heapq.heappush(self._retries, pending)
+            self._track(pending.event_id, status="retrying", attempts=pending.attempts, error=str(err))
+
+    def _track(self, event_id: str, **entry: Any) -> None:
+        self._status[event_id] = entry
+        self._status.move_to_end(event_id)
+        while len(self._status) > self.track_recent:
+            self._status.popitem(last=False)
+
+
+def event_dispatcher_from_env(
+    default_publisher: str = "none",
+    project_id: Optional[str] = None,
+    topic_id: Optional[str] = None,
+) -> Optional[EventDispatcher]:
+    """
+    Build the dispatcher selected by CATALOG_EVENTS_PUBLISHER (pubsub, fake
+    or none); None when publishing is disabled.
+    """
+    publisher = create_publisher(os.environ.get("CATALOG_EVENTS_PUBLISHER", default_publisher))
+    if publisher is None:
+        return None
+    return EventDispatcher(publisher, events_topic_path(publisher, project_id, topic_id), **dispatcher_settings_from_env())
+
+
+def events_topic_path(publisher: Any, project_id: Optional[str] = None, topic_id: Optional[str] = None) -> str:
+    project_id = project_id or os.environ.get("GCP_PROJECT_ID", "long-way-475401-b6")
+    topic_id = topic_id or os.environ.get("TRIPSPARK_EVENTS_TOPIC", "tripspark-events")
+    return publisher.topic_path(project_id, topic_id)
+
+
+def dispatcher_settings_from_env(prefix: str = "CATALOG_EVENTS_") -> Dict[str, Any]:
+    """Read batching / retry settings, e.g. CATALOG_EVENTS_MAX_BATCH=500."""
+    return {
+        "max_batch": int(os.environ.get(f"{prefix}MAX_BATCH", 100)),
+        "max_latency": float(os.environ.get(f"{prefix}MAX_LATENCY", 0.05)),
+        "max_attempts": int(os.environ.get(f"{prefix}MAX_ATTEMPTS", 5)),
+        "backoff_base": float(os.environ.get(f"{prefix}BACKOFF_BASE", 0.5)),
+        "backoff_max": float(os.environ.get(f"{prefix}BACKOFF_MAX", 30)),
+        "max_queue": int(os.environ.get(f"{prefix}MAX_QUEUE", 10000)),
+    }
+
+
+# -----------------------------------------------------------------------------
+# Catalog change events
+#
+# Write handlers call their app's emit function (catalog_event_emitter) after
+# a successful commit, next to notifying the change listeners. It is a no-op
+# without a dispatcher: CATALOG_EVENTS_PUBLISHER=none, or CATALOG_OUTBOX=1,
+# where services/outbox.py carries the events.
+# -----------------------------------------------------------------------------
+EventEmitter = Callable[..., Optional[str]]
+
+
+def catalog_event(event_type: str, poi: Optional[str], data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return {
+        "event_id": uuid.uuid4().hex,
+        "source": EVENT_SOURCE,
+        "event_type": event_type,
+        "poi": poi,
+        "occurred_at": event_timestamp(datetime.now(timezone.utc)),
+        "data": data or {},
+    }
+
+
+def catalog_event_emitter(dispatcher: Optional[EventDispatcher]) -> EventEmitter:
+    """emit(event_type, poi, data=None) queueing a catalog_event() on `dispatcher`; returns its event_id."""
+
+    def emit_catalog_event(event_type: str, poi: str, data: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        if dispatcher is None:
+            return None
+        return dispatcher.enqueue(catalog_event(event_type, poi, data), event_type=event_type, poi=poi)
+
+    return emit_catalog_event
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import csv
+import io
+import os
+from typing import Any, Dict, List, Optional, Union
+
+from models.catalog import CatalogRead
+from services.catalog_sql import CATALOG_COLUMNS
+from services.fast_json import FAST_JSON_ENABLED, dumps, trusted_documents
+from services.formats import columnar, msgpack, negotiate, packb
+
+# -----------------------------------------------------------------------------
+# GET /catalogs/export encoders
+#
+# Rows are read in batches from an unbuffered (server-side) cursor and each
+# batch is encoded to one chunk of the StreamingResponse, so memory stays
+# bounded by EXPORT_BATCH_SIZE no matter how large the table is.
+#
+# columnar is one services.formats.columnar() document per batch, one per
+# line; msgpack is a plain stream of MessagePack maps, one per row.
+# -----------------------------------------------------------------------------
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "columnar": "application/vnd.tripspark.columnar+x-ndjson",
+}
+if msgpack is not None:
+    EXPORT_FORMATS["msgpack"] = "application/msgpack"
+
+EXPORT_BATCH_SIZE = int(os.environ.get("CATALOG_EXPORT_BATCH_SIZE", 500))
+
+# Ordered by the unique key so the server can stream straight off the index.
+EXPORT_SQL = "SELECT * FROM catalog ORDER BY poi"
+
+
+def export_preamble(fmt: str) -> str:
+    if fmt == "csv":
+        buf = io.StringIO()
+        csv.writer(buf).writerow(CATALOG_COLUMNS)
+        return buf.getvalue()
+    return ""
+
+
+def export_format(fmt: Optional[str], accept: Optional[str]) -> str:
+    """?format= when given, else the format Accept asks for (ndjson by default)."""
+    if fmt:
+        return fmt
+    by_media_type = {media_type: name for name, media_type in EXPORT_FORMATS.items()}
+    return by_media_type[negotiate(accept, list(by_media_type), default=EXPORT_FORMATS["ndjson"])]
+
+
+def encode_batch(fmt: str, rows: List[Dict[str, Any]]) -> Union[str, bytes]:
+    """Encode normalized DB rows exactly as CatalogRead would serialize them."""
+    if fmt == "columnar":
+        return dumps(columnar(rows)) + b"\n"
+    if fmt == "msgpack":
+        return b"".join(packb(doc) for doc in trusted_documents(rows))
+    if fmt == "ndjson" and FAST_JSON_ENABLED:
+        return b"".join(dumps(doc) + b"\n" for doc in trusted_documents(rows))
+    if fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            doc = CatalogRead(**row).model_dump(mode="json")
+            writer.writerow([doc[col] for col in CATALOG_COLUMNS])
+        return buf.getvalue()
+
+    return "".join(CatalogRead(**row).model_dump_json() + "\n" for row in rows)
+
+
+def export_filename(fmt: str) -> str:
+    return f"catalog-export.{fmt}"
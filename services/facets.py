@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.catalog_tags import TAG_KINDS, split_tags
+from services.row_index import RowIndex
+
+# -----------------------------------------------------------------------------
+# In-process faceted search (GET /catalogs/search)
+#
+# Every catalog row gets a small integer id; for each facet value we keep a
+# Python int used as a bitmap of the row ids carrying it. Filtering is then
+# AND / OR over those ints and a facet count is popcount(bitmap & matches),
+# so one request returns the page and every facet count without touching
+# MySQL. Loading and write freshness follow services.row_index.RowIndex.
+# -----------------------------------------------------------------------------
+FACET_FIELDS: Tuple[str, ...] = ("city", "country", "spending", "best_season", "transport")
+FACET_TAG_FIELDS: Tuple[str, ...] = TAG_KINDS
+
+FACET_MAX_PENDING = int(os.environ.get("CATALOG_FACET_MAX_PENDING", 2000))
+
+
+def _row_values(field: str, row: Dict[str, Any]) -> List[str]:
+    value = row.get(field)
+    if field in FACET_TAG_FIELDS:
+        return split_tags(value)
+    if value is None or value == "":
+        return []
+    return [str(value).lower().strip()]
+
+
+def _bit_ids(mask: int) -> List[int]:
+    """Positions of the set bits of `mask`, lowest first."""
+    bits = bin(mask)[:1:-1]
+    return [i for i, bit in enumerate(bits) if bit == "1"]
+
+
+class FacetIndex(RowIndex):
+    """
+    Bitmap index over the catalog table.
+
+    Not a cache of query results: it holds every row once, so memory is
+    roughly one dict per catalog plus one int per distinct facet value.
+    """
+
+    _STATE = ("_rows", "_ids", "_free", "_alive", "_postings")
+
+    def __init__(self, max_pending: int = FACET_MAX_PENDING):
+        self._searches = 0
+        super().__init__(max_pending)
+
+    def _reset(self) -> None:
+        self._rows: List[Optional[Dict[str, Any]]] = []
+        self._ids: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._alive = 0
+        self._postings: Dict[str, Dict[str, int]] = {f: {} for f in FACET_FIELDS + FACET_TAG_FIELDS}
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+    def search(
+        self,
+        filters: Dict[str, Optional[str]],
+        tags_match: str = "any",
+        rating_min: Optional[float] = None,
+        budget_max: Optional[float] = None,
+        limit: int = 100,
+        offset: int = 0,
+        facet_limit: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        filters maps a facet field to a comma-separated value list: values
+        of one plain field are OR-ed, tag fields follow tags_match, and
+        fields are AND-ed. Facet counts for a field are taken with every
+        filter except that field's own, so the UI can show alternatives.
+        """
+        with self._lock:
+            self._searches += 1
+            masks: Dict[str, int] = {}
+            for field, raw in filters.items():
+                values = split_tags(raw)
+                if not values:
+                    continue
+                postings = self._postings[field]
+                if field in FACET_TAG_FIELDS and tags_match == "all":
+                    mask = self._alive
+                    for value in values:
+                        mask &= postings.get(value, 0)
+                else:
+                    mask = 0
+                    for value in values:
+                        mask |= postings.get(value, 0)
+                masks[field] = mask
+
+            base = self._alive
+            if rating_min is not None or budget_max is not None:
+                base = self._numeric_mask(base, rating_min, budget_max)
+
+            matched = base
+            for mask in masks.values():
+                matched &= mask
+
+            facets: Dict[str, Dict[str, int]] = {}
+            for field, postings in self._postings.items():
+                scope = base
+                for other, mask in masks.items():
+                    if other != field:
+                        scope &= mask
+                counts = [(value, (bits & scope).bit_count()) for value, bits in postings.items()]
+                counts = sorted((c for c in counts if c[1]), key=lambda c: (-c[1], c[0]))[:facet_limit]
+                facets[field] = dict(counts)
+
+            rows = [self._rows[i] for i in _bit_ids(matched)]
+
+        rows.sort(key=lambda r: (-float(r.get("rating") or 0), r["poi"]))
+        return {
+            "total": len(rows),
+            "items": rows[offset:offset + limit],
+            "facets": facets,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._freshness_stats(),
+                "rows": len(self._ids),
+                "values": {f: len(p) for f, p in self._postings.items()},
+                "searches": self._searches,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds the lock, or owns a fresh index)
+    # ------------------------------------------------------------------
+    def _add(self, row: Dict[str, Any]) -> None:
+        if row["poi"] in self._ids:
+            self._remove(row["poi"])
+        if self._free:
+            rid = self._free.pop()
+            self._rows[rid] = row
+        else:
+            rid = len(self._rows)
+            self._rows.append(row)
+        self._ids[row["poi"]] = rid
+        bit = 1 << rid
+        self._alive |= bit
+        for field, postings in self._postings.items():
+            for value in _row_values(field, row):
+                postings[value] = postings.get(value, 0) | bit
+
+    def _remove(self, poi: str) -> None:
+        rid = self._ids.pop(poi, None)
+        if rid is None:
+            return
+        row = self._rows[rid]
+        bit = 1 << rid
+        self._alive &= ~bit
+        for field, postings in self._postings.items():
+            for value in _row_values(field, row):
+                remaining = postings.get(value, 0) & ~bit
+                if remaining:
+                    postings[value] = remaining
+                else:
+                    postings.pop(value, None)
+        self._rows[rid] = None
+        self._free.append(rid)
+
+    def _numeric_mask(self, mask: int, rating_min: Optional[float], budget_max: Optional[float]) -> int:
+        keep = bytearray(b"0" * len(self._rows))
+        for rid in _bit_ids(mask):
+            row = self._rows[rid]
+            if rating_min is not None and (row.get("rating") is None or float(row["rating"]) < rating_min):
+                continue
+            if budget_max is not None and (row.get("budget") is None or float(row["budget"]) > budget_max):
+                continue
+            keep[rid] = ord("1")
+        return int(keep[::-1] or b"0", 2)
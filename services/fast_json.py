@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from fastapi import Response
+
+from models.catalog import CatalogRead
+from services.catalog_sql import CATALOG_COLUMNS
+
+try:
+    import orjson
+except ImportError:  # stdlib json is slower but produces the same documents
+    orjson = None
+
+# -----------------------------------------------------------------------------
+# Trusted-row JSON for GET /catalogs
+#
+# Rows read from our own catalog table already have the types CatalogRead
+# declares, so instead of building a model per row and letting FastAPI
+# re-validate the list against response_model before encoding it, the list
+# handlers turn the DB dicts straight into JSON bytes. The output matches
+# what CatalogRead would produce: same keys in field order, DECIMAL columns
+# as JSON numbers, datetimes as ISO 8601.
+#
+# CATALOG_FAST_JSON=0 goes back to the validated path.
+# -----------------------------------------------------------------------------
+FAST_JSON_ENABLED = os.environ.get("CATALOG_FAST_JSON", "1") == "1"
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _coercer(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    if annotation is float:
+        return float
+    if annotation is int:
+        return int
+    return None
+
+
+# column -> float/int for the numeric fields (MySQL may hand back Decimal)
+_NUMERIC: Dict[str, Callable[[Any], Any]] = {
+    name: coerce
+    for name, field in CatalogRead.model_fields.items()
+    if (coerce := _coercer(field.annotation)) is not None
+}
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps_stdlib(value: Any) -> bytes:
+    return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def dumps(value: Any) -> bytes:
+    """JSON bytes via orjson when it is installed, else the stdlib encoder."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return dumps_stdlib(value)
+
+
+def trusted_documents(rows: Iterable[Dict[str, Any]], columns: Sequence[str] = CATALOG_COLUMNS) -> list:
+    """Normalized DB rows -> plain dicts shaped like CatalogRead (or a projection of it)."""
+    numeric: Tuple[Tuple[str, Callable[[Any], Any]], ...] = tuple(
+        (name, _NUMERIC[name]) for name in columns if name in _NUMERIC
+    )
+    documents = []
+    for row in rows:
+        doc = {name: row[name] for name in columns}
+        for name, coerce in numeric:
+            value = doc[name]
+            if value is not None and type(value) is not coerce:
+                doc[name] = coerce(value)
+        documents.append(doc)
+    return documents
+
+
+def rows_json(rows: Iterable[Dict[str, Any]], columns: Sequence[str] = CATALOG_COLUMNS) -> bytes:
+    return dumps(trusted_documents(rows, columns))
+
+
+def rows_response(
+    rows: Iterable[Dict[str, Any]],
+    columns: Optional[Sequence[str]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """A ready JSON response for trusted catalog rows; FastAPI does not touch the body again."""
+    return Response(content=rows_json(rows, columns or CATALOG_COLUMNS), media_type=JSON_MEDIA_TYPE, headers=headers)
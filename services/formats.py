@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import Response
+
+from services.catalog_sql import CATALOG_COLUMNS
+from services.fast_json import JSON_MEDIA_TYPE, dumps, trusted_documents
+
+try:
+    import msgpack
+except ImportError:  # MessagePack is simply not offered
+    msgpack = None
+
+# -----------------------------------------------------------------------------
+# Negotiated representations for GET /catalogs and exports
+#
+# Besides plain JSON a client can ask, via Accept, for
+#   application/msgpack                        the same documents, MessagePack
+#   application/vnd.tripspark.columnar+json    one array per column
+#   application/vnd.tripspark.columnar+msgpack the columnar form, MessagePack
+#
+# Columnar pages dictionary-encode every column whose values repeat (city,
+# country, currency, spending, ...): the column holds indexes into a list of
+# its distinct values, so "new york city" is sent once per page, not per row.
+#
+#   {"columns": ["poi", "city", ...], "count": 2,
+#    "dictionaries": {"city": ["new york city"]},
+#    "data": {"poi": ["central park", "times square"], "city": [0, 0], ...}}
+#
+# Datetimes are ISO 8601 strings in every format. MessagePack needs the
+# optional msgpack package; without it only the JSON forms are offered.
+# -----------------------------------------------------------------------------
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+COLUMNAR_JSON_MEDIA_TYPE = "application/vnd.tripspark.columnar+json"
+COLUMNAR_MSGPACK_MEDIA_TYPE = "application/vnd.tripspark.columnar+msgpack"
+
+_MEDIA_TYPE_ALIASES = {"application/x-msgpack": MSGPACK_MEDIA_TYPE}
+
+# Server preference order: the first acceptable one wins ties.
+LIST_MEDIA_TYPES: Tuple[str, ...] = (JSON_MEDIA_TYPE, COLUMNAR_JSON_MEDIA_TYPE) + (
+    (COLUMNAR_MSGPACK_MEDIA_TYPE, MSGPACK_MEDIA_TYPE) if msgpack is not None else ()
+)
+
+# Each non-JSON representation gets its own ETag.
+_ETAG_SUFFIXES = {
+    MSGPACK_MEDIA_TYPE: "msgpack",
+    COLUMNAR_JSON_MEDIA_TYPE: "columnar",
+    COLUMNAR_MSGPACK_MEDIA_TYPE: "columnar-msgpack",
+}
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    ranges = []
+    for part in accept.split(","):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        if not media_type:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        ranges.append((_MEDIA_TYPE_ALIASES.get(media_type.lower(), media_type.lower()), q))
+    return ranges
+
+
+def _quality(media_type: str, ranges: List[Tuple[str, float]]) -> float:
+    """q of the most specific range matching media_type (RFC 9110 12.5.1), 0 if none."""
+    best, specificity = 0.0, -1
+    major = media_type.split("/")[0]
+    for pattern, q in ranges:
+        if pattern == media_type:
+            rank = 2
+        elif pattern == f"{major}/*":
+            rank = 1
+        elif pattern == "*/*":
+            rank = 0
+        else:
+            continue
+        if rank > specificity:
+            best, specificity = q, rank
+    return best
+
+
+def negotiate(accept: Optional[str], offered: Sequence[str], default: str = JSON_MEDIA_TYPE) -> str:
+    """
+    The offered media type the client prefers. Falls back to default when
+    Accept is missing or matches nothing, rather than answering 406, so
+    browsers and existing clients keep getting JSON.
+    """
+    if not accept:
+        return default
+    ranges = _parse_accept(accept)
+    best, best_q = default, 0.0
+    for media_type in offered:
+        q = _quality(media_type, ranges)
+        if q > best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def columnar(rows: Iterable[Dict[str, Any]], columns: Sequence[str] = CATALOG_COLUMNS) -> Dict[str, Any]:
+    """Trusted rows -> the dictionary-encoded columnar document described above."""
+    documents = trusted_documents(rows, columns)
+    count = len(documents)
+    data: Dict[str, List[Any]] = {}
+    dictionaries: Dict[str, List[Any]] = {}
+    for name in columns:
+        values = [doc[name] for doc in documents]
+        index: Dict[Any, int] = {}
+        codes = [index.setdefault(value, len(index)) for value in values]
+        if count > 1 and len(index) <= count // 2:
+            dictionaries[name] = list(index)
+            data[name] = codes
+        else:
+            data[name] = values
+    return {"columns": list(columns), "count": count, "dictionaries": dictionaries, "data": data}
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Type is not MessagePack serializable: {type(value).__name__}")
+
+
+def packb(value: Any) -> bytes:
+    return msgpack.packb(value, default=_msgpack_default, use_bin_type=True)
+
+
+def encode_rows(rows: Sequence[Dict[str, Any]], columns: Sequence[str], media_type: str) -> bytes:
+    if media_type == COLUMNAR_JSON_MEDIA_TYPE:
+        return dumps(columnar(rows, columns))
+    if media_type == COLUMNAR_MSGPACK_MEDIA_TYPE:
+        return packb(columnar(rows, columns))
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return packb(trusted_documents(rows, columns))
+    return dumps(trusted_documents(rows, columns))
+
+
+def representation_etag(etag: str, media_type: str) -> str:
+    """The page ETag for one representation: unchanged for JSON, suffixed otherwise."""
+    suffix = _ETAG_SUFFIXES.get(media_type)
+    return f'{etag[:-1]}.{suffix}"' if suffix else etag
+
+
+def encoded_rows_response(
+    rows: Sequence[Dict[str, Any]],
+    columns: Optional[Sequence[str]],
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    return Response(content=encode_rows(rows, columns or CATALOG_COLUMNS, media_type), media_type=media_type, headers=headers)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.row_index import RowIndex
+
+# -----------------------------------------------------------------------------
+# In-process geo grid for GET /catalogs/nearby
+#
+# Points are bucketed into fixed lat/lon cells of CATALOG_GEO_CELL_DEG
+# degrees. A radius query only visits the cells overlapping the circle's
+# bounding box (wrapping across the antimeridian) and computes haversine
+# distances for the points in them, so the cost grows with the area
+# searched, not with the catalog size.
+# -----------------------------------------------------------------------------
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+GEO_CELL_DEG = float(os.environ.get("CATALOG_GEO_CELL_DEG", 0.25))
+GEO_MAX_RADIUS_KM = 20000.0
+
+Cell = Tuple[int, int]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoIndex(RowIndex):
+    """Grid of cells -> {poi: (lat, lon)}; rows without coordinates are skipped."""
+
+    _STATE = ("_cells", "_points", "_rows")
+
+    def __init__(self, max_pending: int = 2000, cell_deg: float = GEO_CELL_DEG):
+        self.cell_deg = cell_deg
+        self._lon_cells = max(1, round(360 / cell_deg))
+        self._queries = 0
+        self._visited = 0
+        super().__init__(max_pending)
+
+    def _empty(self) -> "GeoIndex":
+        return GeoIndex(self.max_pending, self.cell_deg)
+
+    def _reset(self) -> None:
+        self._cells: Dict[Cell, Dict[str, Tuple[float, float]]] = {}
+        self._points: Dict[str, Cell] = {}
+        self._rows: Dict[str, Dict[str, Any]] = {}
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        return (math.floor(lat / self.cell_deg), math.floor((lon + 180) / self.cell_deg) % self._lon_cells)
+
+    def nearby(self, lat: float, lon: float, radius_km: float, limit: int = 50) -> List[Dict[str, Any]]:
+        """Rows within radius_km of (lat, lon), nearest first, with a distance_km key."""
+        lat_span = radius_km / KM_PER_DEGREE_LAT
+        lat_lo, lat_hi = max(-90.0, lat - lat_span), min(90.0, lat + lat_span)
+
+        # Widest longitude span is at the bbox edge closest to a pole.
+        cos_lat = min(math.cos(math.radians(lat_lo)), math.cos(math.radians(lat_hi)))
+        if lat_lo <= -90.0 or lat_hi >= 90.0 or cos_lat <= 1e-9:
+            lon_span = 180.0
+        else:
+            lon_span = min(180.0, lat_span / cos_lat)
+
+        row_lo, row_hi = math.floor(lat_lo / self.cell_deg), math.floor(lat_hi / self.cell_deg)
+        if lon_span >= 180.0:
+            col_range = range(self._lon_cells)
+        else:
+            col_lo = math.floor((lon - lon_span + 180) / self.cell_deg)
+            col_hi = math.floor((lon + lon_span + 180) / self.cell_deg)
+            col_range = range(col_lo, col_hi + 1)
+
+        hits: List[Tuple[float, str]] = []
+        with self._lock:
+            self._queries += 1
+            bbox_cells = (row_hi - row_lo + 1) * len(col_range)
+            if bbox_cells > len(self._cells):
+                # Huge radius: walking occupied cells is cheaper than the bbox.
+                candidates = [c for c in self._cells if row_lo <= c[0] <= row_hi]
+            else:
+                candidates = list({
+                    (r, c % self._lon_cells) for r in range(row_lo, row_hi + 1) for c in col_range
+                })
+
+            for cell in candidates:
+                points = self._cells.get(cell)
+                if not points:
+                    continue
+                self._visited += len(points)
+                for poi, (plat, plon) in points.items():
+                    d = haversine_km(lat, lon, plat, plon)
+                    if d <= radius_km:
+                        hits.append((d, poi))
+
+            hits.sort()
+            return [{**self._rows[poi], "distance_km": round(d, 3)} for d, poi in hits[:limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._freshness_stats(),
+                "points": len(self._points),
+                "cells": len(self._cells),
+                "cell_deg": self.cell_deg,
+                "queries": self._queries,
+                "points_visited": self._visited,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds the lock, or owns a fresh index)
+    # ------------------------------------------------------------------
+    def _add(self, row: Dict[str, Any]) -> None:
+        poi = row["poi"]
+        self._remove(poi)
+        lat, lon = _coords(row)
+        if lat is None:
+            return
+        cell = self._cell(lat, lon)
+        self._cells.setdefault(cell, {})[poi] = (lat, lon)
+        self._points[poi] = cell
+        self._rows[poi] = row
+
+    def _remove(self, poi: str) -> None:
+        cell = self._points.pop(poi, None)
+        if cell is None:
+            return
+        self._rows.pop(poi, None)
+        points = self._cells.get(cell)
+        if points is not None:
+            points.pop(poi, None)
+            if not points:
+                del self._cells[cell]
+
+
+def _coords(row: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    try:
+        lat, lon = float(row["latitude"]), float(row["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return None, None
+    if not (-90.0 <= lat <= 90.0) or not (-180.0 <= lon <= 180.0):
+        return None, None
+    return lat, lon
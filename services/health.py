@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+# -----------------------------------------------------------------------------
+# Liveness (/health) and readiness (/ready)
+#
+# /health is polled constantly by the load balancer, so it does no I/O: the
+# host IP is resolved once per process. /ready runs the real checks (pool
+# headroom, a DB round trip, publish backlog) through ReadinessProbe, which
+# caches the result for a couple of seconds and lets concurrent probes share
+# one in-flight run, so a slow DB never sees more than one probe at a time.
+# -----------------------------------------------------------------------------
+READY_DB_MAX_MS = float(os.environ.get("CATALOG_READY_DB_MAX_MS", 500))
+READY_MAX_EVENT_BACKLOG = int(os.environ.get("CATALOG_READY_MAX_EVENT_BACKLOG", 5000))
+READY_MAX_OUTBOX_LAG_MS = float(os.environ.get("CATALOG_READY_MAX_OUTBOX_LAG_MS", 60000))
+
+CheckResult = Dict[str, Any]
+ReadinessCheck = Callable[[], Union[CheckResult, Awaitable[CheckResult]]]
+
+
+@lru_cache(maxsize=1)
+def host_ip() -> str:
+    """This host's IP, resolved on first call and then reused."""
+    try:
+        return socket.gethostbyname(socket.gethostname())
+    except Exception:
+        return "127.0.0.1"
+
+
+class ReadinessProbe:
+    """
+    Runs every registered check concurrently and caches the combined result
+    for ttl seconds. Sync checks run in a worker thread; each check is
+    abandoned (reported as failed) after timeout seconds. A check returns a
+    dict with an "ok" bool plus whatever details help whoever is paged.
+    """
+
+    def __init__(self, ttl: float = 2.0, timeout: float = 2.0):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.checks: Dict[str, ReadinessCheck] = {}
+
+        self._lock = asyncio.Lock()
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+
+        self.runs = 0
+        self.cache_hits = 0
+
+    def add_check(self, name: str, check: ReadinessCheck) -> None:
+        self.checks[name] = check
+
+    async def run(self) -> Dict[str, Any]:
+        result = self._cached()
+        if result is not None:
+            return result
+        async with self._lock:
+            # Probes that queued behind a run get its result.
+            result = self._cached()
+            if result is not None:
+                return result
+            names = list(self.checks)
+            outcomes = await asyncio.gather(*(self._run_check(self.checks[name]) for name in names))
+            self.runs += 1
+            self._checked_at = time.monotonic()
+            self._result = {
+                "ready": all(outcome["ok"] for outcome in outcomes),
+                "checked_at": datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z",
+                "checks": dict(zip(names, outcomes)),
+            }
+            return {**self._result, "cached": False}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": bool(self._result and self._result["ready"]),
+            "runs": self.runs,
+            "cache_hits": self.cache_hits,
+        }
+
+    def _cached(self) -> Optional[Dict[str, Any]]:
+        if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+            return None
+        self.cache_hits += 1
+        return {**self._result, "cached": True}
+
+    async def _run_check(self, check: ReadinessCheck) -> CheckResult:
+        started = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(check):
+                outcome = await asyncio.wait_for(check(), self.timeout)
+            else:
+                outcome = await asyncio.wait_for(asyncio.to_thread(check), self.timeout)
+        except asyncio.TimeoutError:
+            outcome = {"ok": False, "error": f"timed out after {self.timeout:.1f}s"}
+        except Exception as err:
+            outcome = {"ok": False, "error": str(err)}
+        return {**outcome, "check_ms": round((time.perf_counter() - started) * 1000, 3)}
+
+
+def probe_settings_from_env(prefix: str = "CATALOG_READY_") -> Dict[str, Any]:
+    """Read probe settings, e.g. CATALOG_READY_TTL=5."""
+    return {
+        "ttl": float(os.environ.get(f"{prefix}TTL", 2.0)),
+        "timeout": float(os.environ.get(f"{prefix}TIMEOUT", 2.0)),
+    }
+
+
+# -----------------------------------------------------------------------------
+# Checks
+# -----------------------------------------------------------------------------
+def pool_check(stats: Callable[[], Dict[str, Any]]) -> ReadinessCheck:
+    """
+    Fails only when the pool has no free connection *and* borrowers have
+    timed out since the last run: a pool that is merely busy is still ready.
+    """
+    last_timeouts = [None]
+
+    def check() -> CheckResult:
+        current = stats()
+        free = current["idle"] + current["max_size"] - current["size"]
+        new_timeouts = current["timeouts"] - (last_timeouts[0] if last_timeouts[0] is not None else current["timeouts"])
+        last_timeouts[0] = current["timeouts"]
+        return {
+            "ok": free > 0 or new_timeouts == 0,
+            "free": free,
+            "in_use": current["in_use"],
+            "max_size": current["max_size"],
+            "new_timeouts": new_timeouts,
+        }
+
+    return check
+
+
+def db_ping_check(connect: Callable[[], Any], max_ms: float = READY_DB_MAX_MS) -> ReadinessCheck:
+    """SELECT 1 on a pooled connection; fails on error or when slower than max_ms."""
+
+    def check() -> CheckResult:
+        started = time.perf_counter()
+        cnx = connect()
+        try:
+            cursor = cnx.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+        finally:
+            cnx.close()
+        ms = round((time.perf_counter() - started) * 1000, 3)
+        return {"ok": ms <= max_ms, "round_trip_ms": ms, "max_ms": max_ms}
+
+    return check
+
+
+def async_db_ping_check(pool: Any, max_ms: float = READY_DB_MAX_MS) -> ReadinessCheck:
+    """db_ping_check for services.async_db.AsyncConnectionPool."""
+
+    async def check() -> CheckResult:
+        started = time.perf_counter()
+        async with pool.connection() as cnx:
+            async with cnx.cursor() as cursor:
+                await cursor.execute("SELECT 1")
+                await cursor.fetchall()
+        ms = round((time.perf_counter() - started) * 1000, 3)
+        return {"ok": ms <= max_ms, "round_trip_ms": ms, "max_ms": max_ms}
+
+    return check
+
+
+def publish_backlog_check(
+    dispatcher: Optional[Any],
+    relay: Optional[Any],
+    max_backlog: int = READY_MAX_EVENT_BACKLOG,
+    max_lag_ms: float = READY_MAX_OUTBOX_LAG_MS,
+) -> ReadinessCheck:
+    """Events waiting in the dispatcher queue and the outbox relay's lag, when those are running."""
+
+    def check() -> CheckResult:
+        outcome: CheckResult = {"ok": True}
+        if dispatcher is not None:
+            stats = dispatcher.stats()
+            backlog = stats["queued"] + stats["awaiting_retry"]
+            outcome.update(backlog=backlog, max_backlog=max_backlog)
+            outcome["ok"] = backlog <= max_backlog
+        if relay is not None:
+            lag_ms = relay.stats()["lag_ms"]
+            outcome.update(outbox_lag_ms=lag_ms, max_outbox_lag_ms=max_lag_ms)
+            outcome["ok"] = outcome["ok"] and lag_ms <= max_lag_ms
+        return outcome
+
+    return check
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from services.catalog_sql import INSERT_COLUMNS, encode_cursor, encode_offset_cursor, plan_list_query
+
+# -----------------------------------------------------------------------------
+# EXPLAIN check: no supported GET /catalogs filter combination scans the table
+#
+# Every non-empty combination of the indexable filters (city, country,
+# best_season, transport, rating_avg, budget, q) is planned with
+# plan_list_query in three shapes -- unpaged, first page, next page -- and
+# EXPLAINed. A plan that reads catalog with type=ALL fails the check, except
+# for an unpaged query that matches at least --max-scan-fraction of the rows,
+# where a scan is what the optimizer should pick.
+#
+# Filter values come from the data: one row's city/country/season/transport,
+# the 90th-percentile rating and the 10th-percentile budget. The optimizer
+# prefers scans on small tables, so run it on a realistically sized table or
+# let it build a synthetic copy that has catalog's indexes:
+#
+#   python -m services.index_check                     # the catalog table
+#   python -m services.index_check --synthetic 50000   # scratch copy, dropped after
+#
+# Exits with status 1 if any combination fails.
+# -----------------------------------------------------------------------------
+CHECK_TABLE = "catalog_index_check"
+
+FILTERS: Tuple[str, ...] = ("city", "country", "best_season", "transport", "rating_avg", "budget", "q")
+PAGE_SIZE = 100
+MIN_ROWS = 1000
+
+_SEASONS = ["spring", "summer", "fall", "winter"]
+_TRANSPORT = ["walkable", "public_transit", "rideshare", "car_rental"]
+_WORDS = (
+    "park museum harbor market temple castle garden river beach tower bridge gallery plaza "
+    "canyon lake forest island cathedral palace aquarium lighthouse vineyard trail summit"
+).split()
+
+
+class PlanResult(NamedTuple):
+    filters: Tuple[str, ...]
+    shape: str
+    scans: List[str]           # EXPLAIN rows that read the catalog table with type=ALL
+    match_fraction: Optional[float]
+
+    @property
+    def ok(self) -> bool:
+        return not self.scans
+
+
+def synthetic_row(i: int, rnd: random.Random, now: datetime) -> tuple:
+    country = rnd.randrange(40)
+    row = {
+        "poi": f"{rnd.choice(_WORDS)} {rnd.choice(_WORDS)} {i}",
+        "city": f"city {country}-{rnd.randrange(10)}",
+        "country": f"country {country}",
+        "currency": "usd",
+        "latitude": round(rnd.uniform(-60, 60), 6),
+        "longitude": round(rnd.uniform(-180, 180), 6),
+        "rating": round(rnd.uniform(1, 5), 1),
+        "description": " ".join(rnd.choices(_WORDS, k=10)),
+        "spending": rnd.choice(["low", "medium", "high"]),
+        "budget": rnd.randint(10, 500),
+        "vibes": "nature, relaxing",
+        "activities": "hiking, photography",
+        "food": "street food",
+        "best_season": rnd.choice(_SEASONS),
+        "trip_days": rnd.randint(1, 7),
+        "nearest_airport": "xxx",
+        "transport": rnd.choice(_TRANSPORT),
+        "accessibility": "ok",
+        "direction": "https://maps.example.com",
+        "created_at": now,
+        "updated_at": now,
+    }
+    return tuple(row[c] for c in INSERT_COLUMNS)
+
+
+def create_synthetic_table(cnx: Any, rows: int, seed: int = 7, batch: int = 5000) -> None:
+    """CHECK_TABLE as a copy of catalog's definition (indexes included), filled with `rows` rows."""
+    cursor = cnx.cursor()
+    try:
+        cursor.execute(f"DROP TABLE IF EXISTS {CHECK_TABLE}")
+        cursor.execute(f"CREATE TABLE {CHECK_TABLE} LIKE catalog")
+        sql = (
+            f"INSERT INTO {CHECK_TABLE} ({', '.join(INSERT_COLUMNS)}) "
+            f"VALUES ({', '.join(['%s'] * len(INSERT_COLUMNS))})"
+        )
+        rnd = random.Random(seed)
+        now = datetime(2025, 1, 1)
+        for start in range(0, rows, batch):
+            cursor.executemany(sql, [synthetic_row(i, rnd, now) for i in range(start, min(rows, start + batch))])
+            cnx.commit()
+        cursor.execute(f"ANALYZE TABLE {CHECK_TABLE}")
+        cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def _one(cnx: Any, sql: str, params: Any = ()) -> Optional[Dict[str, Any]]:
+    cursor = cnx.cursor(dictionary=True)
+    try:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        return rows[0] if rows else None
+    finally:
+        cursor.close()
+
+
+def sample_values(cnx: Any, table: str) -> Tuple[int, Dict[str, Any], Dict[str, Any]]:
+    """(row count, filter values, the sampled row) for `table`."""
+    total = _one(cnx, f"SELECT COUNT(*) AS n FROM {table}")["n"]
+    if total == 0:
+        raise SystemExit(f"{table} is empty")
+    row = _one(cnx, f"SELECT * FROM {table} ORDER BY poi LIMIT 1 OFFSET %s", (total // 2,))
+    rating = _one(cnx, f"SELECT rating FROM {table} ORDER BY rating DESC LIMIT 1 OFFSET %s", (total // 10,))["rating"]
+    budget = _one(cnx, f"SELECT budget FROM {table} ORDER BY budget ASC LIMIT 1 OFFSET %s", (total // 10,))["budget"]
+    words = [w for w in row["poi"].split() if len(w) >= 4 and not w.isdigit()]
+    values = {
+        "city": row["city"],
+        "country": row["country"],
+        "best_season": row["best_season"],
+        "transport": row["transport"],
+        "rating_avg": float(rating),
+        "budget": budget,
+        "q": max(words, key=len) if words else row["city"],
+    }
+    return total, values, row
+
+
+def explain(cnx: Any, query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    cursor = cnx.cursor(dictionary=True)
+    try:
+        cursor.execute(f"EXPLAIN {query}", params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def check_combination(
+    cnx: Any,
+    table: str,
+    names: Sequence[str],
+    values: Dict[str, Any],
+    cursor_row: Dict[str, Any],
+    total: int,
+    max_scan_fraction: float,
+) -> List[PlanResult]:
+    filters = {name: values[name] for name in names}
+    next_cursor = encode_offset_cursor(PAGE_SIZE) if "q" in filters else encode_cursor(cursor_row)
+    shapes = (
+        ("all", plan_list_query(filters)),
+        ("page", plan_list_query(filters, limit=PAGE_SIZE)),
+        ("next", plan_list_query(filters, limit=PAGE_SIZE, cursor=next_cursor)),
+    )
+    results = []
+    for shape, plan in shapes:
+        query = plan.query.replace("FROM catalog ", f"FROM {table} ")
+        scans = [
+            f"{row['table']}: type=ALL rows={row['rows']}"
+            for row in explain(cnx, query, plan.params)
+            if row["table"] == table and row["type"] == "ALL"
+        ]
+        fraction = None
+        if scans and shape == "all":
+            matched = _one(cnx, f"SELECT COUNT(*) AS n FROM ({query}) AS matched", plan.params)["n"]
+            fraction = matched / total
+            if fraction >= max_scan_fraction:
+                scans = []
+        results.append(PlanResult(tuple(names), shape, scans, fraction))
+    return results
+
+
+def run_check(
+    cnx: Any,
+    table: str = "catalog",
+    max_scan_fraction: float = 0.2,
+    filters: Sequence[str] = FILTERS,
+) -> List[PlanResult]:
+    total, values, row = sample_values(cnx, table)
+    if total < MIN_ROWS:
+        print(f"warning: {table} has {total} rows; the optimizer scans small tables. Try --synthetic.")
+    results = []
+    for size in range(1, len(filters) + 1):
+        for names in itertools.combinations(filters, size):
+            results.extend(check_combination(cnx, table, names, values, row, total, max_scan_fraction))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="EXPLAIN every supported GET /catalogs filter combination.")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="ROWS", help=f"check a scratch {CHECK_TABLE} with ROWS rows")
+    parser.add_argument("--keep", action="store_true", help=f"keep {CHECK_TABLE} afterwards")
+    parser.add_argument("--max-scan-fraction", type=float, default=0.2,
+                        help="an unpaged query matching at least this share of rows may scan")
+    parser.add_argument("--no-q", action="store_true", help="skip q= (no FULLTEXT index)")
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only failures")
+    args = parser.parse_args(argv)
+
+    import mysql.connector
+
+    from services.db_config import DB_CONFIG
+
+    filters = tuple(f for f in FILTERS if not (args.no_q and f == "q"))
+    cnx = mysql.connector.connect(**{**DB_CONFIG, "autocommit": False})
+    try:
+        table = "catalog"
+        if args.synthetic:
+            create_synthetic_table(cnx, args.synthetic)
+            table = CHECK_TABLE
+        results = run_check(cnx, table, args.max_scan_fraction, filters)
+    finally:
+        if args.synthetic and not args.keep:
+            cursor = cnx.cursor()
+            cursor.execute(f"DROP TABLE IF EXISTS {CHECK_TABLE}")
+            cursor.close()
+        cnx.close()
+
+    failures = [r for r in results if not r.ok]
+    for r in results:
+        if args.verbose or not r.ok:
+            note = f" (matches {r.match_fraction:.0%})" if r.match_fraction is not None else ""
+            state = "ok  " if r.ok else "SCAN"
+            print(f"{state} {r.shape:<5} {'+'.join(r.filters)}{note}" + "".join(f"\n       {s}" for s in r.scans))
+    print(f"{len(results)} plans checked on {table}, {len(failures)} full table scans")
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
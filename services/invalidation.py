@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Callable, List, Optional
+
+# -----------------------------------------------------------------------------
+# Catalog change notifications
+#
+# Each app owns a CatalogListeners (CatalogContext.change_listeners) and
+# hands its notify() to the /catalogs routers, which call it with the poi
+# after every successful commit. Anything holding derived catalog state
+# (caches, indexes) registers a listener with CatalogContext.on_catalog_change.
+# Nothing here is process-wide, so two apps in one process never see, or
+# miss, each other's writes.
+#
+# With several worker processes the invalidation feature sets `forward` to
+# the bus's publish (services/invalidation_bus.py); the other workers hand
+# the change to their listeners through deliver().
+# -----------------------------------------------------------------------------
+CatalogListener = Callable[[str], None]
+
+
+class CatalogListeners:
+    """One app's change listeners, plus where to forward its own changes."""
+
+    def __init__(self) -> None:
+        self._listeners: List[CatalogListener] = []
+        self.forward: Optional[CatalogListener] = None
+
+    def add(self, listener: CatalogListener) -> CatalogListener:
+        """Register a listener (usable as a decorator). Called with the normalized poi."""
+        self._listeners.append(listener)
+        return listener
+
+    def notify(self, poi: str) -> None:
+        """A write in this process committed: run the listeners and forward it to the other workers."""
+        self.deliver(poi)
+        forward = self.forward
+        if forward is not None:
+            try:
+                forward(poi)
+            except Exception as err:
+                print(f"[CATALOG INVALIDATION] forwarding {poi!r} to other workers failed: {err}")
+
+    def deliver(self, poi: str) -> None:
+        """Run the local listeners only; used for changes made by another worker."""
+        for listener in self._listeners:
+            try:
+                listener(poi)
+            except Exception as err:
+                # A broken listener must never fail the write that already committed.
+                print(f"[CATALOG INVALIDATION] listener {listener!r} failed for {poi!r}: {err}")
+
+    def __len__(self) -> int:
+        return len(self._listeners)
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import os
+import socket
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+# -----------------------------------------------------------------------------
+# Cross-worker catalog invalidation
+#
+# Every worker process keeps its own caches and indexes, fed by
+# services.invalidation. With several workers (gunicorn.conf.py, uvicorn
+# --workers) a write in one of them must also invalidate the others: the
+# bus receives every local change through publish(poi) and calls
+# deliver(poi) in every *other* worker that shares it.
+#
+#   CATALOG_INVALIDATION_BUS=none   # single process (default)
+#   CATALOG_INVALIDATION_BUS=unix   # datagram sockets in CATALOG_INVALIDATION_DIR
+#
+# A bus only needs start(deliver) / publish(poi) / stop() / stats(), so a
+# broker-backed one (Redis, Pub/Sub) can be added to create_invalidation_bus.
+# -----------------------------------------------------------------------------
+Deliver = Callable[[str], None]
+
+SOCKET_PREFIX = "worker-"
+SOCKET_SUFFIX = ".sock"
+
+
+def default_bus_directory() -> str:
+    return os.path.join(tempfile.gettempdir(), "catalog-invalidation")
+
+
+def socket_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"{SOCKET_PREFIX}{pid}{SOCKET_SUFFIX}")
+
+
+class UnixSocketBus:
+    """
+    Host-local bus for workers sharing one machine: each worker binds a
+    datagram socket worker-<pid>.sock in `directory`, and publishing sends
+    to every other socket found there, so workers join and leave without a
+    broker or any registration.
+
+    publish() only queues the poi. A sender thread waits up to max_latency
+    seconds for more, drops duplicates and packs the pois newline-separated
+    into datagrams of at most max_datagram bytes, so a bulk write costs a
+    few sends per peer instead of one per row. A receiver thread delivers
+    what the other workers send.
+
+    A peer whose receive queue is full gets send_timeout seconds to drain
+    it; past that the rest of the batch is skipped for that peer (counted
+    in `dropped`, its stale entries then live until their TTL). The socket
+    of a worker that died without cleaning up is removed on the first
+    refused send. On the receiving side a datagram that fails to decode or
+    deliver is logged and counted in `receive_errors`; the thread goes on.
+    """
+
+    def __init__(self, directory: str, max_latency: float = 0.005, max_datagram: int = 32768, send_timeout: float = 0.1):
+        self.directory = directory
+        self.max_latency = max_latency
+        self.max_datagram = max_datagram
+        self.send_timeout = send_timeout
+
+        self.path: Optional[str] = None
+        self._deliver: Optional[Deliver] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, None] = {}
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._recv_sock: Optional[socket.socket] = None
+        self._send_sock: Optional[socket.socket] = None
+
+        self.published = 0
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+        self.pruned = 0
+        self.receive_errors = 0
+        self.last_receive_error: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def start(self, deliver: Deliver) -> None:
+        """Bind this worker's socket and start the threads; call it after fork (app startup)."""
+        if self._threads:
+            return
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self.path = socket_path(self.directory, os.getpid())
+        if os.path.exists(self.path):
+            # Left behind by an earlier process with the same pid.
+            os.unlink(self.path)
+
+        self._recv_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._recv_sock.bind(self.path)
+        self._recv_sock.settimeout(0.5)
+        self._send_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._send_sock.settimeout(self.send_timeout)
+
+        self._deliver = deliver
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=self._send_loop, name="catalog-invalidation-send", daemon=True),
+            threading.Thread(target=self._receive_loop, name="catalog-invalidation-receive", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Send what is queued, then close and remove this worker's socket."""
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        for sock in (self._recv_sock, self._send_sock):
+            if sock is not None:
+                sock.close()
+        self._recv_sock = self._send_sock = None
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def publish(self, poi: str) -> None:
+        with self._lock:
+            self._pending[poi] = None
+            self.published += 1
+        self._wake.set()
+
+    def stats(self) -> Dict[str, Any]:
+        peers = len(self._peers()) if self.path is not None else 0
+        with self._lock:
+            return {
+                "bus": "unix",
+                "socket": self.path,
+                "send_running": self._alive("catalog-invalidation-send"),
+                "receive_running": self._alive("catalog-invalidation-receive"),
+                "peers": peers,
+                "pending": len(self._pending),
+                "published": self.published,
+                "sent": self.sent,
+                "received": self.received,
+                "dropped": self.dropped,
+                "pruned": self.pruned,
+                "receive_errors": self.receive_errors,
+                "last_receive_error": self.last_receive_error,
+            }
+
+    def _alive(self, name: str) -> bool:
+        return any(thread.name == name and thread.is_alive() for thread in self._threads)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+    def _send_loop(self) -> None:
+        while True:
+            self._wake.wait()
+            if not self._stopping.is_set():
+                # Let the rest of a bulk write arrive before sending.
+                self._stopping.wait(self.max_latency)
+            with self._lock:
+                self._wake.clear()
+                pois = list(self._pending)
+                self._pending.clear()
+            if pois:
+                self._send(pois)
+            if self._stopping.is_set():
+                return
+
+    def _send(self, pois: List[str]) -> None:
+        datagrams = self._pack(pois)
+        peers = self._peers()
+        sent = dropped = pruned = 0
+        for peer in peers:
+            for i, data in enumerate(datagrams):
+                try:
+                    self._send_sock.sendto(data, peer)
+                    sent += 1
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Nobody is bound to it any more: a worker that was killed.
+                    try:
+                        os.unlink(peer)
+                        pruned += 1
+                    except FileNotFoundError:
+                        pass
+                    break
+                except OSError as err:
+                    # socket.timeout included: the peer is stuck, don't hold up the others.
+                    print(f"[CATALOG INVALIDATION] send to {peer} failed: {err!r}")
+                    dropped += len(datagrams) - i
+                    break
+        with self._lock:
+            self.sent += sent
+            self.dropped += dropped
+            self.pruned += pruned
+
+    def _pack(self, pois: List[str]) -> List[bytes]:
+        datagrams: List[bytes] = []
+        chunk: List[bytes] = []
+        size = 0
+        for poi in pois:
+            encoded = poi.encode("utf-8")
+            if chunk and size + len(encoded) + 1 > self.max_datagram:
+                datagrams.append(b"\n".join(chunk))
+                chunk, size = [], 0
+            chunk.append(encoded)
+            size += len(encoded) + 1
+        if chunk:
+            datagrams.append(b"\n".join(chunk))
+        return datagrams
+
+    def _peers(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [
+            os.path.join(self.directory, name)
+            for name in names
+            if name.startswith(SOCKET_PREFIX) and name.endswith(SOCKET_SUFFIX)
+            and os.path.join(self.directory, name) != self.path
+        ]
+
+    def _receive_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                data = self._recv_sock.recv(self.max_datagram)
+            except socket.timeout:
+                continue
+            except OSError as err:
+                if self._stopping.is_set():
+                    return
+                self._receive_failed(f"recv failed: {err!r}")
+                self._stopping.wait(0.5)
+                continue
+            try:
+                pois = data.decode("utf-8").split("\n")
+            except UnicodeDecodeError as err:
+                self._receive_failed(f"undecodable datagram ({len(data)} bytes): {err!r}")
+                continue
+            with self._lock:
+                self.received += len(pois)
+            for poi in pois:
+                try:
+                    self._deliver(poi)
+                except Exception as err:
+                    # One bad listener must not stop delivery for the rest of this worker's life.
+                    self._receive_failed(f"deliver({poi!r}) failed: {err!r}")
+
+    def _receive_failed(self, message: str) -> None:
+        print(f"[CATALOG INVALIDATION] {message}")
+        with self._lock:
+            self.receive_errors += 1
+            self.last_receive_error = message
+
+
+def create_invalidation_bus(kind: str, directory: Optional[str] = None, **settings: Any) -> Optional[UnixSocketBus]:
+    kind = kind.lower()
+    if kind == "none":
+        return None
+    if kind == "unix":
+        return UnixSocketBus(directory or default_bus_directory(), **settings)
+    raise RuntimeError(f"CATALOG_INVALIDATION_BUS must be 'unix' or 'none', got {kind!r}")
+
+
+def bus_settings_from_env(prefix: str = "CATALOG_INVALIDATION_") -> Dict[str, Any]:
+    """Read bus settings, e.g. CATALOG_INVALIDATION_DIR=/run/catalog."""
+    return {
+        "directory": os.environ.get(f"{prefix}DIR") or default_bus_directory(),
+        "max_latency": float(os.environ.get(f"{prefix}MAX_LATENCY", 0.005)),
+        "max_datagram": int(os.environ.get(f"{prefix}MAX_DATAGRAM", 32768)),
+        "send_timeout": float(os.environ.get(f"{prefix}SEND_TIMEOUT", 0.1)),
+    }
+
+
+def invalidation_bus_from_env(default_bus: str = "none") -> Optional[UnixSocketBus]:
+    """Build the bus selected by CATALOG_INVALIDATION_BUS (unix or none); None when off."""
+    return create_invalidation_bus(os.environ.get("CATALOG_INVALIDATION_BUS", default_bus), **bus_settings_from_env())
@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# -----------------------------------------------------------------------------
+# Prometheus-style metrics (text exposition format 0.0.4)
+#
+# Hot paths only touch histograms: one dict lookup for the label set and a
+# bucket increment under a per-series lock. Everything the services already
+# count in their stats() dicts (caches, pool, indexes, events) is read at
+# scrape time through register_stats() and costs nothing per request.
+#
+# CATALOG_METRICS=0 turns the middleware and cursor timing off.
+# -----------------------------------------------------------------------------
+METRICS_ENABLED = os.environ.get("CATALOG_METRICS", "1") == "1"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ROW_BUCKETS: Tuple[float, ...] = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 100000)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _HistogramSeries:
+    __slots__ = ("_lock", "_buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self._buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> _HistogramSeries:
+        series = self._series.get(values)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(values, _HistogramSeries(self.buckets))
+        return series
+
+    def observe(self, value: float, *labels: str) -> None:
+        self.labels(*labels).observe(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for values, series in sorted(self._series.items()):
+            with series._lock:
+                counts, total, count = list(series.counts), series.total, series.count
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, values)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, values)} {count}")
+        return lines
+
+
+StatsSource = Callable[[], Dict[str, Any]]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._histograms: List[Histogram] = []
+        self._stats: List[Tuple[str, StatsSource, Dict[str, str]]] = []
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._histograms.append(metric)
+        return metric
+
+    def register_stats(self, prefix: str, source: StatsSource, labels: Optional[Dict[str, str]] = None) -> None:
+        """
+        Export every numeric field of source() as a gauge named
+        catalog_<prefix>_<field> at scrape time (nested dicts are flattened).
+        """
+        self._stats.append((prefix, source, labels or {}))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._histograms:
+            lines.extend(metric.render())
+
+        gauges: Dict[str, List[Tuple[Dict[str, str], float]]] = {}
+        for prefix, source, labels in self._stats:
+            try:
+                stats = source()
+            except Exception as err:
+                print(f"[CATALOG METRICS] stats source {prefix!r} failed: {err}")
+                continue
+            for field, value in _numeric_fields(stats):
+                gauges.setdefault(f"catalog_{prefix}_{field}", []).append((labels, value))
+
+        for name in sorted(gauges):
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in gauges[name]:
+                lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _numeric_fields(stats: Dict[str, Any], prefix: str = "") -> Iterable[Tuple[str, float]]:
+    for key, value in stats.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, bool):
+            yield name, int(value)
+        elif isinstance(value, (int, float)):
+            yield name, value
+        elif isinstance(value, dict):
+            yield from _numeric_fields(value, f"{name}_")
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "catalog_http_request_duration_seconds",
+    "Request latency by method, route template and status code.",
+    ("method", "route", "status"),
+)
+DB_ACQUIRE_SECONDS = REGISTRY.histogram(
+    "catalog_db_pool_acquire_seconds",
+    "Time spent waiting for a pooled DB connection.",
+    ("mode",),
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "catalog_db_query_duration_seconds",
+    "Statement execution plus fetch time by statement type.",
+    ("statement",),
+)
+DB_ROWS = REGISTRY.histogram(
+    "catalog_db_rows_returned",
+    "Rows fetched per statement by statement type.",
+    ("statement",),
+    buckets=ROW_BUCKETS,
+)
+EVENT_PUBLISH_SECONDS = REGISTRY.histogram(
+    "catalog_event_publish_seconds",
+    "Time from publish() to broker acknowledgement, per event.",
+    ("path",),
+)
+
+_STATEMENTS = {"SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE"}
+
+
+def statement_kind(sql: str) -> str:
+    head = sql.lstrip()[:7].upper()
+    for kind in _STATEMENTS:
+        if head.startswith(kind):
+            return kind
+    return "OTHER"
+
+
+# -----------------------------------------------------------------------------
+# ASGI middleware: latency per route template
+# -----------------------------------------------------------------------------
+class MetricsMiddleware:
+    """
+    Records catalog_http_request_duration_seconds labelled with the matched
+    route's template (/catalogs/{poi}), never the raw path, so label
+    cardinality stays bounded. Unmatched paths are labelled "unmatched".
+    """
+
+    def __init__(self, app: Any, histogram: Histogram = HTTP_REQUEST_SECONDS):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            self.histogram.labels(scope["method"], template, str(status)).observe(time.perf_counter() - started)
+
+
+# -----------------------------------------------------------------------------
+# Cursor timing
+#
+# A statement's time runs from execute() through the fetches that follow it
+# and is recorded, with the rows fetched, at the next execute() or close().
+# Observers registered with on_statement (services/query_log.py) get the
+# same measurement along with the SQL and its parameters.
+# -----------------------------------------------------------------------------
+StatementObserver = Callable[[str, Any, float, int], None]
+
+_statement_observers: List[StatementObserver] = []
+
+
+def on_statement(observer: StatementObserver) -> StatementObserver:
+    """Register observer(sql, params, elapsed_seconds, rows) for every timed statement."""
+    _statement_observers.append(observer)
+    return observer
+
+
+class _StatementTimer:
+    __slots__ = ("kind", "sql", "params", "elapsed", "rows")
+
+    def __init__(self):
+        self.kind: Optional[str] = None
+        self.sql = ""
+        self.params: Any = None
+        self.elapsed = 0.0
+        self.rows = 0
+
+    def start(self, sql: str, params: Any = None) -> None:
+        self.finish()
+        self.kind = statement_kind(sql)
+        self.sql = sql
+        self.params = params
+        self.elapsed = 0.0
+        self.rows = 0
+
+    def add(self, elapsed: float, rows: int = 0) -> None:
+        self.elapsed += elapsed
+        self.rows += rows
+
+    def finish(self) -> None:
+        if self.kind is None:
+            return
+        DB_QUERY_SECONDS.labels(self.kind).observe(self.elapsed)
+        if self.kind == "SELECT":
+            DB_ROWS.labels(self.kind).observe(self.rows)
+        self.kind = None
+        for observer in _statement_observers:
+            try:
+                observer(self.sql, self.params, self.elapsed, self.rows)
+            except Exception as err:
+                print(f"[CATALOG METRICS] statement observer {observer!r} failed: {err}")
+        self.params = None
+
+
+class TimedCursor:
+    """Wraps a mysql.connector cursor; everything else is delegated."""
+
+    def __init__(self, cursor: Any):
+        self._cursor = cursor
+        self._timer = _StatementTimer()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def execute(self, sql: str, params: Any = None, *args: Any, **kwargs: Any) -> Any:
+        self._timer.start(sql, params)
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(sql, params, *args, **kwargs)
+        finally:
+            self._timer.add(time.perf_counter() - started)
+
+    def executemany(self, sql: str, seq: Any) -> Any:
+        self._timer.start(sql, seq)
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql, seq)
+        finally:
+            self._timer.add(time.perf_counter() - started)
+
+    def fetchone(self) -> Any:
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._timer.add(time.perf_counter() - started, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._timer.add(time.perf_counter() - started, len(rows))
+        return rows
+
+    def fetchall(self) -> Any:
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._timer.add(time.perf_counter() - started, len(rows))
+        return rows
+
+    def close(self) -> Any:
+        self._timer.finish()
+        return self._cursor.close()
+
+
+class AsyncTimedCursor:
+    """Async counterpart of TimedCursor for aiomysql cursors."""
+
+    def __init__(self, cursor: Any):
+        self._cursor = cursor
+        self._timer = _StatementTimer()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    async def execute(self, sql: str, params: Any = None) -> Any:
+        self._timer.start(sql, params)
+        started = time.perf_counter()
+        try:
+            return await self._cursor.execute(sql, params)
+        finally:
+            self._timer.add(time.perf_counter() - started)
+
+    async def executemany(self, sql: str, seq: Any) -> Any:
+        self._timer.start(sql, seq)
+        started = time.perf_counter()
+        try:
+            return await self._cursor.executemany(sql, seq)
+        finally:
+            self._timer.add(time.perf_counter() - started)
+
+    async def fetchone(self) -> Any:
+        started = time.perf_counter()
+        row = await self._cursor.fetchone()
+        self._timer.add(time.perf_counter() - started, 0 if row is None else 1)
+        return row
+
+    async def fetchmany(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        rows = await self._cursor.fetchmany(*args, **kwargs)
+        self._timer.add(time.perf_counter() - started, len(rows))
+        return rows
+
+    async def fetchall(self) -> Any:
+        started = time.perf_counter()
+        rows = await self._cursor.fetchall()
+        self._timer.add(time.perf_counter() - started, len(rows))
+        return rows
+
+    async def close(self) -> Any:
+        self._timer.finish()
+        return await self._cursor.close()
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# -----------------------------------------------------------------------------
+# Versioned schema migrations
+#
+# migrations/NNNN_name.sql files are applied once each, in version order, and
+# recorded in schema_migrations together with a checksum of the file. A file
+# that changes after it was applied is refused rather than silently skipped:
+# add a new migration instead of editing an old one.
+#
+# MySQL DDL commits implicitly, so a migration is not atomic; one that fails
+# half way is not recorded and has to be fixed by hand before re-running.
+# A named lock (GET_LOCK) keeps two deploys from migrating at the same time.
+#
+#   python -m services.migrations status
+#   python -m services.migrations migrate [--to VERSION] [--dry-run]
+#   python -m services.migrations baseline VERSION   # mark 1..VERSION applied
+# -----------------------------------------------------------------------------
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+SCHEMA_TABLE = "schema_migrations"
+LOCK_NAME = "catalog_schema_migrations"
+LOCK_TIMEOUT_S = 30
+
+_FILENAME = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+SCHEMA_TABLE_DDL = f"""
+CREATE TABLE IF NOT EXISTS {SCHEMA_TABLE} (
+    version      INT          NOT NULL,
+    name         VARCHAR(128) NOT NULL,
+    checksum     CHAR(64)     NOT NULL,
+    applied_at   DATETIME(3)  NOT NULL,
+    execution_ms INT          NOT NULL,
+    PRIMARY KEY (version)
+)
+"""
+
+
+class MigrationError(RuntimeError):
+    pass
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    path: Path
+    checksum: str
+
+    def statements(self) -> List[str]:
+        return split_statements(self.path.read_text())
+
+
+def split_statements(sql: str) -> List[str]:
+    """Drop -- comment lines and split on ';' at the end of a line."""
+    lines = [line for line in sql.splitlines() if not line.lstrip().startswith("--")]
+    statements = re.split(r";\s*$", "\n".join(lines), flags=re.MULTILINE)
+    return [s.strip() for s in statements if s.strip()]
+
+
+def discover(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Every NNNN_name.sql in `directory`, by version. Raises MigrationError on a repeated version."""
+    migrations: Dict[int, Migration] = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILENAME.match(path.name)
+        if match is None:
+            raise MigrationError(f"{path.name}: migration files are named NNNN_name.sql")
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(f"version {version} is used by {migrations[version].path.name} and {path.name}")
+        checksum = hashlib.sha256(path.read_bytes()).hexdigest()
+        migrations[version] = Migration(version, match.group(2), path, checksum)
+    return [migrations[v] for v in sorted(migrations)]
+
+
+def ensure_schema_table(cnx: Any) -> None:
+    cursor = cnx.cursor()
+    try:
+        cursor.execute(SCHEMA_TABLE_DDL)
+    finally:
+        cursor.close()
+
+
+def applied_migrations(cnx: Any) -> Dict[int, Dict[str, Any]]:
+    cursor = cnx.cursor(dictionary=True)
+    try:
+        cursor.execute(f"SELECT version, name, checksum, applied_at, execution_ms FROM {SCHEMA_TABLE} ORDER BY version")
+        return {row["version"]: row for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def pending_migrations(cnx: Any, migrations: List[Migration]) -> List[Migration]:
+    """Migrations not yet applied. Raises MigrationError if an applied file has changed since."""
+    applied = applied_migrations(cnx)
+    changed = [m.path.name for m in migrations if m.version in applied and applied[m.version]["checksum"] != m.checksum]
+    if changed:
+        raise MigrationError(f"applied migrations were edited afterwards: {', '.join(changed)}")
+    return [m for m in migrations if m.version not in applied]
+
+
+def _record(cnx: Any, migration: Migration, execution_ms: int) -> None:
+    cursor = cnx.cursor()
+    try:
+        cursor.execute(
+            f"INSERT INTO {SCHEMA_TABLE} (version, name, checksum, applied_at, execution_ms) "
+            "VALUES (%s, %s, %s, UTC_TIMESTAMP(3), %s)",
+            (migration.version, migration.name, migration.checksum, execution_ms),
+        )
+        cnx.commit()
+    finally:
+        cursor.close()
+
+
+def apply_migration(cnx: Any, migration: Migration) -> int:
+    """Run one migration's statements and record it. Returns the elapsed milliseconds."""
+    started = time.monotonic()
+    cursor = cnx.cursor()
+    try:
+        for statement in migration.statements():
+            cursor.execute(statement)
+        cnx.commit()
+    finally:
+        cursor.close()
+    elapsed_ms = int((time.monotonic() - started) * 1000)
+    _record(cnx, migration, elapsed_ms)
+    return elapsed_ms
+
+
+class _SchemaLock:
+    def __init__(self, cnx: Any, timeout: int = LOCK_TIMEOUT_S):
+        self.cnx = cnx
+        self.timeout = timeout
+
+    def _scalar(self, sql: str, params: tuple) -> Any:
+        cursor = self.cnx.cursor()
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+    def __enter__(self) -> "_SchemaLock":
+        if self._scalar("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, self.timeout)) != 1:
+            raise MigrationError(f"another process holds the {LOCK_NAME} lock")
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._scalar("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+
+
+def migrate(
+    cnx: Any,
+    target: Optional[int] = None,
+    dry_run: bool = False,
+    directory: Path = MIGRATIONS_DIR,
+) -> List[Migration]:
+    """Apply pending migrations up to `target` (all by default). Returns the ones applied (or due, if dry_run)."""
+    migrations = discover(directory)
+    ensure_schema_table(cnx)
+    with _SchemaLock(cnx):
+        due = [m for m in pending_migrations(cnx, migrations) if target is None or m.version <= target]
+        for migration in due:
+            if dry_run:
+                print(f"[CATALOG MIGRATIONS] would apply {migration.path.name}")
+                continue
+            print(f"[CATALOG MIGRATIONS] applying {migration.path.name}")
+            elapsed_ms = apply_migration(cnx, migration)
+            print(f"[CATALOG MIGRATIONS] applied {migration.path.name} in {elapsed_ms} ms")
+    return due
+
+
+def baseline(cnx: Any, version: int, directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """
+    Record migrations up to `version` as applied without running them, for a
+    database whose schema already has them (e.g. created by hand before this tool).
+    """
+    migrations = [m for m in discover(directory) if m.version <= version]
+    ensure_schema_table(cnx)
+    with _SchemaLock(cnx):
+        due = pending_migrations(cnx, migrations)
+        for migration in due:
+            _record(cnx, migration, 0)
+            print(f"[CATALOG MIGRATIONS] baselined {migration.path.name}")
+    return due
+
+
+def print_status(cnx: Any, directory: Path = MIGRATIONS_DIR) -> None:
+    ensure_schema_table(cnx)
+    applied = applied_migrations(cnx)
+    for migration in discover(directory):
+        row = applied.get(migration.version)
+        if row is None:
+            state = "pending"
+        elif row["checksum"] != migration.checksum:
+            state = f"CHANGED since {row['applied_at']:%Y-%m-%d %H:%M:%S}"
+        else:
+            state = f"applied {row['applied_at']:%Y-%m-%d %H:%M:%S} ({row['execution_ms']} ms)"
+        print(f"{migration.path.name:<40} {state}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Apply the versioned SQL files in migrations/.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="list migrations and whether they are applied")
+    migrate_parser = commands.add_parser("migrate", help="apply pending migrations in order")
+    migrate_parser.add_argument("--to", type=int, default=None, metavar="VERSION", help="stop after this version")
+    migrate_parser.add_argument("--dry-run", action="store_true", help="only list what would be applied")
+    baseline_parser = commands.add_parser("baseline", help="mark migrations up to VERSION applied without running them")
+    baseline_parser.add_argument("version", type=int)
+    args = parser.parse_args(argv)
+
+    import mysql.connector
+
+    from services.db_config import DB_CONFIG
+
+    cnx = mysql.connector.connect(**{**DB_CONFIG, "autocommit": False})
+    try:
+        if args.command == "status":
+            print_status(cnx)
+        elif args.command == "baseline":
+            baseline(cnx, args.version)
+        else:
+            applied = migrate(cnx, target=args.to, dry_run=args.dry_run)
+            if not applied:
+                print("[CATALOG MIGRATIONS] schema is up to date")
+    except MigrationError as exc:
+        raise SystemExit(f"[CATALOG MIGRATIONS] {exc}")
+    finally:
+        cnx.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import argparse
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from services.catalog_tags import Statement
+from services.events import create_publisher, encode_event, events_topic_path, utc_now
+from services.metrics import EVENT_PUBLISH_SECONDS
+
+# -----------------------------------------------------------------------------
+# Transactional outbox for catalog change events
+#
+# With CATALOG_OUTBOX=1 the write handlers insert their change event into
+# catalog_outbox inside the same transaction as the catalog write, so an
+# event exists if and only if the write committed. OutboxRelay publishes
+# unpublished rows in id order and only then stamps published_at: delivery
+# is at-least-once (consumers dedupe on event_id) and events for one poi
+# are never published out of order.
+# -----------------------------------------------------------------------------
+OUTBOX_ENABLED = os.environ.get("CATALOG_OUTBOX", "0") == "1"
+
+OUTBOX_DDL_PATH = Path(__file__).resolve().parent.parent / "migrations" / "0004_catalog_outbox.sql"
+
+# MySQL named lock: with several app workers only one relay drains at a time,
+# which is what keeps per-poi order across processes.
+RELAY_LOCK_NAME = "catalog_outbox_relay"
+
+_PUBLISH_SECONDS = EVENT_PUBLISH_SECONDS.labels("outbox")
+
+SELECT_UNPUBLISHED_SQL = (
+    "SELECT id, event_id, poi, event_type, payload, created_at FROM catalog_outbox "
+    "WHERE published_at IS NULL ORDER BY id LIMIT %s"
+)
+MARK_FAILED_SQL = "UPDATE catalog_outbox SET attempts = attempts + 1, last_error = %s WHERE id = %s"
+PURGE_PUBLISHED_SQL = "DELETE FROM catalog_outbox WHERE published_at < %s LIMIT %s"
+
+
+def outbox_statement(*events: Dict[str, Any]) -> Statement:
+    """Multi-row INSERT of services.events.catalog_event() payloads into catalog_outbox."""
+    created_at = utc_now()
+    rows = [(e["event_id"], e["poi"], e["event_type"], encode_event(e).decode("utf-8"), created_at) for e in events]
+    return (
+        "INSERT INTO catalog_outbox (event_id, poi, event_type, payload, created_at) "
+        f"VALUES {', '.join(['(%s, %s, %s, %s, %s)'] * len(rows))}",
+        [v for row in rows for v in row],
+    )
+
+
+def mark_published_sql(n: int) -> str:
+    return (
+        "UPDATE catalog_outbox SET published_at = %s, attempts = attempts + 1 "
+        f"WHERE id IN ({', '.join(['%s'] * n)})"
+    )
+
+
+# -----------------------------------------------------------------------------
+# Relay
+# -----------------------------------------------------------------------------
+class OutboxRelay:
+    """
+    Background thread that drains catalog_outbox to the publisher.
+
+    Each drain takes the oldest batch_size unpublished rows and publishes
+    them in rounds: round k sends the k-th pending event of every poi in
+    the batch concurrently, so distinct pois share a round trip while one
+    poi's events go out strictly one after another. A failed event stops
+    its poi for this drain (later events for it wait behind it) and the
+    relay backs off exponentially before the next drain.
+
+    wake() is an on_catalog_change listener: a committed write starts a
+    drain right away instead of waiting for the next poll.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        publisher: Any,
+        topic_path: str,
+        batch_size: int = 500,
+        poll_interval: float = 1.0,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        publish_timeout: float = 30.0,
+        retention: float = 24 * 3600,
+    ):
+        self.connect = connect
+        self.publisher = publisher
+        self.topic_path = topic_path
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.publish_timeout = publish_timeout
+        self.retention = retention
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_purge = 0.0
+
+        self.drains = 0
+        self.published = 0
+        self.failed_attempts = 0
+        self.purged = 0
+        self.last_error: Optional[str] = None
+        self.lag_ms = 0.0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="catalog-outbox-relay", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop after the current drain; whatever is unpublished stays in the table for next time."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wake(self, poi: Optional[str] = None) -> None:
+        self._wake.set()
+
+    def drain_once(self) -> Tuple[int, int]:
+        """Publish one batch; returns (published, failed). (0, 0) if another relay holds the lock."""
+        cnx = self.connect()
+        cursor = cnx.cursor(dictionary=True)
+        try:
+            cursor.execute("SELECT GET_LOCK(%s, 0) AS got", (RELAY_LOCK_NAME,))
+            if not cursor.fetchone()["got"]:
+                return 0, 0
+            try:
+                cursor.execute(SELECT_UNPUBLISHED_SQL, (self.batch_size,))
+                rows = cursor.fetchall()
+                if rows:
+                    self.lag_ms = round((utc_now() - rows[0]["created_at"]).total_seconds() * 1000, 1)
+                    published, failures = self._publish(rows)
+                    if published:
+                        cursor.execute(mark_published_sql(len(published)), [utc_now(), *published])
+                    if failures:
+                        cursor.executemany(MARK_FAILED_SQL, [(error, row_id) for row_id, error in failures])
+                    cnx.commit()
+                else:
+                    self.lag_ms = 0.0
+                    published, failures = [], []
+                self._purge(cursor, cnx)
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (RELAY_LOCK_NAME,))
+                cursor.fetchall()
+        finally:
+            cursor.close()
+            cnx.close()
+
+        with self._lock:
+            self.drains += 1
+            self.published += len(published)
+            self.failed_attempts += len(failures)
+            if failures:
+                self.last_error = failures[-1][1]
+        return len(published), len(failures)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "topic": self.topic_path,
+                "running": self._thread is not None and self._thread.is_alive(),
+                "lag_ms": self.lag_ms,
+                "drains": self.drains,
+                "published": self.published,
+                "failed_attempts": self.failed_attempts,
+                "purged": self.purged,
+                "last_error": self.last_error,
+            }
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        failures = 0
+        while not self._stopping.is_set():
+            self._wake.clear()
+            try:
+                published, failed = self.drain_once()
+            except Exception as err:
+                print(f"[CATALOG OUTBOX] drain failed: {err}")
+                with self._lock:
+                    self.last_error = str(err)
+                published, failed = 0, 1
+
+            if failed:
+                failures += 1
+                self._stopping.wait(min(self.backoff_max, self.backoff_base * 2 ** (failures - 1)))
+                continue
+            failures = 0
+            if published < self.batch_size:
+                self._wake.wait(self.poll_interval)
+
+    def _publish(self, rows: Sequence[Dict[str, Any]]) -> Tuple[List[int], List[Tuple[int, str]]]:
+        by_poi: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        for row in rows:
+            by_poi.setdefault(row["poi"], deque()).append(row)
+
+        published: List[int] = []
+        failures: List[Tuple[int, str]] = []
+        while by_poi:
+            sent_at = time.perf_counter()
+            in_flight = [(poi, pending[0], self._send(pending[0])) for poi, pending in by_poi.items()]
+            for poi, row, future in in_flight:
+                try:
+                    future.result(timeout=self.publish_timeout)
+                except Exception as err:
+                    failures.append((row["id"], str(err)[:512]))
+                    del by_poi[poi]
+                    self._resume(poi)
+                    continue
+                _PUBLISH_SECONDS.observe(time.perf_counter() - sent_at)
+                published.append(row["id"])
+                by_poi[poi].popleft()
+                if not by_poi[poi]:
+                    del by_poi[poi]
+        return published, failures
+
+    def _send(self, row: Dict[str, Any]) -> Future:
+        try:
+            return self.publisher.publish(
+                self.topic_path,
+                row["payload"].encode("utf-8"),
+                ordering_key=row["poi"],
+                content_type="application/json",
+                event_type=row["event_type"],
+                poi=row["poi"],
+            )
+        except Exception as err:
+            future: Future = Future()
+            future.set_exception(err)
+            return future
+
+    def _resume(self, poi: str) -> None:
+        # Pub/Sub pauses an ordering key after a failed publish until resumed.
+        resume = getattr(self.publisher, "resume_publish", None)
+        if resume is not None:
+            resume(self.topic_path, poi)
+
+    def _purge(self, cursor: Any, cnx: Any, every: float = 60.0, limit: int = 10000) -> None:
+        if self.retention <= 0 or time.monotonic() - self._last_purge < every:
+            return
+        self._last_purge = time.monotonic()
+        cursor.execute(PURGE_PUBLISHED_SQL, (utc_now() - timedelta(seconds=self.retention), limit))
+        cnx.commit()
+        with self._lock:
+            self.purged += cursor.rowcount
+
+
+def outbox_relay_from_env(
+    connect: Callable[[], Any],
+    default_publisher: str = "none",
+    project_id: Optional[str] = None,
+    topic_id: Optional[str] = None,
+) -> Optional[OutboxRelay]:
+    """
+    The relay for this process, or None when the outbox is off or
+    CATALOG_OUTBOX_RELAY=0 (relay runs elsewhere: python -m services.outbox
+    --relay). With the outbox on, publisher "none" is refused: rows would
+    never be marked published and so never purged.
+    """
+    if not OUTBOX_ENABLED or os.environ.get("CATALOG_OUTBOX_RELAY", "1") != "1":
+        return None
+    kind = os.environ.get("CATALOG_EVENTS_PUBLISHER", default_publisher)
+    publisher = create_publisher(kind, ordering=True)
+    if publisher is None:
+        raise RuntimeError(
+            f"CATALOG_OUTBOX=1 needs an event publisher (CATALOG_EVENTS_PUBLISHER=pubsub or fake), got {kind!r}; "
+            "set CATALOG_OUTBOX=0 to turn change events off"
+        )
+    return OutboxRelay(
+        connect,
+        publisher,
+        events_topic_path(publisher, project_id, topic_id),
+        **relay_settings_from_env(),
+    )
+
+
+def relay_settings_from_env(prefix: str = "CATALOG_OUTBOX_") -> Dict[str, Any]:
+    """Read relay settings, e.g. CATALOG_OUTBOX_BATCH_SIZE=1000."""
+    return {
+        "batch_size": int(os.environ.get(f"{prefix}BATCH_SIZE", 500)),
+        "poll_interval": float(os.environ.get(f"{prefix}POLL_INTERVAL", 1.0)),
+        "retention": float(os.environ.get(f"{prefix}RETENTION_HOURS", 24)) * 3600,
+    }
+
+
+# -----------------------------------------------------------------------------
+# Migration / standalone relay
+# -----------------------------------------------------------------------------
+def create_outbox_table(cnx: Any) -> None:
+    cursor = cnx.cursor()
+    try:
+        cursor.execute(OUTBOX_DDL_PATH.read_text())
+    finally:
+        cursor.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Create the catalog_outbox table and optionally run the relay.")
+    parser.add_argument("--relay", action="store_true", help="run the relay in the foreground until interrupted")
+    parser.add_argument("--publisher", default=os.environ.get("CATALOG_EVENTS_PUBLISHER", "pubsub"))
+    args = parser.parse_args(argv)
+
+    import mysql.connector
+
+    from services.db_config import DB_CONFIG
+
+    cnx = mysql.connector.connect(**DB_CONFIG)
+    try:
+        create_outbox_table(cnx)
+        print("[CATALOG OUTBOX] catalog_outbox table ready")
+    finally:
+        cnx.close()
+
+    if args.relay:
+        publisher = create_publisher(args.publisher, ordering=True)
+        if publisher is None:
+            parser.error("--relay needs a publisher (pubsub or fake)")
+        relay = OutboxRelay(
+            lambda: mysql.connector.connect(**DB_CONFIG),
+            publisher,
+            events_topic_path(publisher),
+            **relay_settings_from_env(),
+        )
+        relay.start()
+        print(f"[CATALOG OUTBOX] relaying to {relay.topic_path}")
+        try:
+            while True:
+                time.sleep(60)
+                print(f"[CATALOG OUTBOX] {relay.stats()}")
+        except KeyboardInterrupt:
+            relay.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from services.metrics import statement_kind
+
+# -----------------------------------------------------------------------------
+# Slow-query log and per-request DB profiling
+#
+# SlowQueryLog is a services.metrics.on_statement observer, so it sees every
+# statement the timed cursors run (CATALOG_METRICS must be on). Statements
+# are grouped by shape: the SQL with literals and placeholders replaced by ?
+# and IN lists / multi-row VALUES collapsed, so the 40 filter combinations of
+# GET /catalogs show up as a handful of rows instead of one per request.
+# Only parameter *names / counts* are kept, never values.
+#
+# Statements slower than CATALOG_SLOW_QUERY_MS are printed as
+# [CATALOG SLOW-QUERY] lines; with CATALOG_SLOW_QUERY_EXPLAIN=1 the first
+# slow SELECT of each shape is also EXPLAINed on a background thread.
+# -----------------------------------------------------------------------------
+QUERY_LOG_ENABLED = os.environ.get("CATALOG_QUERY_LOG", "1") == "1"
+
+# CATALOG_DB_PROFILE=1 adds "Server-Timing: db;dur=..." to every response.
+DB_PROFILE_ENABLED = os.environ.get("CATALOG_DB_PROFILE", "0") == "1"
+
+QUERY_ORDERS = ("total_ms", "max_ms", "avg_ms", "p95_ms", "count", "slow")
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_VALUES_ROWS = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+_SAMPLES_PER_SHAPE = 64
+_LOG_SQL_CHARS = 500
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(sql: str) -> str:
+    """SQL -> shape: literals and placeholders become ?, IN (?, ?, ...) becomes IN (...)."""
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    shape = _VALUES_ROWS.sub(r"\1, ...", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def param_shape(params: Any) -> str:
+    """Parameter names (dict) or count (sequence), e.g. "city,limit" or "3 params"."""
+    if params is None:
+        return ""
+    if isinstance(params, dict):
+        return ",".join(sorted(params))
+    try:
+        n = len(params)
+    except TypeError:
+        return type(params).__name__
+    if n and isinstance(params, list) and isinstance(params[0], (list, tuple, dict)):
+        return f"{n} rows x {param_shape(params[0])}"  # executemany
+    return f"{n} params"
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _ShapeStats:
+    __slots__ = ("shape", "kind", "count", "slow", "total", "max", "rows", "params", "samples", "last_seen", "explain", "explained_at")
+
+    def __init__(self, shape: str, kind: str):
+        self.shape = shape
+        self.kind = kind
+        self.count = 0
+        self.slow = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.params = ""
+        self.samples: Deque[float] = deque(maxlen=_SAMPLES_PER_SHAPE)
+        self.last_seen = 0.0
+        self.explain: Optional[List[Dict[str, Any]]] = None
+        self.explained_at = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "shape": self.shape,
+            "statement": self.kind,
+            "count": self.count,
+            "slow": self.slow,
+            "total_ms": round(self.total * 1000, 3),
+            "avg_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "p95_ms": round(_percentile(list(self.samples), 0.95) * 1000, 3) if self.samples else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+            "rows_avg": round(self.rows / self.count, 1) if self.count else 0.0,
+            "params": self.params,
+            "last_seen": self.last_seen,
+            "explain": self.explain,
+        }
+
+
+class SlowQueryLog:
+    """
+    Per-shape statement counters plus a ring of recent slow statements.
+
+    record() is the on_statement observer: a dict lookup and a few additions
+    under one lock, plus a print for slow statements. The number of shapes is
+    capped at max_shapes; statements of shapes beyond the cap only count
+    towards dropped_shapes.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 200.0,
+        max_shapes: int = 500,
+        recent_size: int = 100,
+        explain_connect: Optional[Callable[[], Any]] = None,
+        explain_every: float = 300.0,
+    ):
+        self.threshold = threshold_ms / 1000.0
+        self.max_shapes = max_shapes
+        self.explain_connect = explain_connect
+        self.explain_every = explain_every
+
+        self._lock = threading.Lock()
+        self._shapes: Dict[str, _ShapeStats] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=recent_size)
+        self._explain_queue: "queue.Queue[Tuple[_ShapeStats, str, Any]]" = queue.Queue(maxsize=32)
+        self._explain_thread: Optional[threading.Thread] = None
+
+        self.statements = 0
+        self.slow = 0
+        self.dropped_shapes = 0
+        self.explains = 0
+        self.explain_errors = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def record(self, sql: str, params: Any, elapsed: float, rows: int) -> None:
+        if threading.current_thread() is self._explain_thread:
+            return
+        shape = normalize_statement(sql)
+        slow = elapsed >= self.threshold
+        now = time.time()
+
+        with self._lock:
+            self.statements += 1
+            entry = self._shapes.get(shape)
+            if entry is None:
+                if len(self._shapes) >= self.max_shapes:
+                    self.dropped_shapes += 1
+                    entry = None
+                else:
+                    entry = self._shapes[shape] = _ShapeStats(shape, statement_kind(sql))
+            if entry is not None:
+                entry.count += 1
+                entry.total += elapsed
+                entry.max = max(entry.max, elapsed)
+                entry.rows += rows
+                entry.samples.append(elapsed)
+                entry.last_seen = now
+            if not slow:
+                return
+            self.slow += 1
+            shape_params = param_shape(params)
+            if entry is not None:
+                entry.slow += 1
+                entry.params = shape_params
+            self._recent.append(
+                {"at": now, "ms": round(elapsed * 1000, 3), "rows": rows, "shape": shape, "params": shape_params}
+            )
+            explain = (
+                entry is not None
+                and self.explain_connect is not None
+                and entry.kind == "SELECT"
+                and now - entry.explained_at >= self.explain_every
+            )
+            if explain:
+                entry.explained_at = now
+
+        print(f"[CATALOG SLOW-QUERY] {elapsed * 1000:.1f} ms rows={rows} params=({shape_params}) {shape[:_LOG_SQL_CHARS]}")
+        if explain:
+            self._queue_explain(entry, sql, params)
+
+    def top(self, limit: int = 20, order: str = "total_ms") -> List[Dict[str, Any]]:
+        """The limit heaviest shapes by order (one of QUERY_ORDERS)."""
+        if order not in QUERY_ORDERS:
+            raise ValueError(f"order must be one of {', '.join(QUERY_ORDERS)}")
+        with self._lock:
+            rows = [entry.as_dict() for entry in self._shapes.values()]
+        rows.sort(key=lambda row: row[order], reverse=True)
+        return rows[:limit]
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent slow statements, newest first."""
+        with self._lock:
+            return list(self._recent)[::-1][:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+            self._recent.clear()
+            self.statements = self.slow = self.dropped_shapes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold_ms": round(self.threshold * 1000, 3),
+                "statements": self.statements,
+                "slow": self.slow,
+                "shapes": len(self._shapes),
+                "max_shapes": self.max_shapes,
+                "dropped_shapes": self.dropped_shapes,
+                "explain": self.explain_connect is not None,
+                "explains": self.explains,
+                "explain_errors": self.explain_errors,
+            }
+
+    # ------------------------------------------------------------------
+    # EXPLAIN capture (one background thread, its own pooled connection)
+    # ------------------------------------------------------------------
+    def _queue_explain(self, entry: _ShapeStats, sql: str, params: Any) -> None:
+        if self._explain_thread is None or not self._explain_thread.is_alive():
+            with self._lock:
+                if self._explain_thread is None or not self._explain_thread.is_alive():
+                    self._explain_thread = threading.Thread(
+                        target=self._run_explains, name="catalog-query-explain", daemon=True
+                    )
+                    self._explain_thread.start()
+        try:
+            self._explain_queue.put_nowait((entry, sql, params))
+        except queue.Full:
+            # Explains are best effort; the shape is retried after explain_every.
+            entry.explained_at = 0.0
+
+    def _run_explains(self) -> None:
+        while True:
+            entry, sql, params = self._explain_queue.get()
+            cnx = cursor = None
+            try:
+                cnx = self.explain_connect()
+                cursor = cnx.cursor(dictionary=True)
+                cursor.execute(f"EXPLAIN {sql}", params)
+                plan = cursor.fetchall()
+                with self._lock:
+                    entry.explain = plan
+                    self.explains += 1
+            except Exception as err:
+                with self._lock:
+                    self.explain_errors += 1
+                print(f"[CATALOG SLOW-QUERY] EXPLAIN failed for {entry.shape[:_LOG_SQL_CHARS]}: {err}")
+            finally:
+                if cursor is not None:
+                    cursor.close()
+                if cnx is not None:
+                    cnx.close()
+
+
+def slow_query_log_from_env(
+    explain_connect: Optional[Callable[[], Any]] = None,
+    prefix: str = "CATALOG_SLOW_QUERY_",
+) -> Optional[SlowQueryLog]:
+    """
+    The log for this process, or None with CATALOG_QUERY_LOG=0. EXPLAIN
+    capture uses explain_connect and is only on with CATALOG_SLOW_QUERY_EXPLAIN=1.
+    """
+    if not QUERY_LOG_ENABLED:
+        return None
+    explain = os.environ.get(f"{prefix}EXPLAIN", "0") == "1"
+    return SlowQueryLog(
+        threshold_ms=float(os.environ.get(f"{prefix}MS", 200)),
+        max_shapes=int(os.environ.get(f"{prefix}MAX_SHAPES", 500)),
+        recent_size=int(os.environ.get(f"{prefix}RECENT", 100)),
+        explain_connect=explain_connect if explain else None,
+    )
+
+
+# -----------------------------------------------------------------------------
+# Per-request DB profile
+#
+# DBProfileMiddleware puts a RequestProfile in a context variable; the
+# profile_statement observer adds every statement run while handling the
+# request to it (threadpool handlers see the same object, Starlette copies
+# the context into the worker thread). Handlers can read it through
+# current_profile().
+# -----------------------------------------------------------------------------
+class RequestProfile:
+    __slots__ = ("statements", "db_seconds", "rows", "slowest")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.slowest = 0.0
+
+    def add(self, elapsed: float, rows: int) -> None:
+        self.statements += 1
+        self.db_seconds += elapsed
+        self.rows += rows
+        self.slowest = max(self.slowest, elapsed)
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_seconds * 1000:.2f};desc="{self.statements} statements, {self.rows} rows"'
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("catalog_db_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+def profile_statement(sql: str, params: Any, elapsed: float, rows: int) -> None:
+    """on_statement observer feeding the current request's RequestProfile, if any."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.add(elapsed, rows)
+
+
+class DBProfileMiddleware:
+    """Adds a Server-Timing "db" entry (time, statements, rows) to every HTTP response."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from services.catalog_sql import normalize_catalog_row
+
+# -----------------------------------------------------------------------------
+# In-process indexes over the whole catalog table (facets, geo)
+#
+# Each index loads lazily with LOAD_ALL_SQL on first use and stays fresh
+# through services.invalidation: invalidate(poi) only queues the poi, and
+# the next query's caller re-reads the queued rows in one
+# select_rows_sql(...) round trip before answering.
+# -----------------------------------------------------------------------------
+LOAD_ALL_SQL = "SELECT * FROM catalog"
+
+
+def select_rows_sql(n: int) -> str:
+    return f"SELECT * FROM catalog WHERE poi IN ({', '.join(['%s'] * n)})"
+
+
+class RowIndex:
+    """
+    Load / refresh protocol shared by the in-process catalog indexes.
+
+    Subclasses implement _reset() (empty storage), _add(row) / _remove(poi)
+    (called with the lock held, or on a fresh private instance) and list
+    their storage attributes in _STATE so load() can swap them in at once.
+    """
+
+    _STATE: Tuple[str, ...] = ()
+
+    def __init__(self, max_pending: int = 2000):
+        # Past this many queued changes a full reload is cheaper than an IN (...) lookup.
+        self.max_pending = max_pending
+
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._loading = False
+        self._pending: set = set()
+        self._loads = 0
+        self._refreshes = 0
+        self._last_load_ms = 0.0
+        self._reset()
+
+    def _empty(self) -> "RowIndex":
+        """A new, unloaded index with the same settings (load() fills it off-lock)."""
+        return type(self)(self.max_pending)
+
+    def _reset(self) -> None:
+        raise NotImplementedError
+
+    def _add(self, row: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def _remove(self, poi: str) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, poi: str) -> None:
+        """on_catalog_change listener: re-read `poi` before the next query."""
+        with self._lock:
+            if self._loaded or self._loading:
+                self._pending.add(poi)
+
+    def take_pending(self) -> Tuple[bool, List[str]]:
+        """
+        What the caller must fetch before querying: (True, []) for a full
+        load, (False, pois) for a partial refresh, (False, []) if up to date.
+        Pois written after this call are queued again for the next query.
+        """
+        with self._lock:
+            if not self._loaded or len(self._pending) > self.max_pending:
+                self._pending.clear()
+                self._loading = True
+                return True, []
+            pois = sorted(self._pending)
+            self._pending.clear()
+            return False, pois
+
+    def load(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Replace the whole index with `rows` (LOAD_ALL_SQL)."""
+        started = time.monotonic()
+        fresh = self._empty()
+        for row in rows:
+            fresh._add(normalize_catalog_row(row))
+
+        with self._lock:
+            for name in self._STATE:
+                setattr(self, name, getattr(fresh, name))
+            self._loaded = True
+            self._loading = False
+            self._loads += 1
+            self._last_load_ms = round((time.monotonic() - started) * 1000, 3)
+
+    def apply(self, pois: Sequence[str], rows: Iterable[Dict[str, Any]]) -> None:
+        """Refresh `pois` from their current rows; pois with no row were deleted."""
+        fetched = {row["poi"]: normalize_catalog_row(row) for row in rows}
+        with self._lock:
+            for poi in pois:
+                self._remove(poi)
+                if poi in fetched:
+                    self._add(fetched[poi])
+            self._refreshes += 1
+
+    def _freshness_stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self._loaded,
+            "pending": len(self._pending),
+            "loads": self._loads,
+            "refreshes": self._refreshes,
+            "last_load_ms": self._last_load_ms,
+        }
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+
+# Module-level settings are read on import: keep the pools lazy, events off
+# and the tag index on before anything under services/ is imported.
+os.environ.setdefault("CATALOG_DB_POOL_MIN_SIZE", "0")
+os.environ.setdefault("CATALOG_EVENTS_PUBLISHER", "none")
+os.environ.setdefault("CATALOG_TAG_INDEX", "1")
+os.environ.pop("CATALOG_OUTBOX", None)
+os.environ.pop("CATALOG_INVALIDATION_BUS", None)
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.sqlite_shim import SQLiteConnection, create_schema
+from catalog_app import create_app, settings_from_env
+
+
+# -----------------------------------------------------------------------------
+# Apps against benchmarks/sqlite_shim.py
+#
+# make_app() builds a fresh create_app() whose pool connects to one SQLite
+# file per test; every app built in a test shares that file, like several
+# workers sharing one MySQL.
+# -----------------------------------------------------------------------------
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    create_schema(path)
+    return path
+
+
+@pytest.fixture
+def make_app(db_path):
+    def make(**overrides):
+        app = create_app(settings_from_env(**overrides))
+        app.state.catalog.db_pool.factory = lambda: SQLiteConnection(db_path)
+        return app
+
+    return make
+
+
+@pytest.fixture
+def client(make_app):
+    with TestClient(make_app()) as c:
+        yield c
+
+
+def catalog_item(poi: str = "Central Park", **fields):
+    item = dict(
+        poi=poi, city="New York City", country="USA", currency="USD", latitude=40.78, longitude=-73.96,
+        rating=4.8, description="Big park", spending="medium", budget=100, vibes="Nature,Relaxing",
+        activities="Jogging,Boating", food="Snacks", best_season="spring", trip_days=1, nearest_airport="JFK",
+        transport="walkable", accessibility="ok", direction="https://x",
+    )
+    item.update(fields)
+    return item
+
+
+def auth_headers(sub: str = "tester"):
+    import jwt
+
+    from catalog_app.features.auth import AUTH_JWT_SECRET
+
+    return {"Authorization": f"Bearer {jwt.encode({'sub': sub}, AUTH_JWT_SECRET, algorithm='HS256')}"}
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from tests.conftest import catalog_item
+
+
+def cache_stats(client, name="catalog"):
+    return getattr(client.app.state.catalog, f"{name}_cache").stats()
+
+
+def test_get_is_served_from_cache_until_a_write(client):
+    assert client.post("/catalogs", json=catalog_item()).status_code == 201
+    assert client.get("/catalogs/central park").json()["rating"] == 4.8
+    hits = cache_stats(client)["hits"]
+    assert client.get("/catalogs/central park").json()["rating"] == 4.8
+    assert cache_stats(client)["hits"] == hits + 1
+
+    assert client.patch("/catalogs/central park", json={"rating": 3.9}).status_code == 200
+    assert client.get("/catalogs/central park").json()["rating"] == 3.9
+
+    assert client.delete("/catalogs/central park").status_code == 204
+    assert client.get("/catalogs/central park").status_code == 404
+
+
+def test_list_cache_is_flushed_by_any_write(client):
+    assert client.post("/catalogs", json=catalog_item("a", city="Paris")).status_code == 201
+    assert [row["poi"] for row in client.get("/catalogs", params={"city": "paris"}).json()] == ["a"]
+    assert [row["poi"] for row in client.get("/catalogs", params={"city": "paris"}).json()] == ["a"]
+    assert cache_stats(client, "list")["hits"] == 1
+
+    assert client.post("/catalogs", json=catalog_item("b", city="Paris")).status_code == 201
+    assert sorted(row["poi"] for row in client.get("/catalogs", params={"city": "paris"}).json()) == ["a", "b"]
+
+    assert client.patch("/catalogs/a", json={"city": "Lyon"}).status_code == 200
+    assert [row["poi"] for row in client.get("/catalogs", params={"city": "paris"}).json()] == ["b"]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from tests.conftest import catalog_item
+
+
+@pytest.fixture
+def park(client):
+    assert client.post("/catalogs", json=catalog_item()).status_code == 201
+    return client
+
+
+def test_if_none_match_gets_a_304(park):
+    etag = park.get("/catalogs/central park").headers["ETag"]
+    response = park.get("/catalogs/central park", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+def test_patch_etag_matches_the_next_get(park):
+    # Strings are stored lower-cased and trimmed; the PATCH response and its
+    # ETag must describe the stored row, not the request body.
+    response = park.patch("/catalogs/central park", json={"city": "  Gotham City ", "rating": 4.1})
+    assert response.status_code == 200
+    assert response.json()["city"] == "gotham city"
+    assert park.get("/catalogs/central park").headers["ETag"] == response.headers["ETag"]
+
+
+def test_if_match_round_trip(park):
+    etag = park.get("/catalogs/central park").headers["ETag"]
+    updated = park.patch("/catalogs/central park", json={"food": "Bagels"}, headers={"If-Match": etag})
+    assert updated.status_code == 200
+    assert updated.json()["food"] == "bagels"
+    assert updated.headers["ETag"] != etag
+    assert park.get("/catalogs/central park").headers["ETag"] == updated.headers["ETag"]
+
+    # The old tag is now stale; the new one still applies.
+    assert park.patch("/catalogs/central park", json={"rating": 1.0}, headers={"If-Match": etag}).status_code == 412
+    again = park.patch("/catalogs/central park", json={"food": "BAGELS"}, headers={"If-Match": updated.headers["ETag"]})
+    assert again.status_code == 200
+    assert again.headers["ETag"] == updated.headers["ETag"]
+    assert park.get("/catalogs/central park").json()["rating"] == 4.8
+
+
+def test_minimal_patch_returns_the_etag(park):
+    response = park.patch("/catalogs/central park", json={"rating": 2.0}, headers={"Prefer": "return=minimal"})
+    assert response.status_code == 204
+    assert park.get("/catalogs/central park").headers["ETag"] == response.headers["ETag"]
+
+
+def test_if_match_on_a_missing_catalog_is_a_404(client):
+    assert client.patch("/catalogs/nowhere", json={"rating": 1.0}, headers={"If-Match": '"x"'}).status_code == 404
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from tests.conftest import catalog_item
+
+
+def test_two_apps_each_invalidate_their_own_cache(make_app):
+    first, second = make_app(), make_app()
+    with TestClient(first) as a, TestClient(second) as b:
+        assert a.post("/catalogs", json=catalog_item()).status_code == 201
+        assert a.get("/catalogs/central park").json()["rating"] == 4.8
+        assert b.get("/catalogs/central park").json()["rating"] == 4.8
+
+        # A write through the first app must drop the first app's entry, not
+        # whichever app was built last.
+        assert a.patch("/catalogs/central park", json={"rating": 3.5}).status_code == 200
+        assert a.get("/catalogs/central park").json()["rating"] == 3.5
+        assert first.state.catalog.catalog_cache.stats()["invalidations"] >= 1
+        assert second.state.catalog.catalog_cache.stats()["invalidations"] == 0
+
+        assert b.patch("/catalogs/central park", json={"rating": 2.5}).status_code == 200
+        assert b.get("/catalogs/central park").json()["rating"] == 2.5
+
+
+def test_two_apps_emit_through_their_own_dispatcher(make_app, monkeypatch):
+    monkeypatch.setenv("CATALOG_EVENTS_PUBLISHER", "fake")
+    first, second = make_app(), make_app()
+    with TestClient(first) as a, TestClient(second):
+        assert a.post("/catalogs", json=catalog_item()).status_code == 201
+        assert a.delete("/catalogs/central park").status_code == 204
+
+        assert first.state.catalog.event_dispatcher.stats()["enqueued"] == 2
+        assert second.state.catalog.event_dispatcher.stats()["enqueued"] == 0
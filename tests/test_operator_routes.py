@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.conftest import auth_headers
+
+OPERATOR_ROUTES = ("/cache/stats", "/db/pool-stats", "/events/stats", "/db/slow-queries")
+
+
+@pytest.mark.parametrize("path", OPERATOR_ROUTES)
+def test_operator_routes_need_a_token(client, path):
+    assert client.get(path).status_code == 403
+    assert client.get(path, headers=auth_headers()).status_code == 200
+
+
+def test_event_status_needs_a_token(client):
+    assert client.get("/events/unknown").status_code == 403
+    assert client.get("/events/unknown", headers=auth_headers()).status_code == 404
+
+
+@pytest.mark.parametrize("path", OPERATOR_ROUTES)
+def test_operator_routes_stay_closed_without_the_auth_feature(make_app, path):
+    app = make_app(features=("health", "caches", "events", "query_log"))
+    with TestClient(app) as c:
+        assert c.get(path, headers=auth_headers()).status_code == 403
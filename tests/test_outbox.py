@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+
+from benchmarks.sqlite_shim import SQLiteConnection
+from services.events import CATALOG_UPDATED, FakePublisher, catalog_event
+from services.outbox import OutboxRelay, outbox_statement
+
+TOPIC = "projects/test/topics/catalog"
+
+
+def record(db_path, *pois):
+    cnx = SQLiteConnection(db_path)
+    try:
+        cursor = cnx.cursor()
+        for n, poi in enumerate(pois):
+            cursor.execute(*outbox_statement(catalog_event(CATALOG_UPDATED, poi, {"n": n})))
+        cnx.commit()
+    finally:
+        cnx.close()
+
+
+def published(publisher, poi):
+    return [json.loads(m["data"])["data"]["n"] for m in publisher.messages if m["ordering_key"] == poi]
+
+
+def test_relay_publishes_each_poi_in_write_order(db_path):
+    record(db_path, "a", "b", "a", "a", "b")
+    publisher = FakePublisher()
+    relay = OutboxRelay(lambda: SQLiteConnection(db_path), publisher, TOPIC)
+
+    assert relay.drain_once() == (5, 0)
+    assert published(publisher, "a") == [0, 2, 3]
+    assert published(publisher, "b") == [1, 4]
+    assert relay.drain_once() == (0, 0)
+
+
+def test_failed_event_holds_back_the_rest_of_its_poi(db_path):
+    record(db_path, "a", "b", "a", "b")
+    publisher = FakePublisher(fail_next=1)
+    relay = OutboxRelay(lambda: SQLiteConnection(db_path), publisher, TOPIC, backoff_base=0)
+
+    # a's first event fails, so a's second waits; b is unaffected.
+    assert relay.drain_once() == (2, 1)
+    assert published(publisher, "a") == []
+    assert published(publisher, "b") == [1, 3]
+
+    assert relay.drain_once() == (2, 0)
+    assert published(publisher, "a") == [0, 2]
+    assert relay.stats()["failed_attempts"] == 1
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from tests.conftest import catalog_item
+
+RATINGS = {"p1": 4.5, "p2": 4.5, "p3": 4.5, "p4": 4.0, "p5": 3.0}
+
+
+@pytest.fixture
+def catalogs(client):
+    for poi, rating in RATINGS.items():
+        assert client.post("/catalogs", json=catalog_item(poi, rating=rating)).status_code == 201
+    return client
+
+
+def walk(client, limit, **params):
+    pages, cursor = [], None
+    while True:
+        query = {"limit": limit, **params, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/catalogs", params=query)
+        assert response.status_code == 200
+        pages.append([row["poi"] for row in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit,sizes", [(1, [1, 1, 1, 1, 1]), (2, [2, 2, 1]), (3, [3, 2]), (5, [5]), (6, [5])])
+def test_pages_cover_every_row_once_in_rating_poi_order(catalogs, limit, sizes):
+    pages = walk(catalogs, limit)
+    assert [len(page) for page in pages] == sizes
+    assert [poi for page in pages for poi in page] == ["p1", "p2", "p3", "p4", "p5"]
+
+
+def test_cursor_inside_a_rating_tie_is_not_shifted_by_inserts(catalogs):
+    first = catalogs.get("/catalogs", params={"limit": 2})
+    assert [row["poi"] for row in first.json()] == ["p1", "p2"]
+
+    # New rows ahead of the cursor must not push p3 onto a page already read.
+    assert catalogs.post("/catalogs", json=catalog_item("p0", rating=4.5)).status_code == 201
+    assert catalogs.post("/catalogs", json=catalog_item("top", rating=5.0)).status_code == 201
+    second = catalogs.get("/catalogs", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert [row["poi"] for row in second.json()] == ["p3", "p4"]
+
+
+def test_projection_keeps_paging(catalogs):
+    response = catalogs.get("/catalogs", params={"limit": 2, "fields": "city"})
+    assert response.json() == [{"city": "new york city"}, {"city": "new york city"}]
+    assert "X-Next-Cursor" in response.headers
+
+
+def test_malformed_cursor_is_a_400(catalogs):
+    assert catalogs.get("/catalogs", params={"limit": 2, "cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.sqlite_shim import SQLiteConnection
+from services.catalog_sql import build_list_query
+from services.catalog_tags import normalize_tag, split_tags
+from tests.conftest import catalog_item
+
+
+def test_split_tags_normalizes_each_tag():
+    assert normalize_tag("  Martial   Arts ") == "martial arts"
+    assert split_tags(" Nature , martial  arts,NATURE,, ") == ["nature", "martial arts"]
+
+
+@pytest.mark.parametrize("vibes,match", [
+    ("martial arts", "any"),
+    ("Martial  Arts", "any"),
+    ("art", "any"),
+    ("martialarts", "any"),
+    ("nature,martial arts", "all"),
+    ("nature,beach", "all"),
+    ("nature,beach", "any"),
+])
+def test_tag_index_and_like_scan_agree(client, db_path, vibes, match):
+    for poi, tags in (("a", "Nature,  Martial  Arts "), ("b", "nature ,art"), ("c", "beach")):
+        assert client.post("/catalogs", json=catalog_item(poi, vibes=tags)).status_code == 201
+
+    found = {}
+    for use_tag_index in (True, False):
+        query, params = build_list_query(vibes=vibes, tags_match=match, use_tag_index=use_tag_index)
+        cnx = SQLiteConnection(db_path)
+        try:
+            cursor = cnx.cursor(dictionary=True)
+            cursor.execute(query, params)
+            found[use_tag_index] = sorted(row["poi"] for row in cursor.fetchall())
+        finally:
+            cnx.close()
+    assert found[True] == found[False]